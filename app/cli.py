@@ -0,0 +1,314 @@
+"""Command-line access to the media library, for scripts and scheduled jobs.
+
+Run from the directory holding whatch.db, or point --db at it:
+
+    python -m app.cli import [--plan FILE] PATH [PATH ...]
+    python -m app.cli apply-plan [--dry-run] FILE
+    python -m app.cli rescan [--apply] [ROOT ...]
+    python -m app.cli mark-watched [--unwatched] PATH [PATH ...]
+    python -m app.cli export [--format jsonl|csv] [--output FILE]
+    python -m app.cli stats
+
+Progress is written to stdout line by line as the work goes. Nothing here
+imports PyQt6; the scanner is only loaded by the commands that walk the
+disk, so the others start as fast as the database opens.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+
+from app.core.db_session import DEFAULT_DB_PATH, DEFAULT_STORAGE_PROFILE, STORAGE_PROFILES, set_storage_profile
+from app.core.import_plan import iter_plan_items, write_plan
+from app.core.library_db import LibraryDB
+from app.core.paths import absolute_library_path
+from app.core.records import LibraryItem
+from app.core.rescan import apply_rescan, rescan_changes
+
+# Files are added to the library in transactions of this many, so a large
+# import shows up (and survives an interruption) as it goes.
+IMPORT_CHUNK_SIZE = 2000
+
+
+def _say(message):
+    print(message, flush=True)
+
+
+def _file_items(rows):
+    """Yield the library item of each file row, as ``LibraryImportDialog.get_results`` gives it when left as scanned."""
+    from app.ui.library_utils import _default_display_title
+
+    for row in rows:
+        if row.is_folder:
+            continue
+        yield {
+            "path": row.path,
+            "media_type": row.media_type,
+            "is_series": row.media_type == "TV",
+            "series_title": row.series_title.strip() or None,
+            "show_title": row.series_index.strip() or None,
+            "display_title": (row.display_title or "").strip() or _default_display_title(row.path),
+        }
+
+
+def _chunks(items):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _add_items(db, items):
+    """Add ``items`` to the library in chunks; return (inserted, ignored) counts."""
+    inserted = ignored = seen = 0
+    for chunk in _chunks(items):
+        outcome = db.add_items(chunk)
+        inserted += len(outcome["inserted"])
+        ignored += len(outcome["ignored"])
+        seen += len(chunk)
+        _say(f"  {seen} files read, {inserted} added")
+    return inserted, ignored
+
+
+def _progress(items):
+    count = 0
+    for count, item in enumerate(items, 1):
+        yield item
+        if count % IMPORT_CHUNK_SIZE == 0:
+            _say(f"  {count} files read")
+    if count % IMPORT_CHUNK_SIZE:
+        _say(f"  {count} files read")
+
+
+def _plan_counts(db, items):
+    """Return how many of ``items`` add_items would insert and ignore, without writing."""
+    new = present = 0
+    seen = set()
+    for chunk in _chunks(items):
+        paths = [item["path"] for item in chunk]
+        known = db.get_known_paths(paths)
+        for path in paths:
+            if path in known or path in seen:
+                present += 1
+            else:
+                seen.add(path)
+                new += 1
+    return new, present
+
+
+def _import(db, args):
+    from app.ui.library_scanner import iter_import_rows
+
+    paths = [absolute_library_path(path) for path in args.paths]
+    unreadable = [path for path in paths if not os.path.exists(path)]
+    for path in unreadable:
+        _say(f"not found: {path}")
+    paths = [path for path in paths if path not in unreadable]
+    if not paths:
+        return 1
+
+    manifest = {}
+    items = _file_items(iter_import_rows(paths, manifest=manifest))
+    if args.plan:
+        _say(f"planning {len(paths)} path(s)")
+        with open(args.plan, "w", encoding="utf-8") as stream:
+            written = write_plan(stream, _progress(items), manifest)
+        _say(f"{written} files written to {args.plan}")
+        return 1 if unreadable else 0
+
+    _say(f"importing {len(paths)} path(s)")
+    inserted, ignored = _add_items(db, items)
+    for root, entries in manifest.items():
+        db.save_manifest(root, entries)
+    _say(f"{inserted} added, {ignored} already in the library")
+    return 1 if unreadable else 0
+
+
+def _apply_plan(db, args):
+    # The plan is read twice: once to check every line, so a bad line
+    # further down can't leave it half applied, and once to add the items.
+    manifest = {}
+    try:
+        with open(args.plan, encoding="utf-8") as stream:
+            if args.dry_run:
+                new, present = _plan_counts(db, iter_plan_items(stream, manifest, args.plan))
+            else:
+                for _item in iter_plan_items(stream, manifest, args.plan):
+                    pass
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if args.dry_run:
+        _say(f"{new} would be added, {present} already in the library, {len(manifest)} root(s) recorded")
+        return 0
+
+    with open(args.plan, encoding="utf-8") as stream:
+        inserted, ignored = _add_items(db, iter_plan_items(stream, name=args.plan))
+    for root, entries in manifest.items():
+        db.save_manifest(root, entries)
+    _say(f"{inserted} added, {ignored} already in the library, {len(manifest)} root(s) recorded")
+    return 0
+
+
+def _rescan(db, args):
+    from app.ui.library_scanner import iter_import_rows, rescan_root
+
+    roots = [absolute_library_path(root) for root in args.roots] or db.get_roots()
+    if not roots:
+        _say("no library roots to rescan; import a folder first")
+        return 0
+
+    results = []
+    unavailable = False
+    for root in roots:
+        result = rescan_root(root, db.get_manifest(root), db.get_directory_files)
+        if not result.available:
+            _say(f"could not read: {root}")
+            unavailable = True
+            continue
+        _say(f"{root}: {len(result.new)} new, {len(result.missing)} missing, {len(result.moved)} moved")
+        for path in result.new:
+            _say(f"  new {path}")
+        for path in result.missing:
+            _say(f"  missing {path}")
+        for old, new in result.moved:
+            _say(f"  moved {old} -> {new}")
+        results.append(result)
+
+    def import_new(selection):
+        inserted, _ignored = _add_items(db, _file_items(iter_import_rows(selection)))
+        _say(f"{inserted} added")
+        return True
+
+    new, missing, moved = rescan_changes(results)
+    if (new or missing or moved) and not args.apply:
+        _say("library left as it was; run again with --apply to update it")
+        return 1 if unavailable else 0
+    apply_rescan(db, results, import_new)
+    if new or missing or moved:
+        _say(f"{len(moved)} moved, {len(missing)} removed")
+    return 1 if unavailable else 0
+
+
+def _mark_watched(db, args):
+    paths = []
+    for path in args.paths:
+        path = absolute_library_path(path)
+        if os.path.isdir(path):
+            paths.extend(db.get_paths_under(os.path.join(path, "")))
+        else:
+            paths.append(path)
+    known = db.get_known_paths(paths)
+    for path in paths:
+        if path not in known:
+            _say(f"not in the library: {path}")
+    db.update_watched(list(known), not args.unwatched)
+    _say(f"{len(known)} item(s) marked {'unwatched' if args.unwatched else 'watched'}")
+    return 0 if known else 1
+
+
+def _export(db, args):
+    items = sorted(db.get_items(), key=lambda item: item.path)
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        if args.format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(LibraryItem._fields)
+            writer.writerows(items)
+        else:
+            for item in items:
+                stream.write(json.dumps(item._asdict(), ensure_ascii=False) + "\n")
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+    if stream is not sys.stdout:
+        _say(f"{len(items)} item(s) written to {args.output}")
+    return 0
+
+
+def _stats(db, args):
+    total = watched = placeholders = 0
+    by_type = {}
+    for media_type, is_series, is_placeholder, is_watched, count in db.get_item_counts():
+        total += count
+        if is_placeholder:
+            placeholders += count
+            continue
+        if is_watched:
+            watched += count
+        key = f"{media_type} series" if is_series and media_type != "TV" else media_type
+        by_type[key] = by_type.get(key, 0) + count
+    series = db.get_series_watch_counts()
+    finished = sum(1 for _media_type, _title, seen, count in series if seen == count)
+
+    _say(f"{'items':<16} {total}")
+    for key in sorted(by_type):
+        _say(f"{'  ' + key:<16} {by_type[key]}")
+    _say(f"{'  placeholders':<16} {placeholders}")
+    _say(f"{'watched':<16} {watched}")
+    _say(f"{'series':<16} {len(series)} ({finished} fully watched)")
+    _say(f"{'library roots':<16} {len(db.get_roots())}")
+    return 0
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"library database (default: {DEFAULT_DB_PATH})")
+    parser.add_argument(
+        "--storage-profile", choices=sorted(STORAGE_PROFILES), default=DEFAULT_STORAGE_PROFILE
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import", help="add video files and folders to the library")
+    command.add_argument("paths", nargs="+", metavar="PATH")
+    command.add_argument("--plan", metavar="FILE", help="write an import plan to FILE instead of adding the files")
+    command.add_argument("--workers", type=int, help="directories listed at once (default: 8)")
+    command.set_defaults(run=_import)
+
+    command = commands.add_parser("apply-plan", help="add the files of an import plan without scanning")
+    command.add_argument("plan", metavar="FILE")
+    command.add_argument("--dry-run", action="store_true", help="only report what would be added")
+    command.set_defaults(run=_apply_plan)
+
+    command = commands.add_parser("rescan", help="find new, missing and moved files under the library roots")
+    command.add_argument("roots", nargs="*", metavar="ROOT", help="default: every imported folder")
+    command.add_argument("--apply", action="store_true", help="update the library with what was found")
+    command.add_argument("--workers", type=int, help="directories listed at once (default: 8)")
+    command.set_defaults(run=_rescan)
+
+    command = commands.add_parser("mark-watched", help="mark items, or every item in folders, as watched")
+    command.add_argument("paths", nargs="+", metavar="PATH")
+    command.add_argument("--unwatched", action="store_true", help="mark them unwatched instead")
+    command.set_defaults(run=_mark_watched)
+
+    command = commands.add_parser("export", help="write every library item")
+    command.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    command.add_argument("--output", "-o", default="-", help="file to write (default: stdout)")
+    command.set_defaults(run=_export)
+
+    command = commands.add_parser("stats", help="count the items in the library")
+    command.set_defaults(run=_stats)
+    return parser
+
+
+def main(argv=None):
+    args = _parser().parse_args(argv)
+    set_storage_profile(args.storage_profile)
+    if getattr(args, "workers", None):
+        from app.ui.library_scanner import set_scan_workers
+
+        set_scan_workers(args.workers)
+    db = LibraryDB(args.db)
+    try:
+        return args.run(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
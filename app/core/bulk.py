@@ -0,0 +1,38 @@
+# Largest number of keys bound into one ``IN (?, ?, ...)``. Keeps every
+# statement well under SQLite's bound-variable limit (999 on builds before
+# 3.32) and the SQL text small, whatever the size of the selection.
+KEY_CHUNK_SIZE = 500
+
+
+def chunked(values, size=KEY_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def _key_query(query, count):
+    return query.format(keys=",".join("?" for _ in range(count)))
+
+
+def execute_for_keys(conn, query, keys, params=()):
+    """Execute ``query`` for all ``keys`` and return the affected row count.
+
+    ``query`` contains a ``{keys}`` marker inside ``IN (...)``; ``params``
+    are bound before each chunk of keys. Run it inside the caller's
+    transaction so every chunk commits together.
+    """
+    total = 0
+    for chunk in chunked(keys):
+        total += conn.execute(_key_query(query, len(chunk)), (*params, *chunk)).rowcount
+    return total
+
+
+def fetch_for_keys(conn, query, keys, params=(), row_factory=None):
+    """Like :func:`execute_for_keys` for a SELECT, returning the rows of every chunk."""
+    cursor = conn.cursor()
+    if row_factory is not None:
+        cursor.row_factory = row_factory
+    rows = []
+    for chunk in chunked(keys):
+        rows.extend(cursor.execute(_key_query(query, len(chunk)), (*params, *chunk)).fetchall())
+    return rows
@@ -0,0 +1,23 @@
+def current_revision(conn):
+    """Return the database-wide change revision; it only ever grows."""
+    return conn.execute("SELECT value FROM change_revision").fetchone()[0]
+
+
+def changes_since(conn, table, revision):
+    """Return ``(current_revision, changed_ids, deleted_ids)`` for ``table``.
+
+    Covers every change logged after ``revision`` up to the current one. A
+    current revision lower than ``revision`` means the database was replaced
+    (for example by a reset) and the caller should reload everything.
+    """
+    current = current_revision(conn)
+    rows = conn.execute(
+        """
+        SELECT row_id, deleted FROM change_log
+        WHERE table_name = ? AND revision > ? AND revision <= ?
+        """,
+        (table, revision, current),
+    ).fetchall()
+    changed = [row_id for row_id, deleted in rows if not deleted]
+    deleted = [row_id for row_id, deleted in rows if deleted]
+    return current, changed, deleted
@@ -0,0 +1,160 @@
+import atexit
+import os
+import sqlite3
+import threading
+
+from app.core.migrations import migrate
+
+
+DEFAULT_DB_PATH = "whatch.db"
+
+# Pragmas applied to every new connection. "balanced" trades the last few
+# commits on power loss for non-blocking reads and much cheaper writes;
+# "durable" keeps WAL but syncs every commit; "legacy" is SQLite's default
+# rollback journal with full sync, as whatch.db used before profiles existed.
+STORAGE_PROFILES = {
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 64 * 1024 * 1024,
+        "cache_size": -16000,
+        "temp_store": "MEMORY",
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -8000,
+        "temp_store": "DEFAULT",
+    },
+    "legacy": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+    },
+}
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+_storage_profile = DEFAULT_STORAGE_PROFILE
+
+
+def set_storage_profile(name):
+    """Select the profile used for connections opened from now on."""
+    global _storage_profile
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown storage profile: {name}")
+    _storage_profile = name
+
+
+def storage_profile():
+    return _storage_profile
+
+
+def apply_storage_profile(conn, name):
+    profile = STORAGE_PROFILES[name]
+    conn.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+    conn.execute(f"PRAGMA synchronous = {profile['synchronous']}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = {int(profile['cache_size'])}")
+    conn.execute(f"PRAGMA temp_store = {profile['temp_store']}")
+
+
+class DatabaseSession:
+    """Process-wide owner of the SQLite connections for one database file.
+
+    The ``*DB`` helpers borrow a connection from here instead of opening their
+    own, and schema migrations run once per session rather than once per
+    helper. Each thread gets its own connection, opened lazily and kept for
+    the lifetime of the session. An in-memory database exists only on the
+    connection that created it, so a ":memory:" session opens one connection
+    and every thread shares it.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, profile=None):
+        self.db_path = db_path
+        self.profile = profile
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._connections = []
+        self._migrated = False
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._lock:
+                if self.db_path == ":memory:" and self._connections:
+                    conn = self._connections[0]
+                else:
+                    conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                    apply_storage_profile(conn, self.profile or _storage_profile)
+                    # Every connection to a file sees the schema the first
+                    # one migrated.
+                    if not self._migrated:
+                        migrate(conn)
+                        self._migrated = True
+                    self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close every connection; the next one re-checks the schema version."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+            self._migrated = False
+            self._local = threading.local()
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_key(db_path):
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return db_path
+    return os.path.normcase(os.path.abspath(db_path))
+
+
+def get_session(db_path=DEFAULT_DB_PATH):
+    """Return the shared session for ``db_path``, creating it on first use."""
+    key = _session_key(db_path)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = DatabaseSession(db_path)
+            _sessions[key] = session
+        return session
+
+
+class SessionHelper:
+    """Base of the ``*DB`` helpers: borrows the shared session's connection for ``db_path``."""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.session = get_session(db_path)
+        self.conn = self.session.connection()
+
+    def close(self):
+        """Drop this helper's connection; the session keeps it open for the next helper."""
+        self.conn = None
+
+
+def close_session(db_path=DEFAULT_DB_PATH):
+    with _sessions_lock:
+        session = _sessions.pop(_session_key(db_path), None)
+    if session is not None:
+        session.close()
+
+
+def close_all_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+atexit.register(close_all_sessions)
@@ -0,0 +1,88 @@
+import json
+
+from app.core.records import DirManifest
+
+# An import plan is a JSON Lines file: one line per library item to add,
+# with the fields of ``LibraryDB.add_items`` below, then one line per
+# library root, {"root": path, "manifest": {directory: [mtime_ns,
+# entry_count]}}, to record it for rescans. Lines can be edited, removed or
+# added by hand; blank lines are skipped.
+PLAN_ITEM_FIELDS = ("path", "media_type", "display_title", "is_series", "series_title", "show_title")
+_REQUIRED_FIELDS = ("path", "media_type", "display_title")
+
+
+def write_plan(stream, items, manifest=None):
+    """Write ``items`` to the text ``stream`` as an import plan; return how many were written.
+
+    Items are written as they come, so a plan can be streamed from a scan
+    without holding it. ``manifest`` is ``{root: {directory: DirManifest}}``
+    and is read once ``items`` is exhausted, so it may be filled while they
+    are produced, as ``iter_import_rows`` does.
+    """
+    count = 0
+    for item in items:
+        line = {field: item.get(field) for field in PLAN_ITEM_FIELDS}
+        line["is_series"] = bool(line["is_series"])
+        stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+        count += 1
+    for root, entries in (manifest or {}).items():
+        line = {"root": root, "manifest": {path: list(entry) for path, entry in entries.items()}}
+        stream.write(json.dumps(line, ensure_ascii=False) + "\n")
+    return count
+
+
+def iter_plan_items(stream, manifest=None, name="plan"):
+    """Yield the item dicts of the import plan read from ``stream``.
+
+    When ``manifest`` is a dict, it is filled with the plan's roots as
+    ``{root: {directory: DirManifest}}``. A line that is not a valid item or
+    root raises ``ValueError`` naming ``name`` and the line number.
+    """
+    for number, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            line = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"{name}:{number}: not valid JSON: {exc}") from None
+        if not isinstance(line, dict):
+            raise ValueError(f"{name}:{number}: expected an object")
+        if "root" in line:
+            root = _plan_root(line, f"{name}:{number}")
+            if manifest is not None:
+                manifest[root[0]] = root[1]
+            continue
+        yield _plan_item(line, f"{name}:{number}")
+
+
+def _plan_item(line, where):
+    unknown = sorted(set(line) - set(PLAN_ITEM_FIELDS))
+    if unknown:
+        raise ValueError(f"{where}: unknown field(s): {', '.join(unknown)}")
+    for field in _REQUIRED_FIELDS:
+        if not isinstance(line.get(field), str) or not line[field].strip():
+            raise ValueError(f"{where}: {field} must be a non-empty string")
+    for field in ("series_title", "show_title"):
+        if line.get(field) is not None and not isinstance(line[field], str):
+            raise ValueError(f"{where}: {field} must be a string or null")
+    return {
+        "path": line["path"],
+        "media_type": line["media_type"],
+        "display_title": line["display_title"],
+        "is_series": bool(line.get("is_series")),
+        "series_title": line.get("series_title") or None,
+        "show_title": line.get("show_title") or None,
+    }
+
+
+def _plan_root(line, where):
+    root = line["root"]
+    entries = line.get("manifest", {})
+    if not isinstance(root, str) or not root or not isinstance(entries, dict) or set(line) - {"root", "manifest"}:
+        raise ValueError(f"{where}: a root line is {{\"root\": path, \"manifest\": {{directory: [mtime_ns, count]}}}}")
+    manifest = {}
+    for path, entry in entries.items():
+        if not (isinstance(entry, list) and len(entry) == 2 and all(isinstance(value, int) for value in entry)):
+            raise ValueError(f"{where}: manifest entry for {path} must be [mtime_ns, entry_count]")
+        manifest[path] = DirManifest(*entry)
+    return root, manifest
@@ -1,57 +1,155 @@
-import sqlite3
 from datetime import datetime
 
+from app.core.bulk import KEY_CHUNK_SIZE, chunked, execute_for_keys, fetch_for_keys
+from app.core.changes import changes_since, current_revision
+from app.core.db_session import SessionHelper
+from app.core.paths import split_library_path
+from app.core.records import DirManifest, ItemChanges, LibraryItem, row_factory
+from app.core.search import search_ids
+from app.core.title_keys import title_key
 
-class LibraryDB:
-    """Database helper for the media library."""
+_library_item_row = row_factory(LibraryItem)
 
-    def __init__(self, db_path="whatch.db"):
-        self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.create_table()
+# Items are stored as (dir_id, name) against the shared ``directories`` table;
+# every read puts the full path back together so callers only see paths.
+_ITEM_COLUMNS = """
+    li.id, d.path || li.name, li.media_type, li.display_title, li.is_series, li.series_title, li.show_title,
+    li.added_at, li.watched, li.is_placeholder, li.air_datetime, li.currently_airing
+"""
+
+# List <-> Library title matches. A list entry matches a non-placeholder
+# library item of the same media type on its title key, or on its series key
+# for TV and movie series.
+_LIST_MATCH_KEYS = (
+    ("title_key", "1"),
+    ("series_key", "li.media_type = 'TV' OR li.is_series = 1"),
+)
 
-    def create_table(self):
-        query = """
-        CREATE TABLE IF NOT EXISTS library_items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            path TEXT NOT NULL UNIQUE,
-            media_type TEXT NOT NULL,
-            display_title TEXT NOT NULL,
-            is_series INTEGER DEFAULT 0,
-            series_title TEXT,
-            show_title TEXT,
-            added_at TEXT NOT NULL,
-            watched INTEGER DEFAULT 0,
-            is_placeholder INTEGER DEFAULT 0,
-            air_datetime TEXT,
-            currently_airing INTEGER DEFAULT 0
-        );
-        """
-        self.conn.execute(query)
-        self.conn.commit()
-
-        cursor = self.conn.execute("PRAGMA table_info(library_items)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if "watched" not in columns:
-            self.conn.execute("ALTER TABLE library_items ADD COLUMN watched INTEGER DEFAULT 0")
-            self.conn.commit()
-        if "is_placeholder" not in columns:
-            self.conn.execute("ALTER TABLE library_items ADD COLUMN is_placeholder INTEGER DEFAULT 0")
-            self.conn.commit()
-        if "air_datetime" not in columns:
-            self.conn.execute("ALTER TABLE library_items ADD COLUMN air_datetime TEXT")
-            self.conn.commit()
-        if "currently_airing" not in columns:
-            self.conn.execute("ALTER TABLE library_items ADD COLUMN currently_airing INTEGER DEFAULT 0")
-            self.conn.commit()
+
+class LibraryDB(SessionHelper):
+    """Database helper for the media library."""
 
     def get_items(self):
+        cursor = self.conn.cursor()
+        cursor.row_factory = _library_item_row
+        cursor.execute(f"SELECT {_ITEM_COLUMNS} FROM library_items li JOIN directories d ON d.id = li.dir_id")
+        return cursor.fetchall()
+
+    def search_ids(self, text):
+        """Return the ids of items whose title matches ``text`` (see app/core/search.py)."""
+        return search_ids(self.conn, "library_items", text)
+
+    def current_revision(self):
+        return current_revision(self.conn)
+
+    def get_items_since(self, revision):
+        """Return the ``ItemChanges`` (changed rows and deleted ids) to ``library_items`` after ``revision``."""
+        current, changed_ids, deleted_ids = changes_since(self.conn, "library_items", revision)
+        items = fetch_for_keys(
+            self.conn,
+            f"SELECT {_ITEM_COLUMNS} FROM library_items li JOIN directories d ON d.id = li.dir_id "
+            "WHERE li.id IN ({keys})",
+            changed_ids,
+            row_factory=_library_item_row,
+        )
+        return ItemChanges(current, items, deleted_ids)
+
+    def get_watching_items(self):
+        """Return the items of every series that is partly watched."""
+        cursor = self.conn.cursor()
+        cursor.row_factory = _library_item_row
+        cursor.execute(
+            f"""
+            SELECT {_ITEM_COLUMNS}
+            FROM watching_series ws
+            CROSS JOIN library_items li
+              ON li.is_series = 1 AND li.media_type = ws.media_type AND li.series_title = ws.series_title
+            JOIN directories d ON d.id = li.dir_id
+            """
+        )
+        return cursor.fetchall()
+
+    def get_list_matches(self):
+        """Return ``{list_item_id: [LibraryItem, ...]}`` for list entries with library matches."""
+        pairs = set()
+        for key, condition in _LIST_MATCH_KEYS:
+            pairs.update(
+                self.conn.execute(
+                    f"""
+                    SELECT l.id, li.id
+                    FROM list_items l
+                    CROSS JOIN library_items li
+                      ON li.media_type = l.media_type AND li.{key} = l.title_key AND li.is_placeholder = 0
+                    WHERE {condition}
+                    """
+                ).fetchall()
+            )
+        items = fetch_for_keys(
+            self.conn,
+            f"SELECT {_ITEM_COLUMNS} FROM library_items li JOIN directories d ON d.id = li.dir_id "
+            "WHERE li.id IN ({keys})",
+            {item_id for _list_id, item_id in pairs},
+            row_factory=_library_item_row,
+        )
+        items_by_id = {item.id: item for item in items}
+        matches = {}
+        for list_id, item_id in sorted(pairs):
+            matches.setdefault(list_id, []).append(items_by_id[item_id])
+        return matches
+
+    def get_unlinked_list_matches(self, paths):
+        """Return ``(list_item_id, media_type, title)`` for unlinked list entries matching ``paths``."""
+        item_ids = self._item_ids(paths).values()
+        rows = set()
+        for key, condition in _LIST_MATCH_KEYS:
+            rows.update(
+                fetch_for_keys(
+                    self.conn,
+                    f"""
+                    SELECT l.id, l.media_type, l.title
+                    FROM library_items li
+                    CROSS JOIN list_items l ON l.media_type = li.media_type AND l.title_key = li.{key}
+                    WHERE li.id IN ({{keys}}) AND li.is_placeholder = 0 AND l.library_linked = 0 AND ({condition})
+                    """,
+                    item_ids,
+                )
+            )
+        return sorted(rows)
+
+    def get_item_counts(self):
+        """Return (media_type, is_series, is_placeholder, watched, count) for each combination present."""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT media_type, is_series, is_placeholder, watched != 0, COUNT(*)
+            FROM library_items
+            GROUP BY media_type, is_series, is_placeholder, watched != 0
+            """
+        )
+        return cursor.fetchall()
+
+    def get_paths_under(self, directory):
+        """Return the paths of the items below ``directory``, which ends in its separator."""
+        cursor = self.conn.execute(
+            """
+            SELECT d.path || li.name
+            FROM directories d JOIN library_items li ON li.dir_id = d.id
+            WHERE substr(d.path, 1, length(?1)) = ?1
+            ORDER BY d.path, li.name
+            """,
+            (directory,),
+        )
+        return [row[0] for row in cursor]
+
+    def get_series_watch_counts(self):
+        """Return (media_type, series_title, watched_count, total_count) per series."""
         cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT id, path, media_type, display_title, is_series, series_title, show_title, added_at, watched,
-                   is_placeholder, air_datetime, currently_airing
+            SELECT media_type, series_title, SUM(watched != 0), COUNT(*)
             FROM library_items
+            WHERE is_series = 1 AND series_title IS NOT NULL AND series_title != ''
+            GROUP BY media_type, series_title
             """
         )
         return cursor.fetchall()
@@ -68,90 +166,251 @@ class LibraryDB:
         air_datetime=None,
         currently_airing=0,
     ):
+        self.add_items(
+            [
+                {
+                    "path": path,
+                    "media_type": media_type,
+                    "display_title": display_title,
+                    "is_series": is_series,
+                    "series_title": series_title,
+                    "show_title": show_title,
+                    "is_placeholder": is_placeholder,
+                    "air_datetime": air_datetime,
+                    "currently_airing": currently_airing,
+                }
+            ]
+        )
+
+    def add_items(self, items):
+        """Insert many items in one transaction; return ``{"inserted": [...], "ignored": [...]}`` paths."""
         query = """
         INSERT OR IGNORE INTO library_items
-        (path, media_type, display_title, is_series, series_title, show_title, added_at, watched, is_placeholder,
-         air_datetime, currently_airing)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (dir_id, name, media_type, display_title, is_series, series_title, show_title, added_at, watched,
+         is_placeholder, air_datetime, currently_airing, title_key, series_key)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """
         added_at = datetime.utcnow().isoformat(timespec="seconds")
-        self.conn.execute(
-            query,
-            (
-                path,
-                media_type,
-                display_title,
-                1 if is_series else 0,
-                series_title,
-                show_title,
-                added_at,
-                0,
-                1 if is_placeholder else 0,
-                air_datetime,
-                1 if currently_airing else 0,
-            ),
-        )
-        self.conn.commit()
+        payload = []
+        inserted = []
+        ignored = []
+        seen = set()
+        items = list(items)
+        with self.conn:
+            paths = [item["path"] for item in items]
+            dir_ids = self._directory_ids(paths, create=True)
+            existing = self._item_ids(paths)
+            for item in items:
+                path = item["path"]
+                if path in existing or path in seen:
+                    ignored.append(path)
+                    continue
+                seen.add(path)
+                inserted.append(path)
+                directory, name = split_library_path(path)
+                payload.append(
+                    (
+                        dir_ids[directory],
+                        name,
+                        item["media_type"],
+                        item["display_title"],
+                        1 if item.get("is_series") else 0,
+                        item.get("series_title"),
+                        item.get("show_title"),
+                        added_at,
+                        0,
+                        1 if item.get("is_placeholder") else 0,
+                        item.get("air_datetime"),
+                        1 if item.get("currently_airing") else 0,
+                        title_key(item["display_title"]),
+                        title_key(item.get("series_title")),
+                    )
+                )
+            self.conn.executemany(query, payload)
+        return {"inserted": inserted, "ignored": ignored}
+
+    def _directory_ids(self, paths, create=False):
+        """Map the directory of each path to its ``directories`` id, inserting unknown ones if ``create``."""
+        directories = {split_library_path(path)[0] for path in paths}
+        if create:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO directories (path) VALUES (?)", [(directory,) for directory in directories]
+            )
+        rows = fetch_for_keys(self.conn, "SELECT path, id FROM directories WHERE path IN ({keys})", directories)
+        return dict(rows)
+
+    def _item_ids(self, paths):
+        """Map each stored path in ``paths`` that is in the library to its item id."""
+        ids = {}
+        for chunk in chunked(dict.fromkeys(paths), KEY_CHUNK_SIZE // 2):
+            keys = []
+            for path in chunk:
+                keys.extend(split_library_path(path))
+            pairs = ",".join("(?, ?)" for _ in chunk)
+            rows = self.conn.execute(
+                "SELECT w.column1 || w.column2, li.id "
+                f"FROM (VALUES {pairs}) w "
+                "CROSS JOIN directories d ON d.path = w.column1 "
+                "CROSS JOIN library_items li ON li.dir_id = d.id AND li.name = w.column2",
+                keys,
+            )
+            ids.update(rows)
+        return ids
+
+    def get_known_paths(self, paths):
+        """Return the set of ``paths`` that are in the library."""
+        return set(self._item_ids(paths))
 
     def update_watched(self, paths, watched):
         if not paths:
             return
-        placeholders = ",".join("?" for _ in paths)
-        query = f"UPDATE library_items SET watched = ? WHERE path IN ({placeholders})"
-        self.conn.execute(query, (1 if watched else 0, *paths))
-        self.conn.commit()
+        query = "UPDATE library_items SET watched = ? WHERE id IN ({keys})"
+        with self.conn:
+            execute_for_keys(self.conn, query, self._item_ids(paths).values(), (1 if watched else 0,))
 
     def update_items(self, items):
         if not items:
             return
         query = """
         UPDATE library_items
-        SET media_type = ?, display_title = ?, is_series = ?, series_title = ?, show_title = ?, air_datetime = ?
-        WHERE path = ?
+        SET media_type = ?, display_title = ?, is_series = ?, series_title = ?, show_title = ?, air_datetime = ?,
+            title_key = ?, series_key = ?
+        WHERE id = ?
         """
         payload = []
-        for item in items:
-            payload.append(
-                (
-                    item["media_type"],
-                    item["display_title"],
-                    1 if item.get("is_series") else 0,
-                    item.get("series_title"),
-                    item.get("show_title"),
-                    item.get("air_datetime"),
-                    item["path"],
+        with self.conn:
+            ids = self._item_ids([item["path"] for item in items])
+            for item in items:
+                item_id = ids.get(item["path"])
+                if item_id is None:
+                    continue
+                payload.append(
+                    (
+                        item["media_type"],
+                        item["display_title"],
+                        1 if item.get("is_series") else 0,
+                        item.get("series_title"),
+                        item.get("show_title"),
+                        item.get("air_datetime"),
+                        title_key(item["display_title"]),
+                        title_key(item.get("series_title")),
+                        item_id,
+                    )
                 )
-            )
-        self.conn.executemany(query, payload)
-        self.conn.commit()
+            self.conn.executemany(query, payload)
 
     def assign_placeholder(self, placeholder_path, new_path):
         query = """
         UPDATE library_items
-        SET path = ?, is_placeholder = 0
-        WHERE path = ?
+        SET dir_id = ?, name = ?, is_placeholder = 0
+        WHERE id = ?
         """
-        self.conn.execute(query, (new_path, placeholder_path))
-        self.conn.commit()
+        with self.conn:
+            item_id = self._item_ids([placeholder_path]).get(placeholder_path)
+            if item_id is None:
+                return
+            directory, name = split_library_path(new_path)
+            dir_id = self._directory_ids([new_path], create=True)[directory]
+            self.conn.execute(query, (dir_id, name, item_id))
+            self._drop_empty_directories([placeholder_path])
 
-    def update_currently_airing(self, series_title, media_type, currently_airing):
-        if not series_title:
+    def move_items(self, moves):
+        """Move the item at ``old_path`` to ``new_path`` for each pair, keeping its id and watched state."""
+        if not moves:
+            return
+        query = "UPDATE library_items SET dir_id = ?, name = ? WHERE id = ?"
+        with self.conn:
+            ids = self._item_ids([old_path for old_path, _new_path in moves])
+            dir_ids = self._directory_ids([new_path for _old_path, new_path in moves], create=True)
+            payload = []
+            for old_path, new_path in moves:
+                item_id = ids.get(old_path)
+                if item_id is None:
+                    continue
+                directory, name = split_library_path(new_path)
+                payload.append((dir_ids[directory], name, item_id))
+            self.conn.executemany(query, payload)
+            self._drop_empty_directories(ids.keys())
+
+    def set_currently_airing(self, series_keys, currently_airing):
+        """Flag every (media_type, series_title) in ``series_keys`` in one transaction."""
+        if not series_keys:
             return
         query = """
         UPDATE library_items
         SET currently_airing = ?
         WHERE series_title = ? AND media_type = ? AND is_series = 1
         """
-        self.conn.execute(query, (1 if currently_airing else 0, series_title, media_type))
-        self.conn.commit()
+        flag = 1 if currently_airing else 0
+        with self.conn:
+            self.conn.executemany(
+                query,
+                [(flag, series_title, media_type) for media_type, series_title in series_keys],
+            )
 
     def delete_by_paths(self, paths):
         if not paths:
             return
-        placeholders = ",".join("?" for _ in paths)
-        query = f"DELETE FROM library_items WHERE path IN ({placeholders})"
-        self.conn.execute(query, tuple(paths))
-        self.conn.commit()
+        with self.conn:
+            item_ids = self._item_ids(paths).values()
+            execute_for_keys(self.conn, "DELETE FROM library_items WHERE id IN ({keys})", item_ids)
+            self._drop_empty_directories(paths)
+
+    def _drop_empty_directories(self, paths):
+        # Remove the directories of ``paths`` that no longer hold any items.
+        execute_for_keys(
+            self.conn,
+            """
+            DELETE FROM directories
+            WHERE id IN ({keys}) AND NOT EXISTS (SELECT 1 FROM library_items WHERE dir_id = directories.id)
+            """,
+            self._directory_ids(paths).values(),
+        )
 
-    def close(self):
-        self.conn.close()
+    def get_roots(self):
+        """Return the paths of the folders imported as library roots."""
+        return [row[0] for row in self.conn.execute("SELECT path FROM library_roots ORDER BY path")]
+
+    def get_manifest(self, root):
+        """Return ``{directory: DirManifest}`` for ``root`` as of its last scan, empty when unknown."""
+        cursor = self.conn.execute(
+            """
+            SELECT m.path, m.mtime_ns, m.entry_count
+            FROM library_manifest m JOIN library_roots r ON r.id = m.root_id
+            WHERE r.path = ?
+            """,
+            (root,),
+        )
+        return {path: DirManifest(mtime_ns, entry_count) for path, mtime_ns, entry_count in cursor}
+
+    def save_manifest(self, root, manifest):
+        """Record ``root`` as a library root and replace its manifest with ``manifest``."""
+        scanned_at = datetime.utcnow().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO library_roots (path, scanned_at) VALUES (?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET scanned_at = excluded.scanned_at",
+                (root, scanned_at),
+            )
+            root_id = self.conn.execute("SELECT id FROM library_roots WHERE path = ?", (root,)).fetchone()[0]
+            self.conn.execute("DELETE FROM library_manifest WHERE root_id = ?", (root_id,))
+            self.conn.executemany(
+                "INSERT INTO library_manifest (root_id, path, mtime_ns, entry_count) VALUES (?, ?, ?, ?)",
+                [(root_id, path, entry.mtime_ns, entry.entry_count) for path, entry in manifest.items()],
+            )
+
+    def get_directory_files(self, directories):
+        """Map each of ``directories`` that holds library files to the set of their names."""
+        rows = fetch_for_keys(
+            self.conn,
+            """
+            SELECT d.path, li.name
+            FROM directories d JOIN library_items li ON li.dir_id = d.id
+            WHERE d.path IN ({keys}) AND li.is_placeholder = 0
+            """,
+            directories,
+        )
+        files = {}
+        for directory, name in rows:
+            files.setdefault(directory, set()).add(name)
+        return files
@@ -1,71 +1,57 @@
-import sqlite3
 from datetime import datetime
 
+from app.core.bulk import execute_for_keys, fetch_for_keys
+from app.core.changes import changes_since, current_revision
+from app.core.db_session import SessionHelper
+from app.core.records import ItemChanges, ListItem, row_factory
+from app.core.search import search_ids
+from app.core.title_keys import title_key
 
-class ListDB:
-    """Database helper for watchlist-style entries."""
+_list_item_row = row_factory(ListItem)
 
-    def __init__(self, db_path="whatch.db"):
-        self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.create_table()
+_ITEM_QUERY = """
+SELECT li.id, li.media_type, li.title, li.added_by_person_id, p.name, li.added_at, li.library_linked
+FROM list_items li
+LEFT JOIN people p ON p.id = li.added_by_person_id
+"""
 
-    def create_table(self):
-        people_query = """
-        CREATE TABLE IF NOT EXISTS people (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            birthday TEXT
-        );
-        """
-        self.conn.execute(people_query)
 
-        query = """
-        CREATE TABLE IF NOT EXISTS list_items (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            media_type TEXT NOT NULL,
-            title TEXT NOT NULL,
-            added_by_person_id INTEGER,
-            added_at TEXT NOT NULL,
-            library_linked INTEGER DEFAULT 0
-        );
-        """
-        self.conn.execute(query)
-        self.conn.commit()
-
-        cursor = self.conn.execute("PRAGMA table_info(list_items)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if "added_by_person_id" not in columns:
-            self.conn.execute("ALTER TABLE list_items ADD COLUMN added_by_person_id INTEGER")
-            self.conn.commit()
-        if "added_at" not in columns:
-            self.conn.execute("ALTER TABLE list_items ADD COLUMN added_at TEXT")
-            now = datetime.utcnow().isoformat(timespec="seconds")
-            self.conn.execute("UPDATE list_items SET added_at = COALESCE(added_at, ?)", (now,))
-            self.conn.commit()
-        if "library_linked" not in columns:
-            self.conn.execute("ALTER TABLE list_items ADD COLUMN library_linked INTEGER DEFAULT 0")
-            self.conn.commit()
+class ListDB(SessionHelper):
+    """Database helper for watchlist-style entries."""
 
     def get_items(self):
         cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT li.id, li.media_type, li.title, li.added_by_person_id, p.name, li.added_at, li.library_linked
-            FROM list_items li
-            LEFT JOIN people p ON p.id = li.added_by_person_id
-            """
-        )
+        cursor.row_factory = _list_item_row
+        cursor.execute(_ITEM_QUERY)
         return cursor.fetchall()
 
+    def search_ids(self, text):
+        """Return the ids of items whose title matches ``text`` (see app/core/search.py)."""
+        return search_ids(self.conn, "list_items", text)
+
+    def current_revision(self):
+        return current_revision(self.conn)
+
+    def get_items_since(self, revision):
+        """Return the ``ItemChanges`` to ``list_items`` after ``revision``.
+
+        Renaming or deleting a person counts as a change to the items they
+        added, since those rows carry the person's name.
+        """
+        current, changed_ids, deleted_ids = changes_since(self.conn, "list_items", revision)
+        items = fetch_for_keys(
+            self.conn, _ITEM_QUERY + "WHERE li.id IN ({keys})", changed_ids, row_factory=_list_item_row
+        )
+        return ItemChanges(current, items, deleted_ids)
+
     def add_item(self, media_type, title, added_by_person_id=None):
         query = """
-        INSERT INTO list_items (media_type, title, added_by_person_id, added_at, library_linked)
-        VALUES (?, ?, ?, ?, 0)
+        INSERT INTO list_items (media_type, title, added_by_person_id, added_at, library_linked, title_key)
+        VALUES (?, ?, ?, ?, 0, ?)
         """
         added_at = datetime.utcnow().isoformat(timespec="seconds")
         cursor = self.conn.cursor()
-        cursor.execute(query, (media_type, title, added_by_person_id, added_at))
+        cursor.execute(query, (media_type, title, added_by_person_id, added_at, title_key(title)))
         self.conn.commit()
         return cursor.lastrowid
 
@@ -74,7 +60,7 @@ class ListDB:
             return
         query = """
         UPDATE list_items
-        SET media_type = ?, title = ?, added_by_person_id = ?, added_at = ?, library_linked = ?
+        SET media_type = ?, title = ?, added_by_person_id = ?, added_at = ?, library_linked = ?, title_key = ?
         WHERE id = ?
         """
         payload = [
@@ -84,6 +70,7 @@ class ListDB:
                 item.get("added_by_person_id"),
                 item["added_at"],
                 1 if item.get("library_linked") else 0,
+                title_key(item["title"]),
                 item["id"],
             )
             for item in items
@@ -94,18 +81,13 @@ class ListDB:
     def set_library_linked(self, item_ids, linked):
         if not item_ids:
             return
-        placeholders = ",".join("?" for _ in item_ids)
-        query = f"UPDATE list_items SET library_linked = ? WHERE id IN ({placeholders})"
-        self.conn.execute(query, (1 if linked else 0, *item_ids))
-        self.conn.commit()
+        query = "UPDATE list_items SET library_linked = ? WHERE id IN ({keys})"
+        with self.conn:
+            execute_for_keys(self.conn, query, item_ids, (1 if linked else 0,))
 
     def delete_by_ids(self, item_ids):
         if not item_ids:
             return
-        placeholders = ",".join("?" for _ in item_ids)
-        query = f"DELETE FROM list_items WHERE id IN ({placeholders})"
-        self.conn.execute(query, tuple(item_ids))
-        self.conn.commit()
-
-    def close(self):
-        self.conn.close()
+        query = "DELETE FROM list_items WHERE id IN ({keys})"
+        with self.conn:
+            execute_for_keys(self.conn, query, item_ids)
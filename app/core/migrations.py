@@ -0,0 +1,456 @@
+import sqlite3
+from datetime import datetime
+
+from app.core.paths import split_library_path
+from app.core.title_keys import title_key
+
+
+# Secondary indexes on library_items, by name: (columns, partial-index WHERE).
+# Migrations that rebuild the table recreate them from here.
+LIBRARY_ITEM_INDEXES = {
+    # Series lookups (set_currently_airing) and per-series watched counts.
+    "idx_library_items_series_watched": (("is_series", "media_type", "series_title", "watched"), None),
+    # List <-> Library link matching on normalized titles.
+    "idx_library_items_title_key": (("media_type", "title_key"), "is_placeholder = 0"),
+    "idx_library_items_series_key": (("media_type", "series_key"), "is_placeholder = 0"),
+}
+
+# Indexes that older migrations created and a later one dropped.
+_DROPPED_LIBRARY_ITEM_INDEXES = {
+    "idx_library_items_placeholder_air": (("air_datetime", "media_type", "series_title"), "is_placeholder = 1"),
+}
+
+# Ordered (version, description, apply) steps. ``apply`` receives the
+# connection inside the migration transaction and must not commit.
+MIGRATIONS = []
+
+
+def migration(version, description):
+    def register(apply):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} registered out of order")
+        MIGRATIONS.append((version, description, apply))
+        return apply
+
+    return register
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Bring the database up to the latest schema version.
+
+    A current database costs a single ``PRAGMA user_version`` read. Otherwise
+    every pending step runs in one transaction together with the version bump,
+    so a failed step leaves the database at its previous version.
+    """
+    if schema_version(conn) >= latest_version():
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = schema_version(conn)
+        for version, _description, apply in MIGRATIONS:
+            if version > current:
+                apply(conn)
+                current = version
+        conn.execute(f"PRAGMA user_version = {int(current)}")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def table_columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def add_column_if_missing(conn, table, column, definition):
+    if column in table_columns(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def create_index(conn, name, table, columns, unique=False, where=None):
+    unique_sql = "UNIQUE " if unique else ""
+    where_sql = f" WHERE {where}" if where else ""
+    conn.execute(
+        f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)}){where_sql}"
+    )
+
+
+def create_library_item_indexes(conn, names=None):
+    """Create the ``LIBRARY_ITEM_INDEXES`` entries in ``names`` (default: all).
+
+    Migrations that ran before an index was added pass the names that
+    existed at their version, since later indexes may cover columns that
+    don't exist yet.
+    """
+    for name in names or LIBRARY_ITEM_INDEXES:
+        columns, where = LIBRARY_ITEM_INDEXES.get(name) or _DROPPED_LIBRARY_ITEM_INDEXES[name]
+        create_index(conn, name, "library_items", columns, where=where)
+
+
+# Tables whose row changes are recorded in change_log, each under a global,
+# monotonically increasing revision. See app/core/changes.py for the reader.
+CHANGE_TRACKED_TABLES = ("library_items", "list_items")
+
+
+def _log_change_sql(table, row_id, deleted):
+    return f"""
+    UPDATE change_revision SET value = value + 1;
+    INSERT OR REPLACE INTO change_log (table_name, row_id, revision, deleted)
+    VALUES ('{table}', {row_id}, (SELECT value FROM change_revision), {deleted});
+    """
+
+
+def create_change_triggers(conn, table):
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_log_insert AFTER INSERT ON {table} "
+        f"BEGIN {_log_change_sql(table, 'NEW.id', 0)} END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_log_update AFTER UPDATE ON {table} "
+        f"BEGIN {_log_change_sql(table, 'NEW.id', 0)} END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_log_delete AFTER DELETE ON {table} "
+        f"BEGIN {_log_change_sql(table, 'OLD.id', 1)} END"
+    )
+
+
+# Title columns covered by each table's ``<table>_fts`` full-text index.
+SEARCH_INDEX_COLUMNS = {
+    "library_items": ("display_title", "series_title"),
+    "list_items": ("title",),
+}
+
+
+def fts5_available(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)")
+    except sqlite3.OperationalError:
+        return False
+    conn.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+
+def create_search_index(conn, table):
+    """Create ``<table>_fts`` over ``table``'s title columns, kept in sync by triggers.
+
+    The index is external-content: it stores only the tokens and reads the
+    titles back from ``table`` itself.
+    """
+    columns = SEARCH_INDEX_COLUMNS[table]
+    fts = f"{table}_fts"
+    names = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    old_values = ", ".join(f"OLD.{column}" for column in columns)
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {names}, content='{table}', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+        )
+        """
+    )
+    insert = f"INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new_values});"
+    delete = f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old_values});"
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN {insert} END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN {delete} END")
+    conn.execute(
+        f"CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {names} ON {table} "
+        f"BEGIN {delete} {insert} END"
+    )
+    conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def rebuild_table(conn, table, create_sql, column_map):
+    """Recreate ``table`` from ``create_sql`` and copy rows across.
+
+    ``create_sql`` must create a table named ``<table>__new``. ``column_map``
+    maps each new column to the SQL expression over the old table that
+    fills it. Indexes and triggers on the old table are dropped with it and
+    have to be recreated by the calling migration; views that reference it
+    must be dropped beforehand.
+    """
+    new_table = f"{table}__new"
+    conn.execute(create_sql)
+    targets = ", ".join(column_map.keys())
+    sources = ", ".join(column_map.values())
+    conn.execute(f"INSERT INTO {new_table} ({targets}) SELECT {sources} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+
+@migration(1, "baseline schema")
+def _baseline(conn):
+    # Databases created before versioning have no user_version but may be
+    # missing columns that were added over time, so this step still
+    # inspects the existing tables. It only ever runs once per database.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS people (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            birthday TEXT,
+            list_last_pick_count INTEGER DEFAULT 0
+        )
+        """
+    )
+    add_column_if_missing(conn, "people", "birthday", "TEXT")
+    if add_column_if_missing(conn, "people", "list_last_pick_count", "INTEGER DEFAULT 0"):
+        conn.execute("UPDATE people SET list_last_pick_count = COALESCE(list_last_pick_count, 0)")
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS watching (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            series TEXT NOT NULL,
+            progress INTEGER DEFAULT 0
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS currently_watching (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            type TEXT NOT NULL,
+            progress TEXT
+        )
+        """
+    )
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS library_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            media_type TEXT NOT NULL,
+            display_title TEXT NOT NULL,
+            is_series INTEGER DEFAULT 0,
+            series_title TEXT,
+            show_title TEXT,
+            added_at TEXT NOT NULL,
+            watched INTEGER DEFAULT 0,
+            is_placeholder INTEGER DEFAULT 0,
+            air_datetime TEXT,
+            currently_airing INTEGER DEFAULT 0
+        )
+        """
+    )
+    add_column_if_missing(conn, "library_items", "watched", "INTEGER DEFAULT 0")
+    add_column_if_missing(conn, "library_items", "is_placeholder", "INTEGER DEFAULT 0")
+    add_column_if_missing(conn, "library_items", "air_datetime", "TEXT")
+    add_column_if_missing(conn, "library_items", "currently_airing", "INTEGER DEFAULT 0")
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS list_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            media_type TEXT NOT NULL,
+            title TEXT NOT NULL,
+            added_by_person_id INTEGER,
+            added_at TEXT NOT NULL,
+            library_linked INTEGER DEFAULT 0
+        )
+        """
+    )
+    add_column_if_missing(conn, "list_items", "added_by_person_id", "INTEGER")
+    if add_column_if_missing(conn, "list_items", "added_at", "TEXT"):
+        now = datetime.utcnow().isoformat(timespec="seconds")
+        conn.execute("UPDATE list_items SET added_at = COALESCE(added_at, ?)", (now,))
+    add_column_if_missing(conn, "list_items", "library_linked", "INTEGER DEFAULT 0")
+
+
+_V2_LIBRARY_ITEM_INDEXES = ("idx_library_items_series_watched", "idx_library_items_placeholder_air")
+
+
+@migration(2, "library_items secondary indexes")
+def _library_item_indexes(conn):
+    create_library_item_indexes(conn, _V2_LIBRARY_ITEM_INDEXES)
+
+
+# Series with some but not all entries watched; backed by
+# idx_library_items_series_watched.
+WATCHING_SERIES_VIEW = """
+CREATE VIEW IF NOT EXISTS watching_series AS
+SELECT media_type, series_title, SUM(watched != 0) AS watched_count, COUNT(*) AS total_count
+FROM library_items
+WHERE is_series = 1 AND series_title IS NOT NULL AND series_title != ''
+GROUP BY media_type, series_title
+HAVING SUM(watched != 0) > 0 AND SUM(watched != 0) < COUNT(*)
+"""
+
+
+@migration(3, "watching_series view")
+def _watching_series_view(conn):
+    conn.execute(WATCHING_SERIES_VIEW)
+
+
+@migration(4, "library_items paths split into directories + name")
+def _library_item_directories(conn):
+    conn.create_function("whatch_path_dir", 1, lambda path: split_library_path(path)[0], deterministic=True)
+    conn.create_function("whatch_path_name", 1, lambda path: split_library_path(path)[1], deterministic=True)
+    conn.execute(
+        """
+        CREATE TABLE directories (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO directories (path) SELECT whatch_path_dir(path) FROM library_items")
+    conn.execute("DROP VIEW IF EXISTS watching_series")
+    rebuild_table(
+        conn,
+        "library_items",
+        """
+        CREATE TABLE library_items__new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dir_id INTEGER NOT NULL REFERENCES directories (id),
+            name TEXT NOT NULL,
+            media_type TEXT NOT NULL,
+            display_title TEXT NOT NULL,
+            is_series INTEGER DEFAULT 0,
+            series_title TEXT,
+            show_title TEXT,
+            added_at TEXT NOT NULL,
+            watched INTEGER DEFAULT 0,
+            is_placeholder INTEGER DEFAULT 0,
+            air_datetime TEXT,
+            currently_airing INTEGER DEFAULT 0,
+            UNIQUE (dir_id, name)
+        )
+        """,
+        {
+            "id": "id",
+            "dir_id": "(SELECT d.id FROM directories d WHERE d.path = whatch_path_dir(library_items.path))",
+            "name": "whatch_path_name(path)",
+            "media_type": "media_type",
+            "display_title": "display_title",
+            "is_series": "is_series",
+            "series_title": "series_title",
+            "show_title": "show_title",
+            "added_at": "added_at",
+            "watched": "watched",
+            "is_placeholder": "is_placeholder",
+            "air_datetime": "air_datetime",
+            "currently_airing": "currently_airing",
+        },
+    )
+    create_library_item_indexes(conn, _V2_LIBRARY_ITEM_INDEXES)
+    conn.execute(WATCHING_SERIES_VIEW)
+
+
+@migration(5, "change_log revision tracking")
+def _change_log(conn):
+    conn.execute("CREATE TABLE change_revision (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)")
+    conn.execute("INSERT INTO change_revision (id, value) VALUES (1, 0)")
+    # One row per tracked row, holding the revision of its latest change;
+    # deleted rows stay behind as tombstones so readers can drop them.
+    conn.execute(
+        """
+        CREATE TABLE change_log (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            revision INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (table_name, row_id)
+        ) WITHOUT ROWID
+        """
+    )
+    create_index(conn, "idx_change_log_revision", "change_log", ("table_name", "revision"))
+    for table in CHANGE_TRACKED_TABLES:
+        create_change_triggers(conn, table)
+    # list_items rows carry the name of the person who added them.
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_people_log_list_items
+        AFTER UPDATE OF name ON people
+        BEGIN
+            UPDATE change_revision SET value = value + 1;
+            INSERT OR REPLACE INTO change_log (table_name, row_id, revision, deleted)
+            SELECT 'list_items', id, (SELECT value FROM change_revision), 0
+            FROM list_items WHERE added_by_person_id = NEW.id;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_people_log_list_items_delete
+        AFTER DELETE ON people
+        BEGIN
+            UPDATE change_revision SET value = value + 1;
+            INSERT OR REPLACE INTO change_log (table_name, row_id, revision, deleted)
+            SELECT 'list_items', id, (SELECT value FROM change_revision), 0
+            FROM list_items WHERE added_by_person_id = OLD.id;
+        END
+        """
+    )
+
+
+@migration(6, "FTS5 title search indexes")
+def _search_indexes(conn):
+    # SQLite builds without FTS5 skip the indexes; search then falls back to
+    # LIKE (see app/core/search.py).
+    if not fts5_available(conn):
+        return
+    for table in SEARCH_INDEX_COLUMNS:
+        create_search_index(conn, table)
+
+
+@migration(7, "normalized title keys for list/library linking")
+def _title_keys(conn):
+    conn.create_function("whatch_title_key", 1, title_key, deterministic=True)
+    conn.execute("ALTER TABLE library_items ADD COLUMN title_key TEXT")
+    conn.execute("ALTER TABLE library_items ADD COLUMN series_key TEXT")
+    conn.execute("ALTER TABLE list_items ADD COLUMN title_key TEXT")
+    conn.execute(
+        "UPDATE library_items SET title_key = whatch_title_key(display_title), "
+        "series_key = whatch_title_key(series_title)"
+    )
+    conn.execute("UPDATE list_items SET title_key = whatch_title_key(title)")
+    create_library_item_indexes(conn, ("idx_library_items_title_key", "idx_library_items_series_key"))
+    create_index(conn, "idx_list_items_title_key", "list_items", ("media_type", "title_key"))
+
+
+@migration(8, "library roots and directory manifests for rescans")
+def _library_roots(conn):
+    conn.execute(
+        """
+        CREATE TABLE library_roots (
+            id INTEGER PRIMARY KEY,
+            path TEXT NOT NULL UNIQUE,
+            scanned_at TEXT NOT NULL
+        )
+        """
+    )
+    # One row per directory under a root as of its last scan, so a rescan
+    # only lists the directories whose mtime has moved since.
+    conn.execute(
+        """
+        CREATE TABLE library_manifest (
+            root_id INTEGER NOT NULL REFERENCES library_roots (id),
+            path TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            entry_count INTEGER NOT NULL,
+            PRIMARY KEY (root_id, path)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+@migration(9, "drop the unused placeholder air-date index")
+def _drop_placeholder_air_index(conn):
+    # Air notes and the airing flags are derived from the items the library
+    # view has already loaded, so no query reads placeholders by air date.
+    conn.execute("DROP INDEX IF EXISTS idx_library_items_placeholder_air")
@@ -0,0 +1,25 @@
+import os
+
+
+def split_library_path(path):
+    """Split a stored path into (directory, name) at its last separator.
+
+    The directory keeps its trailing separator so ``directory + name`` gives
+    back the original text exactly, whichever separators it used. Paths with
+    no separator, such as placeholder keys, get an empty directory.
+    """
+    cut = max(path.rfind("/"), path.rfind("\\")) + 1
+    return path[:cut], path[cut:]
+
+
+def absolute_library_path(path):
+    """Make a path given on the command line absolute, the way the library stores paths.
+
+    Unlike ``os.path.abspath``, the separators already in ``path`` are left
+    as they are: the import dialog stores its folder as Qt gives it (``/`` on
+    Windows too) joined to names with ``os.sep``, and lookups match the
+    stored text exactly.
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(os.getcwd(), path)
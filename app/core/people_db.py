@@ -1,54 +1,22 @@
-import sqlite3
+from app.core.db_session import SessionHelper
+from app.core.records import Person, PersonStats, row_factory
 
-class PeopleDB:
-    def __init__(self, db_path="whatch.db"):
-        self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.create_tables()
+_person_row = row_factory(Person)
+_person_stats_row = row_factory(PersonStats)
 
-    def create_tables(self):
-        people_query = """
-        CREATE TABLE IF NOT EXISTS people (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            birthday TEXT,
-            list_last_pick_count INTEGER DEFAULT 0
-            -- You can add more columns (e.g. email, preferences, etc.) as needed.
-        );
-        """
-        self.conn.execute(people_query)
-
-        watching_query = """
-        CREATE TABLE IF NOT EXISTS watching (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            series TEXT NOT NULL,
-            progress INTEGER DEFAULT 0
-        );
-        """
-        self.conn.execute(watching_query)
-        self.conn.commit()
-
-        # If the table existed before the birthday column was introduced,
-        # ensure the column is present.
-        cursor = self.conn.execute("PRAGMA table_info(people)")
-        columns = [row[1] for row in cursor.fetchall()]
-        if "birthday" not in columns:
-            self.conn.execute("ALTER TABLE people ADD COLUMN birthday TEXT")
-            self.conn.commit()
-        if "list_last_pick_count" not in columns:
-            self.conn.execute("ALTER TABLE people ADD COLUMN list_last_pick_count INTEGER DEFAULT 0")
-            self.conn.execute("UPDATE people SET list_last_pick_count = COALESCE(list_last_pick_count, 0)")
-            self.conn.commit()
 
+class PeopleDB(SessionHelper):
     def get_people(self):
-        """Return a list of (id, name, birthday) tuples."""
+        """Return a list of Person(id, name, birthday) rows."""
         cursor = self.conn.cursor()
+        cursor.row_factory = _person_row
         cursor.execute("SELECT id, name, birthday FROM people")
         return cursor.fetchall()
 
     def get_people_with_stats(self):
-        """Return a list of (id, name, birthday, list_last_pick_count) tuples."""
+        """Return a list of PersonStats(id, name, birthday, list_last_pick_count) rows."""
         cursor = self.conn.cursor()
+        cursor.row_factory = _person_stats_row
         cursor.execute(
             """
             SELECT id, name, birthday, COALESCE(list_last_pick_count, 0)
@@ -103,13 +71,8 @@ class PeopleDB:
         self.conn.commit()
 
     def reset_database(self):
-        """Delete all data and recreate the people and watching tables."""
-        self.conn.close()
-        import os
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
-        self.conn = sqlite3.connect(self.db_path)
-        self.create_tables()
-
-    def close(self):
-        self.conn.close()
+        """Delete every person and watching entry, starting their ids from 1 again."""
+        with self.conn:
+            self.conn.execute("DELETE FROM people")
+            self.conn.execute("DELETE FROM watching")
+            self.conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('people', 'watching')")
@@ -0,0 +1,51 @@
+from collections import namedtuple
+
+
+# Row types returned by the DB helpers. They are tuple subclasses with empty
+# __slots__, so a row costs the same as the plain tuple sqlite3 would have
+# returned, and fields can be read by name or by position.
+
+
+class LibraryItem(
+    namedtuple(
+        "LibraryItem",
+        "id path media_type display_title is_series series_title show_title added_at watched "
+        "is_placeholder air_datetime currently_airing",
+    )
+):
+    __slots__ = ()
+
+
+class ListItem(
+    namedtuple(
+        "ListItem",
+        "id media_type title added_by_person_id added_by_name added_at library_linked",
+    )
+):
+    __slots__ = ()
+
+
+class Person(namedtuple("Person", "id name birthday")):
+    __slots__ = ()
+
+
+class PersonStats(namedtuple("PersonStats", "id name birthday list_last_pick_count")):
+    __slots__ = ()
+
+
+class DirManifest(namedtuple("DirManifest", "mtime_ns entry_count")):
+    __slots__ = ()
+
+
+class ItemChanges(namedtuple("ItemChanges", "revision items deleted_ids")):
+    __slots__ = ()
+
+
+def row_factory(record_type):
+    """Return a sqlite3 ``row_factory`` that builds ``record_type`` rows."""
+    new = tuple.__new__
+
+    def factory(_cursor, row):
+        return new(record_type, row)
+
+    return factory
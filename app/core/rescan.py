@@ -0,0 +1,29 @@
+# A rescan compares each library root with its manifest (see
+# ``app.ui.library_scanner.rescan_root``); the functions here apply the
+# ``RescanResult``s it returns to the library.
+
+
+def rescan_changes(results):
+    """Return the ``(new, missing, moved)`` of ``results``, each listed once even when roots are nested."""
+    new = list(dict.fromkeys(path for result in results for path in result.new))
+    missing = list(dict.fromkeys(path for result in results for path in result.missing))
+    moved = list(dict.fromkeys(pair for result in results for pair in result.moved))
+    return new, missing, moved
+
+
+def apply_rescan(db, results, import_new):
+    """Move and remove the files ``results`` found, add the new ones and save the roots' manifests.
+
+    ``import_new(selection)`` adds the new files under the selected paths and
+    returns false when the import is cancelled, which leaves the manifests
+    as they were so the next rescan offers the new files again.
+    """
+    new, missing, moved = rescan_changes(results)
+    db.move_items(moved)
+    db.delete_by_paths(missing)
+    if new:
+        selection = list(dict.fromkeys(path for result in results for path in result.import_paths()))
+        if not import_new(selection):
+            return
+    for result in results:
+        db.save_manifest(result.root, result.manifest)
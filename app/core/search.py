@@ -0,0 +1,56 @@
+import re
+
+from app.core.migrations import SEARCH_INDEX_COLUMNS
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def match_expression(text):
+    """Turn free text into an FTS5 query where every word is a token prefix."""
+    return _prefix_query(_WORD_RE.findall(text))
+
+
+def _prefix_query(words):
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def has_search_index(conn, table):
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{table}_fts",)
+    ).fetchone()
+    return row is not None
+
+
+def search_ids(conn, table, text):
+    """Return the ids of ``table`` rows whose titles match every word of ``text``.
+
+    Words match the start of any title word, ignoring case and diacritics.
+    Without an FTS5 index they match anywhere in a title instead, and only
+    ASCII letters are case-folded.
+    """
+    words = _WORD_RE.findall(text)
+    if not words:
+        return []
+    if has_search_index(conn, table):
+        return _fts_search_ids(conn, table, words)
+    return _like_search_ids(conn, table, words)
+
+
+def _fts_search_ids(conn, table, words):
+    rows = conn.execute(
+        f"SELECT rowid FROM {table}_fts WHERE {table}_fts MATCH ?", (_prefix_query(words),)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def _like_search_ids(conn, table, words):
+    columns = SEARCH_INDEX_COLUMNS[table]
+    word_clause = "(" + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns) + ")"
+    patterns = []
+    for word in words:
+        escaped = word.replace("\\", "\\\\").replace("_", "\\_")
+        patterns.extend([f"%{escaped}%"] * len(columns))
+    rows = conn.execute(
+        f"SELECT id FROM {table} WHERE {' AND '.join([word_clause] * len(words))}", patterns
+    ).fetchall()
+    return [row[0] for row in rows]
@@ -0,0 +1,7 @@
+def title_key(text):
+    """Return the key titles are matched on between the List and the Library.
+
+    Lowercased with runs of whitespace collapsed, so "The  Office " and
+    "the office" link up. Empty titles have no key (``None``) and never match.
+    """
+    return " ".join((text or "").lower().split()) or None
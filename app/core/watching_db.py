@@ -1,27 +1,9 @@
-import sqlite3
+from app.core.db_session import SessionHelper
 
 
-class WatchingDB:
+class WatchingDB(SessionHelper):
     """Database helper for the "Currently Watching" list."""
 
-    def __init__(self, db_path="whatch.db"):
-        self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.create_table()
-
-    def create_table(self):
-        """Create the table used to store currently watching items."""
-        query = """
-        CREATE TABLE IF NOT EXISTS currently_watching (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            type TEXT NOT NULL,
-            progress TEXT
-        );
-        """
-        self.conn.execute(query)
-        self.conn.commit()
-
     def get_items(self):
         """Return a list of (id, title, type, progress) tuples."""
         cursor = self.conn.cursor()
@@ -49,6 +31,3 @@ class WatchingDB:
         query = "DELETE FROM currently_watching WHERE id = ?"
         self.conn.execute(query, (item_id,))
         self.conn.commit()
-
-    def close(self):
-        self.conn.close()
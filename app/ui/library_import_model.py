@@ -0,0 +1,414 @@
+import os
+
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+from PyQt6.QtWidgets import QComboBox, QStyledItemDelegate
+
+from app.ui.library_utils import _series_index_prefix
+
+
+MEDIA_TYPES = ("Movie", "TV")
+IMPORT_COLUMNS = ("Type", "File", "Title", "Series", "Series Title", "# in Series", "Exclude")
+(
+    TYPE_COLUMN,
+    FILE_COLUMN,
+    TITLE_COLUMN,
+    SERIES_COLUMN,
+    SERIES_TITLE_COLUMN,
+    SERIES_INDEX_COLUMN,
+    EXCLUDE_COLUMN,
+) = range(len(IMPORT_COLUMNS))
+
+_READ_ONLY = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+_EDITABLE = _READ_ONLY | Qt.ItemFlag.ItemIsEditable
+_CHECKABLE = _READ_ONLY | Qt.ItemFlag.ItemIsUserCheckable
+
+# Node attribute edited through each column.
+_COLUMN_FIELDS = {
+    TYPE_COLUMN: "media_type",
+    TITLE_COLUMN: "display_title",
+    SERIES_COLUMN: "is_series",
+    SERIES_TITLE_COLUMN: "series_title",
+    SERIES_INDEX_COLUMN: "series_index",
+    EXCLUDE_COLUMN: "exclude",
+}
+
+
+# Fields a folder edit carries down to the rows below it.
+INHERITED_FIELDS = ("media_type", "is_series", "series_title", "series_index", "exclude")
+
+
+def _inherited(field):
+    own = "_" + field
+
+    def get(node):
+        return getattr(node.source(field), own)
+
+    def set_own(node, value):
+        setattr(node, own, value)
+
+    return property(get, set_own, doc=f"The ``{field}`` in effect for this node; setting it sets the node's own value.")
+
+
+class ImportNode:
+    """One folder or file row of the import grid; it shows the latest edited value on its way up the tree."""
+
+    __slots__ = (
+        "path",
+        "name",
+        "parent",
+        "children",
+        "row",
+        "is_folder",
+        "display_title",
+        "_stamps",
+        "_file_numbers",
+        "_media_type",
+        "_is_series",
+        "_series_title",
+        "_series_index",
+        "_exclude",
+    )
+
+    media_type = _inherited("media_type")
+    is_series = _inherited("is_series")
+    series_title = _inherited("series_title")
+    exclude = _inherited("exclude")
+
+    def __init__(self, path, parent=None, is_folder=True):
+        self.path = path
+        self.name = os.path.basename(path) or path
+        self.parent = parent
+        self.children = []
+        self.row = 0
+        self.is_folder = is_folder
+        self.display_title = None
+        self._stamps = None
+        self._file_numbers = None
+        self._media_type = "Movie"
+        self._is_series = False
+        self._series_title = ""
+        self._series_index = ""
+        self._exclude = False
+
+    @classmethod
+    def from_row(cls, row, parent):
+        node = cls(row.path, parent, row.is_folder)
+        node._media_type = row.media_type
+        node._is_series = row.media_type == "TV"
+        node._series_title = row.series_title or ""
+        node._series_index = row.series_index or ""
+        node.display_title = row.display_title
+        return node
+
+    def descendants(self):
+        """Yield every node below this one, parents before their children."""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def stamp(self, field):
+        """When this node's own value of ``field`` was last set by an edit; 0 if never."""
+        if self._stamps is None:
+            return 0
+        return self._stamps.get(field, 0)
+
+    def source(self, field):
+        """Return the node, this one or an ancestor, whose value of ``field`` applies here."""
+        source = self
+        latest = self.stamp(field)
+        node = self.parent
+        while node is not None:
+            stamp = node.stamp(field)
+            if stamp > latest:
+                source = node
+                latest = stamp
+            node = node.parent
+        return source
+
+    def override(self, field, value, stamp):
+        """Set ``field`` as edited at ``stamp``, taking precedence over older values below."""
+        setattr(self, "_" + field, value)
+        if self._stamps is None:
+            self._stamps = {}
+        self._stamps[field] = stamp
+        if field == "series_index":
+            self._file_numbers = None
+
+    @property
+    def series_index(self):
+        """The ``series_index`` in effect; files below a folder edited to "2" are numbered "2.1", "2.2", ..."""
+        source = self.source("series_index")
+        value = source._series_index
+        if source is self or self.is_folder:
+            return value
+        prefix = _series_index_prefix(value)
+        if not prefix:
+            return value
+        return f"{prefix}.{source.number_files()[self]}"
+
+    @series_index.setter
+    def series_index(self, value):
+        self._series_index = value
+
+    def number_files(self):
+        """Return ``{file node: number}`` for the files under this folder, in tree order."""
+        if self._file_numbers is None:
+            self._file_numbers = {}
+            for node in self.descendants():
+                if not node.is_folder:
+                    self._file_numbers[node] = len(self._file_numbers) + 1
+        return self._file_numbers
+
+
+class ImportTreeModel(QAbstractItemModel):
+    """The rows of ``LibraryImportDialog`` as plain ``ImportNode`` objects."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = ImportNode("")
+        self._folders = {}
+        self.file_nodes = []
+        self._clock = 0
+        self._numbered = []
+
+    def clear(self):
+        self.beginResetModel()
+        self._root = ImportNode("")
+        self._folders = {}
+        self.file_nodes = []
+        self._clock = 0
+        self._numbered = []
+        self.endResetModel()
+
+    def top_level_nodes(self):
+        return self._root.children
+
+    def nodes(self):
+        """Yield every node, parents before their children."""
+        return self._root.descendants()
+
+    def add_rows(self, rows):
+        """Append ``ImportRow``s, which come parent-first, and return the new nodes."""
+        self._freeze_numbers()
+        added = []
+        run_parent = None
+        run = []
+        for row in rows:
+            parent = self._folders.get(row.parent, self._root) if row.parent is not None else self._root
+            if parent is not run_parent:
+                self._append(run_parent, run)
+                run_parent = parent
+                run = []
+            node = ImportNode.from_row(row, parent)
+            run.append(node)
+            added.append(node)
+            if node.is_folder:
+                self._folders[node.path] = node
+            else:
+                self.file_nodes.append(node)
+                folder = parent
+                while folder is not None:
+                    if folder._file_numbers is not None:
+                        folder._file_numbers[node] = len(folder._file_numbers) + 1
+                    folder = folder.parent
+        self._append(run_parent, run)
+        return added
+
+    def _append(self, parent, nodes):
+        # Rows that share a parent are inserted together, one notification
+        # for a whole directory of files.
+        if not nodes:
+            return
+        first = len(parent.children)
+        self.beginInsertRows(self.index_of(parent), first, first + len(nodes) - 1)
+        for offset, node in enumerate(nodes):
+            node.row = first + offset
+        parent.children.extend(nodes)
+        self.endInsertRows()
+
+    def sort_tree(self, key):
+        """Sort the children of every top-level node, recursively, by ``key(node)``."""
+        self._freeze_numbers()
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        for node in self._root.children:
+            self._sort_children(node, key)
+        self.changePersistentIndexList(
+            persistent, [self.index_of(index.internalPointer(), index.column()) for index in persistent]
+        )
+        self.layoutChanged.emit()
+
+    def _freeze_numbers(self):
+        # Files keep the numbers a folder's series index gave them in the
+        # tree as it was, before rows are added or moved.
+        for node in self._numbered:
+            node.number_files()
+        self._numbered = []
+
+    def _sort_children(self, node, key):
+        for child in node.children:
+            self._sort_children(child, key)
+        node.children.sort(key=key)
+        for row, child in enumerate(node.children):
+            child.row = row
+
+    def set_field(self, node, field, value):
+        """Set ``field`` on ``node``; on a folder the value carries down to every descendant."""
+        if field == "media_type" and value == "TV" and not node.is_series:
+            self.set_field(node, "is_series", True)
+        if field not in INHERITED_FIELDS:
+            setattr(node, field, value)
+            self._row_changed(node)
+            return
+        self._clock += 1
+        node.override(field, value, self._clock)
+        if field == "series_index" and node.is_folder:
+            self._numbered.append(node)
+        self._row_changed(node)
+        if node.is_folder:
+            self._subtree_changed(node)
+
+    def set_values(self, field, values):
+        """Set the own value of ``field`` from ``{node: value}``, without carrying down."""
+        for node, value in values.items():
+            setattr(node, field, value)
+            self._row_changed(node)
+
+    def apply_to_all(self, media_type, is_series, series_title=None):
+        self._clock += 1
+        self._root.override("media_type", media_type, self._clock)
+        self._root.override("is_series", is_series, self._clock)
+        if series_title:
+            self._root.override("series_title", series_title, self._clock)
+        self._subtree_changed(self._root)
+
+    def _row_changed(self, node):
+        self.dataChanged.emit(self.index_of(node), self.index_of(node, len(IMPORT_COLUMNS) - 1))
+
+    def _subtree_changed(self, node):
+        # One notification for the folder's children, whatever lies deeper:
+        # values below are resolved when read, and the view repaints every
+        # row it shows on a change that spans several rows.
+        if node.children:
+            parent = self.index_of(node)
+            self.dataChanged.emit(
+                self.index(0, 0, parent), self.index(len(node.children) - 1, len(IMPORT_COLUMNS) - 1, parent)
+            )
+
+    def index_of(self, node, column=0):
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, column, node)
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        children = self.node(parent).children
+        if 0 <= row < len(children) and 0 <= column < len(IMPORT_COLUMNS):
+            return self.createIndex(row, column, children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_of(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(IMPORT_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return IMPORT_COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == TYPE_COLUMN:
+                return node.media_type
+            if column == FILE_COLUMN:
+                return node.name
+            if column == TITLE_COLUMN:
+                return node.display_title
+            if column == SERIES_TITLE_COLUMN and node.is_series:
+                return node.series_title
+            if column == SERIES_INDEX_COLUMN and node.is_series:
+                return node.series_index
+        elif role == Qt.ItemDataRole.CheckStateRole:
+            if column == SERIES_COLUMN:
+                return Qt.CheckState.Checked if node.is_series else Qt.CheckState.Unchecked
+            if column == EXCLUDE_COLUMN:
+                return Qt.CheckState.Checked if node.exclude else Qt.CheckState.Unchecked
+        elif role == Qt.ItemDataRole.ToolTipRole and column == FILE_COLUMN:
+            return node.path
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        node = index.internalPointer()
+        column = index.column()
+        if column in (SERIES_COLUMN, EXCLUDE_COLUMN):
+            return _CHECKABLE
+        if (
+            column == TYPE_COLUMN
+            or (column == TITLE_COLUMN and not node.is_folder)
+            or (column in (SERIES_TITLE_COLUMN, SERIES_INDEX_COLUMN) and node.is_series)
+        ):
+            return _EDITABLE
+        return _READ_ONLY
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or self.flags(index) == _READ_ONLY:
+            return False
+        column = index.column()
+        if role == Qt.ItemDataRole.CheckStateRole and column in (SERIES_COLUMN, EXCLUDE_COLUMN):
+            value = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif role != Qt.ItemDataRole.EditRole or column in (SERIES_COLUMN, EXCLUDE_COLUMN):
+            return False
+        node = index.internalPointer()
+        field = _COLUMN_FIELDS[column]
+        # Leaving an editor commits its text even when unchanged; only real
+        # changes carry down, so a folder's children keep their own values.
+        if getattr(node, field) != value:
+            self.set_field(node, field, value)
+        return True
+
+
+class ImportItemDelegate(QStyledItemDelegate):
+    """Edits import cells, with a Movie/TV combo box for the Type column."""
+
+    def createEditor(self, parent, option, index):
+        if index.column() != TYPE_COLUMN:
+            return super().createEditor(parent, option, index)
+        editor = QComboBox(parent)
+        editor.addItems(MEDIA_TYPES)
+        editor.activated.connect(lambda _index: self._commit_and_close(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        if isinstance(editor, QComboBox):
+            editor.setCurrentText(index.data())
+            return
+        super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(editor, QComboBox):
+            model.setData(index, editor.currentText())
+            return
+        super().setModelData(editor, model, index)
+
+    def _commit_and_close(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
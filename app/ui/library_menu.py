@@ -1,18 +1,21 @@
 import os
 import tempfile
+import time
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta
 
-from PyQt6.QtCore import Qt, QProcess, QSize, QTimer, QEvent
+from PyQt6.QtCore import Qt, QProcess, QSize, QThread, QTimer, QEvent, pyqtSignal
 from PyQt6.QtWidgets import (
     QAbstractItemView,
+    QApplication,
     QWidget,
     QVBoxLayout,
     QLabel,
     QTreeWidget,
     QTreeWidgetItem,
     QTreeWidgetItemIterator,
+    QTreeView,
     QPushButton,
     QHBoxLayout,
     QMessageBox,
@@ -30,36 +33,72 @@ from PyQt6.QtWidgets import (
     QTableWidgetItem,
 )
 
+from app.core.import_plan import iter_plan_items, write_plan
 from app.core.library_db import LibraryDB
 from app.core.list_db import ListDB
+from app.core.rescan import apply_rescan, rescan_changes
+from app.ui.library_import_model import IMPORT_COLUMNS, MEDIA_TYPES, ImportItemDelegate, ImportTreeModel
+from app.ui.library_scanner import iter_import_rows, rescan_root
 from app.ui.library_utils import (
+    IMPORT_PLAN_FILTER,
     VIDEO_FILE_FILTER,
     _build_show_air_notes,
-    _clean_series_title,
+    _debounced_search_edit,
     _default_display_title,
-    _default_episode_title,
-    _default_show_and_series,
-    _detect_default_type,
-    _extract_tv_episode_parts,
+    _dominant_series_titles,
+    _filter_tree_items,
     _format_air_datetime_display,
-    _import_dir_sort_key,
-    _import_file_sort_key,
-    _is_video_file,
     _parse_air_datetime_value,
     _parse_series_index_values,
     _season_number_from_name,
     _series_index_prefix,
     _series_index_sort_key,
+    _stale_airing_series,
 )
 
 
+# Rows are handed to the import dialog once this many are ready, or after
+# IMPORT_BATCH_INTERVAL seconds, whichever comes first.
+IMPORT_BATCH_SIZE = 200
+IMPORT_BATCH_INTERVAL = 0.1
+
+
+class _ImportScanWorker(QThread):
+    """Walks and parses an import selection off the GUI thread."""
+
+    rows_found = pyqtSignal(list)
+
+    def __init__(self, selected_paths, parent=None):
+        super().__init__(parent)
+        self.selected_paths = list(selected_paths)
+        self.manifest = {}
+
+    def run(self):
+        batch = []
+        last_emit = time.monotonic()
+        rows = iter_import_rows(self.selected_paths, is_cancelled=self.isInterruptionRequested, manifest=self.manifest)
+        for row in rows:
+            batch.append(row)
+            now = time.monotonic()
+            if len(batch) >= IMPORT_BATCH_SIZE or now - last_emit >= IMPORT_BATCH_INTERVAL:
+                self.rows_found.emit(batch)
+                batch = []
+                last_emit = now
+        if batch:
+            self.rows_found.emit(batch)
+
+
 class LibraryImportDialog(QDialog):
     def __init__(self, selected_paths, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Add to Library")
         self.selected_paths = selected_paths
-        self.row_widgets = {}
-        self.file_items = []
+        self.model = ImportTreeModel(self)
+        self._scan_worker = None
+        self._scan_stopped = False
+        # {root: {directory: DirManifest}} for the selected folders, once the
+        # scan has finished; see iter_import_rows.
+        self.manifest = {}
         self.init_ui()
         self.build_tree()
 
@@ -72,7 +111,7 @@ class LibraryImportDialog(QDialog):
 
         apply_layout = QHBoxLayout()
         self.apply_type = QComboBox()
-        self.apply_type.addItems(["Movie", "TV"])
+        self.apply_type.addItems(MEDIA_TYPES)
         self.apply_series = QCheckBox("Series")
         self.apply_series_title = QLineEdit()
         self.apply_series_title.setPlaceholderText("Series Title")
@@ -84,500 +123,213 @@ class LibraryImportDialog(QDialog):
         apply_layout.addWidget(self.apply_button)
         layout.addLayout(apply_layout)
 
-        self.tree = QTreeWidget()
-        self.tree.setColumnCount(7)
-        self.tree.setHeaderLabels(
-            ["Type", "File", "Title", "Series", "Series Title", "# in Series", "Exclude"]
-        )
+        # Cells are painted from the model; an editor widget exists only for
+        # the cell being edited, so large imports cost no widgets per row.
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setItemDelegate(ImportItemDelegate(self.tree))
+        self.tree.setUniformRowHeights(True)
+        self.tree.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
         header = self.tree.header()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         layout.addWidget(self.tree)
 
+        scan_layout = QHBoxLayout()
+        self.scan_status = QLabel("")
+        self.stop_scan_button = QPushButton("Stop Scan")
+        self.stop_scan_button.clicked.connect(self._stop_scan)
+        scan_layout.addWidget(self.scan_status, 1)
+        scan_layout.addWidget(self.stop_scan_button)
+        layout.addLayout(scan_layout)
+
         button_layout = QHBoxLayout()
-        ok_button = QPushButton("OK")
-        ok_button.clicked.connect(self.accept)
+        self.save_plan_button = QPushButton("Save Plan...")
+        self.save_plan_button.setToolTip("Save the rows as an import plan, to review or apply later")
+        self.save_plan_button.clicked.connect(self.save_plan)
+        self.ok_button = QPushButton("OK")
+        self.ok_button.clicked.connect(self.accept)
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
-        button_layout.addWidget(ok_button)
+        button_layout.addWidget(self.save_plan_button)
+        button_layout.addWidget(self.ok_button)
         button_layout.addWidget(cancel_button)
         layout.addLayout(button_layout)
         self.resize(1100, 720)
 
     def build_tree(self):
-        self.tree.clear()
-        self.row_widgets.clear()
-        self.file_items.clear()
-
-        folder_roots = [p for p in self.selected_paths if os.path.isdir(p)]
-        file_roots = [p for p in self.selected_paths if os.path.isfile(p)]
-
-        root_items = {}
-        path_to_item = {}
-        show_has_seasons = {}
-
-        for root in folder_roots:
-            root_item = QTreeWidgetItem(["", os.path.basename(root) or root])
-            root_item.setData(0, Qt.ItemDataRole.UserRole, {"path": root, "is_folder": True})
-            self.tree.addTopLevelItem(root_item)
-            root_name = os.path.basename(root) or root
-            season_for_root = _season_number_from_name(root_name)
-            default_series_title = _clean_series_title(root_name)
-            default_index = str(season_for_root) if season_for_root is not None else ""
-            if season_for_root is not None:
-                parent_name = os.path.basename(os.path.dirname(root))
-                default_series_title = _clean_series_title(parent_name) or default_series_title
-            self._init_row_widgets(
-                root_item,
-                root,
-                is_folder=True,
-                default_index=default_index,
-                default_series_title=default_series_title or root_name,
-            )
-            root_items[root] = root_item
-            path_to_item[root] = root_item
-
-            for dirpath, dirnames, _filenames in os.walk(root):
-                for dirname in dirnames:
-                    season_num = _season_number_from_name(dirname)
-                    if season_num is None:
-                        continue
-                    show_root = os.path.dirname(os.path.join(dirpath, dirname))
-                    show_has_seasons[show_root] = True
-
-            for dirpath, dirnames, filenames in os.walk(root):
-                dirnames.sort(key=_import_dir_sort_key)
-                rel = os.path.relpath(dirpath, root)
-                if rel != ".":
-                    parent_path = os.path.dirname(dirpath)
-                    parent_item = path_to_item.get(parent_path, root_item)
-                    if dirpath not in path_to_item:
-                        folder_item = QTreeWidgetItem(["", os.path.basename(dirpath)])
-                        folder_item.setData(
-                            0, Qt.ItemDataRole.UserRole, {"path": dirpath, "is_folder": True}
-                        )
-                        parent_item.addChild(folder_item)
-                        season_num = _season_number_from_name(os.path.basename(dirpath))
-                        default_index = str(season_num) if season_num else ""
-                        self._init_row_widgets(
-                            folder_item, dirpath, is_folder=True, default_index=default_index
-                        )
-                        path_to_item[dirpath] = folder_item
-
-                episode_counter = 1
-                filenames = sorted(
-                    filenames,
-                    key=lambda x: _import_file_sort_key(os.path.join(dirpath, x)),
-                )
-                for filename in filenames:
-                    file_path = os.path.join(dirpath, filename)
-                    if os.path.basename(dirpath).lower() == "bdmv":
-                        if os.path.basename(file_path).lower() != "movieobject.bdmv":
-                            continue
-                    if not _is_video_file(file_path):
-                        continue
-                    parent_item = path_to_item.get(dirpath, root_item)
-                    file_item = QTreeWidgetItem(["", filename])
-                    file_item.setData(
-                        0, Qt.ItemDataRole.UserRole, {"path": file_path, "is_folder": False}
-                    )
-                    parent_item.addChild(file_item)
-                    season_num = _season_number_from_name(os.path.basename(dirpath))
-                    if season_num is None and show_has_seasons.get(dirpath) is None:
-                        season_num = 1 if "tv shows" in dirpath.lower() else None
-                    parsed_episode = _extract_tv_episode_parts(file_path)
-                    default_index = ""
-                    if parsed_episode:
-                        default_index = parsed_episode["series_index"]
-                        if season_num and parsed_episode["season"] == season_num:
-                            episode_counter = max(episode_counter, parsed_episode["end_episode"] + 1)
-                    elif season_num:
-                        default_index = f"{season_num}.{episode_counter}"
-                        episode_counter += 1
-                    self._init_row_widgets(
-                        file_item, file_path, is_folder=False, default_index=default_index
-                    )
-                    self.file_items.append(file_item)
-
-        for file_path in sorted(file_roots, key=_import_file_sort_key):
-            if not _is_video_file(file_path):
-                continue
-            file_item = QTreeWidgetItem(["", os.path.basename(file_path)])
-            file_item.setData(
-                0, Qt.ItemDataRole.UserRole, {"path": file_path, "is_folder": False}
-            )
-            self.tree.addTopLevelItem(file_item)
-            parsed_episode = _extract_tv_episode_parts(file_path)
-            default_index = parsed_episode["series_index"] if parsed_episode else ""
-            self._init_row_widgets(
-                file_item,
-                file_path,
-                is_folder=False,
-                default_index=default_index,
-            )
-            self.file_items.append(file_item)
-
-        for i in range(self.tree.topLevelItemCount()):
-            self._sort_import_children_recursive(self.tree.topLevelItem(i))
-        self._rebind_import_row_widgets()
+        """Start scanning the selection; rows appear in batches as they are found."""
+        self._stop_scan_worker()
+        self.model.clear()
+        self._scan_stopped = False
+        self.manifest = {}
+        self.ok_button.setEnabled(False)
+        self.save_plan_button.setEnabled(False)
+        self.stop_scan_button.show()
+        self.stop_scan_button.setEnabled(True)
+        self.scan_status.setText("Scanning...")
+        self._scan_worker = _ImportScanWorker(self.selected_paths, parent=self)
+        self._scan_worker.rows_found.connect(self._add_import_rows)
+        self._scan_worker.finished.connect(self._on_scan_finished)
+        self._scan_worker.start()
+
+    def _add_import_rows(self, rows):
+        for node in self.model.add_rows(rows):
+            if node.is_folder:
+                self.tree.expand(self.model.index_of(node))
+        self.scan_status.setText(f"Scanning... {len(self.model.file_nodes)} files found")
+
+    def _stop_scan(self):
+        if self._scan_worker is not None:
+            self._scan_stopped = True
+            self.stop_scan_button.setEnabled(False)
+            self._scan_worker.requestInterruption()
+
+    def _on_scan_finished(self):
+        self.manifest = self._scan_worker.manifest
+        self._scan_worker = None
+        index_keys = {}
+        self.model.sort_tree(lambda node: self._import_tree_sort_key(node, index_keys))
         self._normalize_import_series_titles()
 
-        self.tree.expandAll()
         self._auto_resize_import_columns()
-
-    def _sort_import_children_recursive(self, parent):
-        for i in range(parent.childCount()):
-            self._sort_import_children_recursive(parent.child(i))
-        if parent.childCount() <= 1:
+        found = f"{len(self.model.file_nodes)} files found"
+        self.scan_status.setText(f"Scan stopped, {found}" if self._scan_stopped else found)
+        self.stop_scan_button.hide()
+        self.ok_button.setEnabled(True)
+        self.save_plan_button.setEnabled(True)
+
+    def _stop_scan_worker(self):
+        # Drop a running scan without touching the tree, e.g. when the dialog
+        # closes mid-scan; the thread must finish before it is destroyed.
+        worker = self._scan_worker
+        if worker is None:
             return
-        children = []
-        while parent.childCount() > 0:
-            children.append(parent.takeChild(0))
-        children.sort(key=self._import_tree_sort_key)
-        for child in children:
-            parent.addChild(child)
-
-    def _import_tree_sort_key(self, item):
-        index_key = self._effective_import_item_index_key(item)
+        self._scan_worker = None
+        worker.rows_found.disconnect(self._add_import_rows)
+        worker.finished.disconnect(self._on_scan_finished)
+        worker.requestInterruption()
+        worker.wait()
+
+    def done(self, result):
+        self._stop_scan_worker()
+        super().done(result)
+
+    def _import_tree_sort_key(self, node, index_keys):
+        index_key = self._effective_import_item_index_key(node, index_keys)
         if index_key is not None:
-            return (0, index_key[0], index_key[1], item.text(1).lower())
-        season_num = _season_number_from_name(item.text(1) or "")
+            return (0, index_key[0], index_key[1], node.name.lower())
+        season_num = _season_number_from_name(node.name)
         if season_num is not None:
-            return (1, season_num, 0, item.text(1).lower())
-        return (2, 9999, 9999, item.text(1).lower())
-
-    def _effective_import_item_index_key(self, item):
-        widgets = self._widgets(item)
-        if widgets:
-            parsed = _parse_series_index_values(widgets["series_index"].text().strip())
-            if parsed:
-                return parsed[0]
-
-        best = None
-        for i in range(item.childCount()):
-            child = item.child(i)
-            child_key = self._effective_import_item_index_key(child)
-            if child_key is None:
-                continue
-            if best is None or child_key < best:
-                best = child_key
+            return (1, season_num, 0, node.name.lower())
+        return (2, 9999, 9999, node.name.lower())
+
+    def _effective_import_item_index_key(self, node, index_keys):
+        # ``index_keys`` memoizes the key per node for one sort, which asks
+        # for every subtree's key once per level above it.
+        if node in index_keys:
+            return index_keys[node]
+        parsed = _parse_series_index_values(node.series_index.strip())
+        if parsed:
+            best = parsed[0]
+        else:
+            best = None
+            for child in node.children:
+                child_key = self._effective_import_item_index_key(child, index_keys)
+                if child_key is None:
+                    continue
+                if best is None or child_key < best:
+                    best = child_key
+        index_keys[node] = best
         return best
 
-    def _rebind_import_row_widgets(self):
-        for widgets in self.row_widgets.values():
-            item = widgets["item"]
-            self.tree.setItemWidget(item, 0, widgets["type"])
-            self.tree.setItemWidget(item, 3, widgets["series_check"])
-            self.tree.setItemWidget(item, 4, widgets["series_title"])
-            self.tree.setItemWidget(item, 5, widgets["series_index"])
-            self.tree.setItemWidget(item, 6, widgets["exclude"])
-            if widgets["display_title"] is not None:
-                self.tree.setItemWidget(item, 2, widgets["display_title"])
-
     def _normalize_import_series_titles(self):
-        generic = {"tv", "tv show", "tv shows"}
-
-        def descendant_series_titles(item):
-            titles = []
-            for i in range(item.childCount()):
-                child = item.child(i)
-                child_widgets = self._widgets(child)
-                if child_widgets:
-                    title = child_widgets["series_title"].text().strip()
-                    if title and title.lower() not in generic:
-                        titles.append(title)
-                titles.extend(descendant_series_titles(child))
-            return titles
-
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            widgets = self._widgets(item)
-            if not widgets or not widgets["is_folder"]:
-                it += 1
-                continue
-            current = widgets["series_title"].text().strip()
-            if current and current.lower() not in generic:
-                it += 1
-                continue
-            titles = descendant_series_titles(item)
-            if titles:
-                counts = {}
-                first_seen = {}
-                for idx, title in enumerate(titles):
-                    key = title.casefold()
-                    counts[key] = counts.get(key, 0) + 1
-                    if key not in first_seen:
-                        first_seen[key] = (idx, title)
-                best_key = min(
-                    counts.keys(),
-                    key=lambda k: (-counts[k], first_seen[k][0]),
-                )
-                widgets["series_title"].setText(first_seen[best_key][1])
-            it += 1
+        # Folders titled "TV Shows" or left blank take the title most
+        # common below them; their children keep their own titles.
+        titles = _dominant_series_titles(self.model.top_level_nodes())
+        self.model.set_values("series_title", titles)
 
     def _auto_resize_import_columns(self):
-        header = self.tree.header()
         metrics = self.tree.fontMetrics()
 
         def header_width(col):
-            return metrics.horizontalAdvance(self.tree.headerItem().text(col) or "") + 20
-
-        file_width = header_width(1)
-        title_width = header_width(2)
-        series_title_width = header_width(4)
-        series_index_width = header_width(5)
-
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            file_width = max(file_width, metrics.horizontalAdvance(item.text(1) or "") + 24)
-
-            title_widget = self.tree.itemWidget(item, 2)
-            if isinstance(title_widget, QLineEdit):
-                title_width = max(title_width, metrics.horizontalAdvance(title_widget.text()) + 24)
-
-            series_title_widget = self.tree.itemWidget(item, 4)
-            if isinstance(series_title_widget, QLineEdit):
-                series_title_width = max(
-                    series_title_width, metrics.horizontalAdvance(series_title_widget.text()) + 24
-                )
-
-            series_index_widget = self.tree.itemWidget(item, 5)
-            if isinstance(series_index_widget, QLineEdit):
-                series_index_width = max(
-                    series_index_width, metrics.horizontalAdvance(series_index_widget.text()) + 24
-                )
-            it += 1
+            return metrics.horizontalAdvance(IMPORT_COLUMNS[col]) + 20
+
+        def text_width(texts, width):
+            # Widest text plus padding, at least ``width``. Longest texts are
+            # measured first; none can be wider than its length in the
+            # font's widest character, which ends the search early.
+            widest_char = metrics.maxWidth()
+            for text in sorted(set(texts), key=len, reverse=True):
+                if len(text) * widest_char + 24 <= width:
+                    break
+                width = max(width, metrics.horizontalAdvance(text) + 24)
+            return width
+
+        nodes = list(self.model.nodes())
+        file_width = text_width((node.name for node in nodes), header_width(1))
+        title_width = text_width((node.display_title for node in nodes if node.display_title), header_width(2))
+        series_title_width = text_width((node.series_title for node in nodes), header_width(4))
+        series_index_width = text_width((node.series_index for node in nodes), header_width(5))
+        max_depth = 0
+        depths = {}
+        for node in nodes:
+            if node.children:
+                depths[node] = depths[node.parent] + 1 if node.parent in depths else 0
+                max_depth = max(max_depth, depths[node] + 1)
 
         self.tree.setColumnWidth(1, min(max(file_width, 190), 320))
         self.tree.setColumnWidth(2, max(title_width, 260))
         self.tree.setColumnWidth(4, max(series_title_width, header_width(4)))
         self.tree.setColumnWidth(5, max(series_index_width, header_width(5)))
-        self.tree.resizeColumnToContents(3)
-        self.tree.resizeColumnToContents(6)
-
-        max_width = 0
-        indentation = self.tree.indentation()
-
-        def depth(item):
-            level = 0
-            current = item.parent()
-            while current is not None:
-                level += 1
-                current = current.parent()
-            return level
-
-        it = QTreeWidgetItemIterator(self.tree)
-        while it.value():
-            item = it.value()
-            widget = self.tree.itemWidget(item, 0)
-            if widget is not None:
-                width = widget.sizeHint().width()
-            else:
-                text = item.text(0)
-                width = metrics.horizontalAdvance(text) if text else 0
-            width += depth(item) * indentation
-            width += 24
-            max_width = max(max_width, width)
-            it += 1
-
-        if max_width:
-            self.tree.setColumnWidth(0, max_width)
-
-    def _init_row_widgets(
-        self,
-        item,
-        path,
-        is_folder,
-        default_index="",
-        default_series_title=None,
-    ):
-        default_type = _detect_default_type(path)
-        show_title, series_title = _default_show_and_series(path)
-        parsed_episode = _extract_tv_episode_parts(path) if not is_folder else None
-
-        exclude_check = QCheckBox()
-
-        type_combo = QComboBox()
-        type_combo.addItems(["Movie", "TV"])
-        type_combo.setCurrentText(default_type)
-
-        series_check = QCheckBox()
-        series_check.setChecked(default_type == "TV")
-
-        series_title_field = QLineEdit()
-        if default_type == "TV":
-            auto_series_title = default_series_title or show_title
-            if parsed_episode and parsed_episode.get("series_title"):
-                auto_series_title = parsed_episode["series_title"]
-            series_title_field.setText(auto_series_title)
-
-        series_index_field = QLineEdit()
-        if default_index:
-            series_index_field.setText(default_index)
-
-        display_title_field = None
-        if not is_folder:
-            display_title_field = QLineEdit()
-            if default_type == "TV":
-                display_title_field.setText(_default_episode_title(path, default_index))
-            else:
-                display_title_field.setText(_default_display_title(path))
-
-        self.tree.setItemWidget(item, 0, type_combo)
-        self.tree.setItemWidget(item, 3, series_check)
-        self.tree.setItemWidget(item, 4, series_title_field)
-        self.tree.setItemWidget(item, 5, series_index_field)
-        self.tree.setItemWidget(item, 6, exclude_check)
-        if display_title_field is not None:
-            self.tree.setItemWidget(item, 2, display_title_field)
-
-        self._set_widgets(item, {
-            "exclude": exclude_check,
-            "type": type_combo,
-            "series_check": series_check,
-            "series_title": series_title_field,
-            "series_index": series_index_field,
-            "display_title": display_title_field,
-            "is_folder": is_folder,
-        })
-
-        def on_type_change(text):
-            if text == "TV" and not series_check.isChecked():
-                series_check.setChecked(True)
-            self._update_row_enabled(item)
-            if is_folder:
-                self._propagate(item, "type", text)
-
-        def on_series_toggle(checked):
-            self._update_row_enabled(item)
-            if is_folder:
-                self._propagate(item, "series_check", checked)
+        # The check box columns are narrower than their titles; sizing them
+        # from the header avoids laying out every row to measure them.
+        header = self.tree.header()
+        self.tree.setColumnWidth(3, header.sectionSizeHint(3))
+        self.tree.setColumnWidth(6, header.sectionSizeHint(6))
 
-        def on_exclude_toggle(checked):
-            if is_folder:
-                self._propagate(item, "exclude", checked)
+        if nodes:
+            # Wide enough for the Type combo box at the deepest level.
+            type_combo = QComboBox()
+            type_combo.addItems(MEDIA_TYPES)
+            width = type_combo.sizeHint().width() + max_depth * self.tree.indentation() + 24
+            self.tree.setColumnWidth(0, width)
 
-        type_combo.currentTextChanged.connect(on_type_change)
-        series_check.toggled.connect(on_series_toggle)
-        exclude_check.toggled.connect(on_exclude_toggle)
-        series_title_field.textChanged.connect(
-            lambda text: self._propagate(item, "series_title", text) if is_folder else None
-        )
-        series_index_field.textChanged.connect(
-            lambda text: self._propagate(item, "series_index", text) if is_folder else None
+    def apply_to_all(self):
+        self.model.apply_to_all(
+            self.apply_type.currentText(),
+            self.apply_series.isChecked(),
+            self.apply_series_title.text().strip(),
         )
 
-        self._update_row_enabled(item)
-
-    def _update_row_enabled(self, item):
-        widgets = self._widgets(item)
-        widgets["series_check"].setEnabled(True)
-        series_enabled = widgets["series_check"].isChecked()
-        widgets["series_title"].setEnabled(series_enabled)
-        widgets["series_index"].setEnabled(series_enabled)
-        widgets["series_title"].setVisible(series_enabled)
-        widgets["series_index"].setVisible(series_enabled)
-
-    def _propagate(self, item, field, value):
-        if field == "series_index":
-            self._propagate_series_index(item, value)
+    def save_plan(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Import Plan", "import-plan.jsonl", IMPORT_PLAN_FILTER)
+        if not path:
             return
-        for i in range(item.childCount()):
-            child = item.child(i)
-            widgets = self._widgets(child)
-            if not widgets:
-                continue
-            widget = widgets.get(field)
-            if field == "type":
-                widget.blockSignals(True)
-                widget.setCurrentText(value)
-                widget.blockSignals(False)
-                self._update_row_enabled(child)
-            elif field == "series_check":
-                widget.blockSignals(True)
-                widget.setChecked(value)
-                widget.blockSignals(False)
-                self._update_row_enabled(child)
-            elif field == "exclude":
-                widget.blockSignals(True)
-                widget.setChecked(value)
-                widget.blockSignals(False)
-            else:
-                widget.blockSignals(True)
-                widget.setText(value)
-                widget.blockSignals(False)
-            if widgets["is_folder"]:
-                self._propagate(child, field, value)
-
-    def _propagate_series_index(self, item, value):
-        prefix = _series_index_prefix(value)
-        episode_counter = 1
-
-        def update_child(child_item):
-            nonlocal episode_counter
-            widgets = self._widgets(child_item)
-            if not widgets:
-                return
-            target_value = value
-            if not widgets["is_folder"] and prefix:
-                target_value = f"{prefix}.{episode_counter}"
-                episode_counter += 1
-            widgets["series_index"].blockSignals(True)
-            widgets["series_index"].setText(target_value)
-            widgets["series_index"].blockSignals(False)
-            if widgets["is_folder"]:
-                for i in range(child_item.childCount()):
-                    update_child(child_item.child(i))
-
-        for i in range(item.childCount()):
-            update_child(item.child(i))
-
-    def apply_to_all(self):
-        type_value = self.apply_type.currentText()
-        series_checked = self.apply_series.isChecked()
-        series_title = self.apply_series_title.text().strip()
-
-        for widgets in self.row_widgets.values():
-            widgets["type"].setCurrentText(type_value)
-            widgets["series_check"].setChecked(series_checked)
-            if series_title:
-                widgets["series_title"].setText(series_title)
-            self._update_row_enabled(widgets["item"])
+        try:
+            with open(path, "w", encoding="utf-8") as stream:
+                count = write_plan(stream, self.get_results(), self.manifest)
+        except OSError as exc:
+            QMessageBox.warning(self, "Save Plan", f"Could not write {path}:\n{exc}")
+            return
+        self.scan_status.setText(f"{count} files saved to {os.path.basename(path)}")
 
     def get_results(self):
         results = []
-        for item in self.file_items:
-            data = item.data(0, Qt.ItemDataRole.UserRole)
-            path = data["path"]
-            widgets = self._widgets(item)
-            if widgets["exclude"].isChecked():
+        for node in self.model.file_nodes:
+            if node.exclude:
                 continue
-            media_type = widgets["type"].currentText()
-            is_series = widgets["series_check"].isChecked()
-            series_title = widgets["series_title"].text().strip() or None
-            series_index = widgets["series_index"].text().strip() or None
-            display_title = widgets["display_title"].text().strip() or _default_display_title(path)
             results.append(
                 {
-                    "path": path,
-                    "media_type": media_type,
-                    "is_series": is_series,
-                    "series_title": series_title,
-                    "show_title": series_index,
-                    "display_title": display_title,
+                    "path": node.path,
+                    "media_type": node.media_type,
+                    "is_series": node.is_series,
+                    "series_title": node.series_title.strip() or None,
+                    "show_title": node.series_index.strip() or None,
+                    "display_title": node.display_title.strip() or _default_display_title(node.path),
                 }
             )
         return results
 
-    def _set_widgets(self, item, widgets):
-        key = id(item)
-        widgets["item"] = item
-        self.row_widgets[key] = widgets
-
-    def _widgets(self, item):
-        return self.row_widgets.get(id(item))
-
 
 class LibraryEditDialog(QDialog):
     def __init__(self, items, parent=None, include_air_datetime=False):
@@ -948,6 +700,8 @@ class LibraryMenu(QWidget):
         self.list_db = ListDB()
         self._mpv_processes = {}
         self._has_loaded_once = False
+        self._items_by_id = {}
+        self._revision = None
         self.show_only_watching = show_only_watching
         self.title_text = title_text
         self.init_ui()
@@ -961,6 +715,9 @@ class LibraryMenu(QWidget):
         title.setStyleSheet("font-size: 24px; font-weight: bold;")
         layout.addWidget(title)
 
+        self.search_edit = _debounced_search_edit(self, self._apply_search)
+        layout.addWidget(self.search_edit)
+
         self.tree = QTreeWidget()
         self.tree.setColumnCount(6)
         watched_header = "✓" if self.show_only_watching else "Watched"
@@ -985,6 +742,10 @@ class LibraryMenu(QWidget):
         self.add_button.clicked.connect(self.add_to_library)
         buttons.addWidget(self.add_button)
 
+        self.rescan_button = QPushButton("Rescan")
+        self.rescan_button.clicked.connect(self.rescan_library)
+        buttons.addWidget(self.rescan_button)
+
         self.play_button = QPushButton("Play")
         self.play_button.clicked.connect(self.play_selected)
         buttons.addWidget(self.play_button)
@@ -1024,13 +785,55 @@ class LibraryMenu(QWidget):
         layout.addLayout(buttons_row_two)
 
     def load_items(self):
+        # Read the revision first: anything committed while the items are
+        # read is picked up again by the next refresh.
+        self._revision = self.db.current_revision()
+        if self.show_only_watching:
+            items = self.db.get_watching_items()
+        else:
+            items = self.db.get_items()
+        self._items_by_id = {item.id: item for item in items}
+        self._populate_tree(items)
+
+    def refresh_items(self):
+        """Bring the tree up to date with the rows changed since the last read.
+
+        Costs a single revision read when nothing changed. Any change to the
+        library can move a whole series in or out of the Watching view, so
+        that view reloads instead of merging the delta.
+        """
+        if self._revision is None:
+            self.load_items()
+            return
+        changes = self.db.get_items_since(self._revision)
+        if changes.revision < self._revision:
+            self.load_items()
+            return
+        if not changes.items and not changes.deleted_ids:
+            self._revision = changes.revision
+            return
+        if self.show_only_watching:
+            self.load_items()
+            return
+        self._revision = changes.revision
+        for item_id in changes.deleted_ids:
+            self._items_by_id.pop(item_id, None)
+        for item in changes.items:
+            self._items_by_id[item.id] = item
+        self._populate_tree(list(self._items_by_id.values()))
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Pick up edits made from another window or process when this one
+        # comes back to the front.
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow() and self.db.conn is not None:
+            self.refresh_items()
+
+    def _populate_tree(self, items):
         view_state = self._capture_view_state()
-        items = self.db.get_items()
         self._apply_auto_airing(items)
-        if self.show_only_watching:
-            items = self._filter_watching_items(items)
         self.tree.clear()
-        self.items_by_path = {item[1]: item for item in items}
+        self.items_by_path = {item.path: item for item in items}
 
         movies_root = QTreeWidgetItem(["Movies", "", "", "", "", ""])
         tv_root = QTreeWidgetItem(["TV Shows", "", "", "", "", ""])
@@ -1039,12 +842,12 @@ class LibraryMenu(QWidget):
         self.tree.addTopLevelItem(movies_root)
         self.tree.addTopLevelItem(tv_root)
 
-        movies = [item for item in items if item[2] == "Movie"]
+        movies = [item for item in items if item.media_type == "Movie"]
         movie_series = defaultdict(list)
         standalone_movies = []
         for item in movies:
-            is_series = item[4] == 1
-            series_title = item[5] or ""
+            is_series = item.is_series == 1
+            series_title = item.series_title or ""
             if is_series and series_title:
                 movie_series[series_title].append(item)
             else:
@@ -1052,7 +855,7 @@ class LibraryMenu(QWidget):
 
         movie_entries = []
         for item in standalone_movies:
-            movie_entries.append(("item", item[3], item))
+            movie_entries.append(("item", item.display_title, item))
         for series_title in movie_series.keys():
             movie_entries.append(("series", series_title, movie_series[series_title]))
 
@@ -1067,16 +870,16 @@ class LibraryMenu(QWidget):
                 movies_root.addChild(series_node)
                 entries = sorted(
                     payload,
-                    key=lambda x: _series_index_sort_key(x[6] or ""),
+                    key=lambda x: _series_index_sort_key(x.show_title or ""),
                 )
                 for item in entries:
                     self._add_movie_item(series_node, item)
 
-        tv_items = [item for item in items if item[2] == "TV"]
+        tv_items = [item for item in items if item.media_type == "TV"]
         by_show = defaultdict(list)
         show_notes = _build_show_air_notes(tv_items)
         for item in tv_items:
-            show_title = item[5] or "Unknown Show"
+            show_title = item.series_title or "Unknown Show"
             by_show[show_title].append(item)
 
         for show_title in sorted(by_show.keys(), key=self._title_sort_key):
@@ -1086,7 +889,7 @@ class LibraryMenu(QWidget):
             tv_root.addChild(show_item)
             by_season = defaultdict(list)
             for item in by_show[show_title]:
-                series_index = item[6] or ""
+                series_index = item.show_title or ""
                 parsed_values = _parse_series_index_values(series_index)
                 season_part = str(parsed_values[0][0]) if parsed_values else "1"
                 by_season[season_part].append(item)
@@ -1095,7 +898,7 @@ class LibraryMenu(QWidget):
             if len(season_keys) == 1:
                 episodes = sorted(
                     by_season[season_keys[0]],
-                    key=lambda x: _series_index_sort_key(x[6] or ""),
+                    key=lambda x: _series_index_sort_key(x.show_title or ""),
                 )
                 for item in episodes:
                     self._add_tv_item(show_item, item)
@@ -1106,7 +909,7 @@ class LibraryMenu(QWidget):
                     show_item.addChild(season_item)
                     episodes = sorted(
                         by_season[season_key],
-                        key=lambda x: _series_index_sort_key(x[6] or ""),
+                        key=lambda x: _series_index_sort_key(x.show_title or ""),
                     )
                     for item in episodes:
                         self._add_tv_item(season_item, item)
@@ -1127,28 +930,33 @@ class LibraryMenu(QWidget):
                 idx = self.tree.indexOfTopLevelItem(tv_root)
                 if idx != -1:
                     self.tree.takeTopLevelItem(idx)
+        if self.search_edit.text().strip():
+            self._apply_search()
         self._resize_columns(view_state)
 
+    def _apply_search(self):
+        text = self.search_edit.text().strip()
+        is_match = None
+        if text:
+            matching_ids = set(self.db.search_ids(text))
+
+            def is_match(node):
+                data = node.data(0, Qt.ItemDataRole.UserRole)
+                record = self.items_by_path.get(data["path"]) if data else None
+                return record is not None and record.id in matching_ids
+
+        roots = [self.tree.topLevelItem(index) for index in range(self.tree.topLevelItemCount())]
+        _filter_tree_items(roots, is_match)
+        self._auto_resize_columns()
+
     def _add_movie_item(self, parent, item):
-        (
-            _id,
-            path,
-            media_type,
-            display_title,
-            is_series,
-            series_title,
-            show_title,
-            _added,
-            watched,
-            is_placeholder,
-            air_datetime,
-            _currently_airing,
-        ) = item
-        title = self._format_title(display_title)
-        notes = self._format_notes(air_datetime, is_placeholder)
-        watched_mark = self._format_watched(watched)
+        path = item.path
+        is_placeholder = item.is_placeholder
+        title = self._format_title(item.display_title)
+        notes = self._format_notes(item.air_datetime, is_placeholder)
+        watched_mark = self._format_watched(item.watched)
         path_text = "" if is_placeholder else path
-        node = QTreeWidgetItem([title, "", watched_mark, show_title or "", notes, path_text])
+        node = QTreeWidgetItem([title, "", watched_mark, item.show_title or "", notes, path_text])
         self._set_title_bold(node)
         node.setData(0, Qt.ItemDataRole.UserRole, {"path": path, "is_placeholder": bool(is_placeholder)})
         self._apply_row_height(node)
@@ -1159,25 +967,13 @@ class LibraryMenu(QWidget):
             self._set_play_widget(node, path)
 
     def _add_tv_item(self, parent, item):
-        (
-            _id,
-            path,
-            media_type,
-            display_title,
-            is_series,
-            series_title,
-            show_title,
-            _added,
-            watched,
-            is_placeholder,
-            air_datetime,
-            _currently_airing,
-        ) = item
-        title = self._format_title(display_title)
-        notes = self._format_notes(air_datetime, is_placeholder)
-        watched_mark = self._format_watched(watched)
+        path = item.path
+        is_placeholder = item.is_placeholder
+        title = self._format_title(item.display_title)
+        notes = self._format_notes(item.air_datetime, is_placeholder)
+        watched_mark = self._format_watched(item.watched)
         path_text = "" if is_placeholder else path
-        node = QTreeWidgetItem([title, "", watched_mark, show_title or "", notes, path_text])
+        node = QTreeWidgetItem([title, "", watched_mark, item.show_title or "", notes, path_text])
         node.setData(0, Qt.ItemDataRole.UserRole, {"path": path, "is_placeholder": bool(is_placeholder)})
         self._apply_row_height(node)
         parent.addChild(node)
@@ -1287,7 +1083,7 @@ class LibraryMenu(QWidget):
             sorted_paths = [
                 path
                 for path in sorted_paths
-                if self.items_by_path.get(path, (None,) * 12)[8] == 0
+                if self._is_unwatched(path)
             ]
 
         self._play_paths(sorted_paths)
@@ -1299,7 +1095,7 @@ class LibraryMenu(QWidget):
             if len(paths) == 1:
                 os.startfile(paths[0])
                 self.db.update_watched(paths, True)
-                self.load_items()
+                self.refresh_items()
             else:
                 self._play_paths_in_mpv(paths)
         except OSError:
@@ -1355,7 +1151,7 @@ class LibraryMenu(QWidget):
         self._cleanup_mpv_log(info["log_path"])
         if played_paths:
             self.db.update_watched(played_paths, True)
-            self.load_items()
+            self.refresh_items()
 
     def _read_played_paths(self, log_path, allowed_paths):
         if not os.path.exists(log_path):
@@ -1407,14 +1203,18 @@ class LibraryMenu(QWidget):
             item = self.items_by_path.get(path)
             if not item:
                 return (_series_index_sort_key(""), path.lower())
-            series_index = item[6] or ""
-            title = item[3] or ""
+            series_index = item.show_title or ""
+            title = item.display_title or ""
             if series_index:
                 return (_series_index_sort_key(series_index), title.lower())
             return ((0, 0), title.lower())
 
         return sorted(paths, key=sort_key)
 
+    def _is_unwatched(self, path):
+        item = self.items_by_path.get(path)
+        return item is not None and item.watched == 0
+
     def set_selected_watched(self, watched):
         selected = self.tree.selectedItems()
         if not selected:
@@ -1428,7 +1228,7 @@ class LibraryMenu(QWidget):
             QMessageBox.warning(self, "Selection Error", "No media items found to update.")
             return
         self.db.update_watched(paths, watched)
-        self.load_items()
+        self.refresh_items()
 
     def _select_folders(self):
         dialog = QFileDialog(self, "Select Media Folder(s)")
@@ -1455,12 +1255,13 @@ class LibraryMenu(QWidget):
         return []
 
     def add_to_library(self):
-        existing_paths = {item[1] for item in self.db.get_items()}
         chooser = QMessageBox(self)
         chooser.setWindowTitle("Add to Library")
         chooser.setText("Add a file or a folder?")
         file_button = chooser.addButton("File(s)", QMessageBox.ButtonRole.AcceptRole)
         folder_button = chooser.addButton("Folder(s)", QMessageBox.ButtonRole.AcceptRole)
+        plan_button = chooser.addButton("Plan File", QMessageBox.ButtonRole.AcceptRole)
+        plan_button.setToolTip("Add the files of a saved import plan without scanning")
         chooser.addButton(QMessageBox.StandardButton.Cancel)
         chooser.exec()
 
@@ -1468,6 +1269,9 @@ class LibraryMenu(QWidget):
             selected = self._select_files()
         elif chooser.clickedButton() == folder_button:
             selected = self._select_folders()
+        elif chooser.clickedButton() == plan_button:
+            self.apply_import_plan()
+            return
         else:
             return
 
@@ -1487,19 +1291,92 @@ class LibraryMenu(QWidget):
             )
             return
 
-        for item in results:
-            self.db.add_item(
-                item["path"],
-                item["media_type"],
-                item["display_title"],
-                is_series=item["is_series"],
-                series_title=item["series_title"],
-                show_title=item["show_title"],
+        self._add_import_results(results, dialog.manifest)
+
+    def apply_import_plan(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Apply Import Plan", "", IMPORT_PLAN_FILTER)
+        if not path:
+            return
+        manifest = {}
+        try:
+            with open(path, encoding="utf-8") as stream:
+                results = list(iter_plan_items(stream, manifest, os.path.basename(path)))
+        except (OSError, ValueError) as exc:
+            QMessageBox.warning(self, "Import Plan", f"Could not read the import plan:\n{exc}")
+            return
+        if not results:
+            QMessageBox.information(self, "No Media Found", "The import plan lists no files.")
+            return
+        self._add_import_results(results, manifest)
+
+    def _add_import_results(self, results, manifest):
+        outcome = self.db.add_items(results)
+        for root, entries in manifest.items():
+            self.db.save_manifest(root, entries)
+
+        self.refresh_items()
+        self._confirm_list_links_for_library_paths(outcome["inserted"])
+
+    def rescan_library(self):
+        roots = self.db.get_roots()
+        if not roots:
+            QMessageBox.information(
+                self,
+                "Rescan",
+                "No library folders to rescan yet. Folders added with Add to Library are rescanned here.",
             )
+            return
 
-        self.load_items()
-        new_paths = [item["path"] for item in results if item["path"] not in existing_paths]
-        self._confirm_list_links_for_library_paths(new_paths)
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            results = [rescan_root(root, self.db.get_manifest(root), self.db.get_directory_files) for root in roots]
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        unavailable = [result.root for result in results if not result.available]
+        results = [result for result in results if result.available]
+        new, missing, moved = rescan_changes(results)
+
+        notes = []
+        if unavailable:
+            notes.append("Could not read:\n" + "\n".join(unavailable))
+        if not (new or missing or moved):
+            apply_rescan(self.db, results, None)
+            notes.insert(0, "The library is up to date.")
+            QMessageBox.information(self, "Rescan", "\n\n".join(notes))
+            return
+
+        summary = QMessageBox(self)
+        summary.setWindowTitle("Rescan")
+        summary.setText(
+            f"{len(new)} new, {len(missing)} missing and {len(moved)} moved file(s) found.\n\n"
+            "Apply these changes? Moved files keep their library entries, missing files are removed "
+            "and new files are added."
+        )
+        details = []
+        if new:
+            details.append("New:\n" + "\n".join(new))
+        if missing:
+            details.append("Missing:\n" + "\n".join(missing))
+        if moved:
+            details.append("Moved:\n" + "\n".join(f"{old} -> {new_path}" for old, new_path in moved))
+        summary.setDetailedText("\n\n".join(details + notes))
+        summary.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if summary.exec() != QMessageBox.StandardButton.Yes:
+            return
+
+        inserted = []
+
+        def import_new(selection):
+            dialog = LibraryImportDialog(selection, parent=self)
+            if dialog.exec() != QDialog.DialogCode.Accepted:
+                return False
+            inserted.extend(self.db.add_items(dialog.get_results())["inserted"])
+            return True
+
+        apply_rescan(self.db, results, import_new)
+        self.refresh_items()
+        self._confirm_list_links_for_library_paths(inserted)
 
     def remove_selected(self):
         selected = self.tree.selectedItems()
@@ -1526,7 +1403,7 @@ class LibraryMenu(QWidget):
             return
 
         self.db.delete_by_paths(paths)
-        self.load_items()
+        self.refresh_items()
 
     def _collect_paths(self, item):
         data = item.data(0, Qt.ItemDataRole.UserRole)
@@ -1556,31 +1433,6 @@ class LibraryMenu(QWidget):
         text = text.replace("/", "\\")
         return os.path.normcase(os.path.abspath(text))
 
-    def _filter_watching_items(self, items):
-        series_counts = defaultdict(lambda: [0, 0])
-        for item in items:
-            is_series = item[4] == 1
-            series_title = item[5]
-            media_type = item[2]
-            if not is_series or not series_title:
-                continue
-            watched = item[8]
-            key = (media_type, series_title)
-            series_counts[key][1] += 1
-            if watched:
-                series_counts[key][0] += 1
-
-        watching_keys = {
-            key for key, counts in series_counts.items() if 0 < counts[0] < counts[1]
-        }
-        if not watching_keys:
-            return []
-        return [
-            item
-            for item in items
-            if item[4] == 1 and item[5] and (item[2], item[5]) in watching_keys
-        ]
-
     def _title_sort_key(self, value):
         if not value:
             return ""
@@ -1713,7 +1565,8 @@ class LibraryMenu(QWidget):
         def update_node(node):
             data = node.data(0, Qt.ItemDataRole.UserRole)
             if data and data.get("path"):
-                watched = self.items_by_path.get(data["path"], (None,) * 12)[8]
+                item = self.items_by_path.get(data["path"])
+                watched = item.watched if item is not None else None
                 return (1 if watched else 0), 1
 
             watched_count = 0
@@ -1737,7 +1590,7 @@ class LibraryMenu(QWidget):
                     unwatched = [
                         path
                         for path in self._sorted_paths(paths)
-                        if self.items_by_path.get(path, (None,) * 12)[8] == 0
+                        if self._is_unwatched(path)
                     ]
                     if unwatched:
                         self._set_resume_widget(node, unwatched)
@@ -1773,34 +1626,20 @@ class LibraryMenu(QWidget):
             record = self.items_by_path.get(path)
             if not record:
                 continue
-            (
-                _id,
-                path,
-                media_type,
-                display_title,
-                is_series,
-                series_title,
-                show_title,
-                _added,
-                _watched,
-                _is_placeholder,
-                air_datetime,
-                _currently_airing,
-            ) = record
-            if _is_placeholder:
+            if record.is_placeholder:
                 has_placeholder = True
             else:
                 has_non_placeholder = True
             items.append(
                 {
-                    "path": path,
-                    "media_type": media_type,
-                    "display_title": display_title,
-                    "is_series": bool(is_series),
-                    "series_title": series_title,
-                    "show_title": show_title,
-                    "air_datetime": air_datetime,
-                    "is_placeholder": bool(_is_placeholder),
+                    "path": record.path,
+                    "media_type": record.media_type,
+                    "display_title": record.display_title,
+                    "is_series": bool(record.is_series),
+                    "series_title": record.series_title,
+                    "show_title": record.show_title,
+                    "air_datetime": record.air_datetime,
+                    "is_placeholder": bool(record.is_placeholder),
                 }
             )
 
@@ -1828,7 +1667,7 @@ class LibraryMenu(QWidget):
             return
 
         self.db.update_items(results)
-        self.load_items()
+        self.refresh_items()
 
     def add_placeholders(self):
         series_title, media_type = self._resolve_series_from_selection()
@@ -1861,6 +1700,7 @@ class LibraryMenu(QWidget):
         include_airing = results["include_airing"]
 
         start_episode = self._next_episode_number(series_title, season, media_type)
+        placeholders = []
         for offset in range(count):
             episode_number = start_episode + offset
             index_value = f"{season}.{episode_number}"
@@ -1877,19 +1717,22 @@ class LibraryMenu(QWidget):
             placeholder_path = (
                 f"__placeholder__::{series_title}::S{season}E{episode_number}::{uuid.uuid4()}"
             )
-            self.db.add_item(
-                placeholder_path,
-                media_type,
-                title,
-                is_series=True,
-                series_title=series_title,
-                show_title=index_value,
-                is_placeholder=True,
-                air_datetime=air_text,
-                currently_airing=0,
+            placeholders.append(
+                {
+                    "path": placeholder_path,
+                    "media_type": media_type,
+                    "display_title": title,
+                    "is_series": True,
+                    "series_title": series_title,
+                    "show_title": index_value,
+                    "is_placeholder": True,
+                    "air_datetime": air_text,
+                    "currently_airing": 0,
+                }
             )
 
-        self.load_items()
+        self.db.add_items(placeholders)
+        self.refresh_items()
 
     def _selected_season_number(self, selected_items):
         seasons = set()
@@ -1898,7 +1741,7 @@ class LibraryMenu(QWidget):
             if data and data.get("path"):
                 record = self.items_by_path.get(data["path"])
                 if record:
-                    for season, _episode in _parse_series_index_values(record[6] or ""):
+                    for season, _episode in _parse_series_index_values(record.show_title or ""):
                         seasons.add(season)
                 continue
 
@@ -1928,48 +1771,11 @@ class LibraryMenu(QWidget):
             )
             return
         self.db.assign_placeholder(placeholder_path, file_path)
-        self.load_items()
+        self.refresh_items()
         self._confirm_list_links_for_library_paths([file_path])
 
-    def _normalize_link_title(self, value):
-        return " ".join((value or "").strip().lower().split())
-
-    def _library_title_keys(self, record):
-        media_type = record[2]
-        display_title = record[3]
-        is_series = bool(record[4])
-        series_title = record[5]
-        keys = set()
-        normalized_display = self._normalize_link_title(display_title)
-        if normalized_display:
-            keys.add(normalized_display)
-        if media_type == "Movie" and is_series and series_title:
-            keys.add(self._normalize_link_title(series_title))
-        if media_type == "TV" and series_title:
-            keys.add(self._normalize_link_title(series_title))
-        return {key for key in keys if key}
-
     def _confirm_list_links_for_library_paths(self, paths):
-        all_library_items_by_path = {item[1]: item for item in self.db.get_items()}
-        candidate_keys = defaultdict(set)
-        for path in self._dedupe_paths(paths):
-            record = all_library_items_by_path.get(path)
-            if not record or record[9]:
-                continue
-            media_type = record[2]
-            for key in self._library_title_keys(record):
-                candidate_keys[media_type].add(key)
-        if not candidate_keys:
-            return
-
-        matching = []
-        for list_item in self.list_db.get_items():
-            item_id, media_type, title, _person_id, _person_name, _added_at, linked = list_item
-            if linked:
-                continue
-            key = self._normalize_link_title(title)
-            if key and key in candidate_keys.get(media_type, set()):
-                matching.append((item_id, media_type, title))
+        matching = self.db.get_unlinked_list_matches(self._dedupe_paths(paths))
         if not matching:
             return
 
@@ -1999,25 +1805,9 @@ class LibraryMenu(QWidget):
             self.list_db.set_library_linked([item_id for item_id, _media, _title in matching], True)
 
     def _apply_auto_airing(self, items):
-        now = datetime.now()
-        status_by_series = defaultdict(lambda: False)
-        for item in items:
-            series_title = item[5]
-            if not series_title:
-                continue
-            is_placeholder = item[9]
-            air_datetime = item[10]
-            if not is_placeholder or not air_datetime:
-                continue
-            try:
-                air_dt = datetime.strptime(air_datetime, "%Y-%m-%d %H:%M")
-            except ValueError:
-                continue
-            if air_dt > now:
-                status_by_series[(item[2], series_title)] = True
-
-        for (media_type, series_title), is_airing in status_by_series.items():
-            self.db.update_currently_airing(series_title, media_type, is_airing)
+        stale = _stale_airing_series(items)
+        if stale:
+            self.db.set_currently_airing(stale, True)
 
     def _resolve_series_from_selection(self):
         selected = self.tree.selectedItems()
@@ -2038,8 +1828,8 @@ class LibraryMenu(QWidget):
             record = self.items_by_path.get(path)
             if not record:
                 continue
-            series_title = record[5]
-            media_type = record[2]
+            series_title = record.series_title
+            media_type = record.media_type
             if not series_title:
                 continue
             series_titles.add(series_title)
@@ -2058,9 +1848,9 @@ class LibraryMenu(QWidget):
     def _next_episode_number(self, series_title, season, media_type):
         max_episode = 0
         for item in self.items_by_path.values():
-            if item[5] != series_title or item[2] != media_type:
+            if item.series_title != series_title or item.media_type != media_type:
                 continue
-            for idx_season, idx_episode in _parse_series_index_values(item[6] or ""):
+            for idx_season, idx_episode in _parse_series_index_values(item.show_title or ""):
                 if idx_season != season:
                     continue
                 max_episode = max(max_episode, idx_episode)
@@ -0,0 +1,492 @@
+import heapq
+import os
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.paths import split_library_path
+from app.core.records import DirManifest
+from app.ui.library_utils import (
+    ANALYZE_CHUNK_SIZE,
+    PathAnalyzer,
+    _clean_series_title,
+    _episode_title,
+    _import_dir_sort_key,
+    _import_file_sort_key,
+    _is_video_file,
+    _season_number_from_name,
+    analyze_path,
+)
+
+
+# Directories listed at once during an import scan. Listing is I/O bound:
+# on a network share nearly all of it is round trips to the server, so
+# sibling directories are listed in parallel. 1 lists on the calling thread.
+DEFAULT_SCAN_WORKERS = 8
+
+_scan_workers = DEFAULT_SCAN_WORKERS
+
+
+def set_scan_workers(count):
+    """Set how many directories later scans may list concurrently."""
+    global _scan_workers
+    count = int(count)
+    if count < 1:
+        raise ValueError(f"Scan workers must be at least 1: {count}")
+    _scan_workers = count
+
+
+def scan_workers():
+    return _scan_workers
+
+
+# A directory's mtime only moves when an entry is added, removed or renamed
+# directly inside it, so a rescan re-lists just the directories whose mtime
+# differs from the manifest. Timestamps are coarse on some filesystems (FAT
+# keeps 2 seconds), so a directory listed within MTIME_SETTLE_NS of its last
+# change could change again without its mtime moving; its manifest entry is
+# stored as UNSETTLED_MTIME, which makes the next rescan list it again.
+MTIME_SETTLE_NS = 2_000_000_000
+UNSETTLED_MTIME = -1
+
+
+def directory_mtime(path):
+    """Return the mtime of ``path`` in nanoseconds; raises ``OSError`` like ``os.stat``."""
+    return os.stat(path).st_mtime_ns
+
+
+class ScannedDir:
+    """One directory of an import scan: its video files, season-folder flag and manifest entry."""
+
+    __slots__ = ("path", "files", "has_season_dirs", "manifest")
+
+    def __init__(self, path):
+        self.path = path
+        self.files = []
+        self.has_season_dirs = False
+        self.manifest = None
+
+
+def list_directory(path):
+    """Return ``(name, is_dir, is_symlink)`` for each entry of ``path``, without stat'ing them."""
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            entries.append((entry.name, is_dir, is_dir and entry.is_symlink()))
+    return entries
+
+
+def _is_import_file(path):
+    # Inside a BDMV folder only MovieObject.bdmv stands for the disc.
+    if os.path.basename(os.path.dirname(path)).lower() == "bdmv":
+        return os.path.basename(path).lower() == "movieobject.bdmv"
+    return _is_video_file(path)
+
+
+def _manifest_entry(mtime_ns, entry_count):
+    if time.time_ns() - mtime_ns < MTIME_SETTLE_NS:
+        mtime_ns = UNSETTLED_MTIME
+    return DirManifest(mtime_ns, entry_count)
+
+
+def _read_dir(path, list_dir, mtime_ns=None):
+    """List ``path`` into a childless ``ScannedDir`` with unsorted files, plus its sorted subdirectories."""
+    try:
+        entries = list_dir(path)
+    except OSError:
+        return None, []
+    node = ScannedDir(path)
+    if mtime_ns is not None:
+        node.manifest = _manifest_entry(mtime_ns, len(entries))
+    subdirs = []
+    files = []
+    for name, is_dir, is_symlink in entries:
+        if not is_dir:
+            files.append(os.path.join(path, name))
+            continue
+        if _season_number_from_name(name) is not None:
+            node.has_season_dirs = True
+        if not is_symlink:
+            subdirs.append(name)
+    node.files = [file_path for file_path in files if _is_import_file(file_path)]
+    return node, [os.path.join(path, name) for name in sorted(subdirs, key=_import_dir_sort_key)]
+
+
+# A reader keeps at most this many listings per worker started but not yet
+# read by the walk, so a wide tree is not listed far ahead of it.
+PREFETCH_PER_WORKER = 2
+
+
+class _DirectoryReader:
+    """Reads directories in walk order, listing up to ``PREFETCH_PER_WORKER`` per worker ahead."""
+
+    def __init__(self, list_dir, max_workers, stat_dir=None):
+        self._list_dir = list_dir
+        self._stat_dir = stat_dir
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="import-scan") if max_workers > 1 else None
+        self._workers = max_workers
+        self._limit = PREFETCH_PER_WORKER * max_workers
+        self._running = 0
+        # Directories found but not yet listed, as a heap of (walk position,
+        # path); a position is the child indexes leading to the directory.
+        self._waiting = []
+        self._positions = {}
+        self._roots = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _read(self, path, position, ahead=False):
+        mtime_ns = None
+        if self._stat_dir is not None:
+            try:
+                mtime_ns = self._stat_dir(path)
+            except OSError:
+                pass
+        node, subdirs = _read_dir(path, self._list_dir, mtime_ns)
+        if self._pool is not None:
+            with self._lock:
+                if ahead:
+                    self._running -= 1
+                if not self._closed:
+                    for index, subdir in enumerate(subdirs):
+                        self._positions[subdir] = (*position, index)
+                        heapq.heappush(self._waiting, ((*position, index), subdir))
+                    self._submit_waiting()
+        return node, subdirs
+
+    def _submit_waiting(self):
+        while self._waiting and self._running < self._workers and len(self._pending) < self._limit:
+            position, path = heapq.heappop(self._waiting)
+            # Gone when the walk read it before its turn came.
+            if self._positions.pop(path, None) is None:
+                continue
+            self._running += 1
+            self._pending[path] = self._pool.submit(self._read, path, position, True)
+
+    def read(self, path):
+        with self._lock:
+            future = self._pending.pop(path, None)
+            if future is not None:
+                if not self._closed:
+                    self._submit_waiting()
+            else:
+                position = self._positions.pop(path, None)
+                if position is None:
+                    position = (self._roots,)
+                    self._roots += 1
+        if future is None:
+            return self._read(path, position)
+        return future.result()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._waiting.clear()
+            self._positions.clear()
+            self._pending.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ImportRow(
+    namedtuple(
+        "ImportRow",
+        "path parent is_folder media_type series_title series_index display_title",
+    )
+):
+    """One row of the import dialog with its default field values; ``parent`` is ``None`` for a root."""
+
+    __slots__ = ()
+
+
+def import_row(media, parent, is_folder, series_index="", default_series_title=None):
+    """Build the ``ImportRow`` for the ``ParsedMedia`` ``media``."""
+    series_title = ""
+    if media.media_type == "TV":
+        series_title = default_series_title or media.show_title
+        if not is_folder and media.episode and media.episode.show:
+            series_title = media.episode.show
+    display_title = None
+    if not is_folder:
+        if media.media_type == "TV":
+            display_title = _episode_title(media.episode, series_index)
+        else:
+            display_title = media.display_title
+    return ImportRow(media.path, parent, is_folder, media.media_type, series_title, series_index, display_title)
+
+
+class _DirFiles(namedtuple("_DirFiles", "parent files season_num")):
+    """The files of one directory, waiting for analysis before they become rows."""
+
+    __slots__ = ()
+
+
+# While the walk is running, files are analysed in batches of up to
+# ANALYZE_CHUNK_SIZE, or whatever was found in the last
+# IMPORT_BATCH_INTERVAL seconds, so rows keep arriving from a slow share.
+IMPORT_BATCH_INTERVAL = 0.1
+
+
+class _ImportAnalysis:
+    """Analyses walk output in batches on a ``PathAnalyzer`` and hands back rows in walk order."""
+
+    def __init__(self):
+        self._items = []
+        self._batch_files = 0
+        self._batch_started = time.monotonic()
+        self._batches = deque()
+        self._analyzer = PathAnalyzer()
+
+    def add(self, item):
+        self._items.append(item)
+        if isinstance(item, _DirFiles):
+            self._batch_files += len(item.files)
+        if (
+            self._batch_files >= ANALYZE_CHUNK_SIZE
+            or time.monotonic() - self._batch_started >= IMPORT_BATCH_INTERVAL
+        ):
+            self._close_batch()
+
+    def _close_batch(self):
+        items, self._items = self._items, []
+        paths = [path for item in items if isinstance(item, _DirFiles) for path in item.files]
+        self._batches.append((items, self._analyzer.submit(paths)))
+        self._batch_files = 0
+        self._batch_started = time.monotonic()
+
+    def ready_rows(self):
+        """Yield the rows of every finished batch at the head of the queue."""
+        while self._batches:
+            _items, media = self._batches[0]
+            if not all(future.done() for future in media):
+                return
+            yield from self._pop_rows()
+
+    def remaining_rows(self):
+        """Close the open batch and yield every row still owed, waiting on the pool."""
+        if self._items:
+            self._close_batch()
+        while self._batches:
+            yield from self._pop_rows()
+
+    def _pop_rows(self):
+        items, media = self._batches.popleft()
+        media = (file_media for future in media for file_media in future.result())
+        for item in items:
+            if isinstance(item, ImportRow):
+                yield item
+            else:
+                yield from _file_rows(item, [next(media) for _path in item.files])
+
+    def close(self):
+        self._analyzer.close()
+
+
+def _file_rows(item, media):
+    episode_counter = 1
+    for file_media in sorted(media, key=lambda file_media: file_media.sort_key):
+        episode = file_media.episode
+        default_index = ""
+        if episode:
+            default_index = episode.series_index
+            if item.season_num and episode.season == item.season_num:
+                episode_counter = max(episode_counter, episode.end_episode + 1)
+        elif item.season_num:
+            default_index = f"{item.season_num}.{episode_counter}"
+            episode_counter += 1
+        yield import_row(file_media, item.parent, False, default_index)
+
+
+def iter_import_rows(
+    selected_paths,
+    list_dir=list_directory,
+    is_cancelled=None,
+    max_workers=None,
+    manifest=None,
+    stat_dir=directory_mtime,
+):
+    """Yield an ``ImportRow`` for every folder and video file under ``selected_paths``, parents first.
+
+    Unreadable and symlinked directories are skipped, as in ``os.walk``. A ``manifest`` dict is filled
+    with ``{root: {directory: DirManifest}}`` for :func:`rescan_root`.
+    """
+    reader = _DirectoryReader(list_dir, max_workers or _scan_workers, stat_dir if manifest is not None else None)
+    analysis = _ImportAnalysis()
+    try:
+        for item in _iter_rows(selected_paths, reader, is_cancelled, manifest):
+            analysis.add(item)
+            yield from analysis.ready_rows()
+        yield from analysis.remaining_rows()
+    finally:
+        reader.close()
+        analysis.close()
+
+
+def _iter_rows(selected_paths, reader, is_cancelled, manifest):
+    folder_roots = [path for path in selected_paths if os.path.isdir(path)]
+    file_roots = [path for path in selected_paths if os.path.isfile(path)]
+
+    for root in folder_roots:
+        if is_cancelled is not None and is_cancelled():
+            return
+        root_name = os.path.basename(root) or root
+        season_for_root = _season_number_from_name(root_name)
+        default_series_title = _clean_series_title(root_name)
+        default_index = str(season_for_root) if season_for_root is not None else ""
+        if season_for_root is not None:
+            parent_name = os.path.basename(os.path.dirname(root))
+            default_series_title = _clean_series_title(parent_name) or default_series_title
+        yield import_row(analyze_path(root), None, True, default_index, default_series_title or root_name)
+        node, subdirs = reader.read(root)
+        if node is not None:
+            root_manifest = manifest.setdefault(root, {}) if manifest is not None else None
+            yield from _iter_dir_rows(node, subdirs, reader, is_cancelled, root_manifest)
+
+    files = [path for path in file_roots if _is_video_file(path)]
+    if files:
+        yield _DirFiles(None, files, None)
+
+
+def _iter_dir_rows(node, subdirs, reader, is_cancelled, manifest):
+    dirpath = node.path
+    if manifest is not None and node.manifest is not None:
+        manifest[dirpath] = node.manifest
+    season_num = _season_number_from_name(os.path.basename(dirpath))
+    if season_num is None and not node.has_season_dirs:
+        season_num = 1 if "tv shows" in dirpath.lower() else None
+    if node.files:
+        yield _DirFiles(dirpath, node.files, season_num)
+
+    for path in subdirs:
+        if is_cancelled is not None and is_cancelled():
+            return
+        child, child_subdirs = reader.read(path)
+        if child is None:
+            continue
+        child_season = _season_number_from_name(os.path.basename(path))
+        yield import_row(analyze_path(path), dirpath, True, str(child_season) if child_season else "")
+        yield from _iter_dir_rows(child, child_subdirs, reader, is_cancelled, manifest)
+
+
+class RescanResult(namedtuple("RescanResult", "root available new new_dirs missing moved manifest")):
+    """What changed under a library root since its manifest was taken."""
+
+    __slots__ = ()
+
+    def import_paths(self):
+        """Return the topmost new directories and the new files outside them, to import ``new`` from."""
+        folders = [path for path in self.new_dirs if any(_is_under(file, path) for file in self.new)]
+        files = [file for file in self.new if not any(_is_under(file, path) for path in folders)]
+        return folders + files
+
+
+def _is_under(path, directory):
+    return path.startswith(os.path.join(directory, ""))
+
+
+def _dir_key(path):
+    # Directory paths compare as their parent would see them, whether or not
+    # they were given with a trailing separator.
+    return os.path.dirname(os.path.join(path, ""))
+
+
+def rescan_root(root, manifest, library_files, list_dir=list_directory, stat_dir=directory_mtime):
+    """Compare ``root`` with the library, listing only directories whose mtime changed since ``manifest``."""
+    children = defaultdict(list)
+    for path in manifest:
+        if _dir_key(path) != _dir_key(root):
+            children[os.path.dirname(path)].append(path)
+
+    def known_children(path):
+        return sorted(children.get(_dir_key(path), ()), key=lambda child: _import_dir_sort_key(os.path.basename(child)))
+
+    def subtree(path):
+        paths = [path]
+        for child in children.get(_dir_key(path), ()):
+            paths.extend(subtree(child))
+        return paths
+
+    new_manifest = {}
+    listed = []
+    gone = []
+    new_dirs = []
+    fresh = set()
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        try:
+            mtime_ns = stat_dir(path)
+        except OSError:
+            if path == root:
+                return RescanResult(root, False, [], [], [], [], dict(manifest))
+            gone.extend(subtree(path))
+            continue
+        known = manifest.get(path)
+        if known is not None and known.mtime_ns == mtime_ns:
+            new_manifest[path] = known
+            stack.extend(reversed(known_children(path)))
+            continue
+        node, subdirs = _read_dir(path, list_dir, mtime_ns)
+        if node is None:
+            # Unreadable for now: leave it out of the manifest so the next
+            # rescan lists it again, and look at what is known below it.
+            stack.extend(reversed(known_children(path)))
+            continue
+        new_manifest[path] = node.manifest
+        listed.append(node)
+        if known is None and path != root:
+            fresh.add(_dir_key(path))
+            if os.path.dirname(path) not in fresh:
+                new_dirs.append(path)
+        found = set(subdirs)
+        for child in known_children(path):
+            if child not in found:
+                gone.extend(subtree(child))
+        stack.extend(reversed(subdirs))
+
+    directories = [os.path.join(node.path, "") for node in listed]
+    gone_directories = [os.path.join(path, "") for path in gone]
+    stored = library_files(directories + gone_directories)
+    new = []
+    missing = []
+    for directory, node in zip(directories, listed):
+        names = stored.get(directory, set())
+        on_disk = set()
+        for file_path in sorted(node.files, key=_import_file_sort_key):
+            name = split_library_path(file_path)[1]
+            on_disk.add(name)
+            if name not in names:
+                new.append(file_path)
+        missing.extend(directory + name for name in sorted(names - on_disk))
+    for directory in gone_directories:
+        missing.extend(directory + name for name in sorted(stored.get(directory, ())))
+
+    new, missing, moved = _pair_moves(new, missing)
+    return RescanResult(root, True, new, new_dirs, missing, moved, new_manifest)
+
+
+def _pair_moves(new, missing):
+    new_by_name = defaultdict(list)
+    for path in new:
+        new_by_name[split_library_path(path)[1]].append(path)
+    missing_by_name = defaultdict(list)
+    for path in missing:
+        missing_by_name[split_library_path(path)[1]].append(path)
+    moved = []
+    for name, old_paths in missing_by_name.items():
+        new_paths = new_by_name.get(name, [])
+        if len(old_paths) == 1 and len(new_paths) == 1:
+            moved.append((old_paths[0], new_paths[0]))
+    moved_old = {old_path for old_path, _new_path in moved}
+    moved_new = {new_path for _old_path, new_path in moved}
+    return (
+        [path for path in new if path not in moved_new],
+        [path for path in missing if path not in moved_old],
+        moved,
+    )
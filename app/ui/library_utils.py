@@ -1,7 +1,12 @@
+import multiprocessing
 import os
 import re
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+from app.core.bulk import chunked
 
 
 VIDEO_EXTENSIONS = (
@@ -20,6 +25,97 @@ VIDEO_EXTENSIONS = (
 )
 
 VIDEO_FILE_FILTER = f"Video Files ({' '.join(f'*{ext}' for ext in VIDEO_EXTENSIONS)});;All Files (*)"
+IMPORT_PLAN_FILTER = "Import Plans (*.jsonl);;All Files (*)"
+
+# Parsed names are cached per file or folder name: an import asks for the
+# same name from the sort key, the row defaults and the episode title. The
+# bound keeps a very large import from holding every name at once.
+NAME_CACHE_SIZE = 8192
+
+_SEPARATORS_RE = re.compile(r"[._]+")
+# A series title ends at a "(2019)", a " - Season 2..." or a bare " S02".
+_SERIES_TAIL_RE = re.compile(
+    r"\s*\(\d{4}\).*$|\s+-\s+season\s+\d+.*$|\s+S\d{1,2}(?!E\d)\b.*$",
+    re.IGNORECASE,
+)
+_SERIES_TRAILING_YEAR_RE = re.compile(r"\s+(?:19|20)\d{2}$")
+_TITLE_TOKEN_RE = re.compile(r"^([^\w]*)([\w][\w']*)([^\w]*)$", re.UNICODE)
+_ROMAN_LETTERS_RE = re.compile(r"[IVXLCDM]+")
+_ROMAN_NUMERAL_RE = re.compile(r"M{0,4}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})")
+_EPISODE_CODE_RE = re.compile(r"^S(?P<season>\d{2})E(?P<start>\d{2})(?:-(?:E)?(?P<end>\d{2}))?$")
+_SERIES_INDEX_RE = re.compile(r"^(?P<season>\d+)\.(?P<start>\d+)(?:-(?P<end>\d+))?$")
+# Finds the meaningful tokens of a file name in one left-to-right scan:
+# episode codes, "(1080p" resolutions and "(2019)" years, plus, once the
+# first code is behind, release markers such as WEB-DL or x265 that start
+# a word. Everything between tokens is plain text. A marker also ends where
+# only separators are left, as "x265" does in "Title.x265_".
+_NAME_TOKEN_RE = re.compile(
+    r"(?P<code>S(?<![A-Za-z0-9]S)\d{1,2}E\d{1,2}(?:-(?:E)?\d{1,2})?(?=$|[._\s-]))"
+    r"|(?P<resolution>\((?:720|1080|2160)p\b)"
+    r"|(?P<year>\(\d{4}\))",
+    re.IGNORECASE,
+)
+_RELEASE_TOKEN_RE = re.compile(
+    _NAME_TOKEN_RE.pattern + r"|[\s._-](?P<quality>(?:h(?:dr|evc|264|265)|dv|uhd|720p|1080p|2160p"
+    r"|web(?:rip|-dl)?|b(?:luray|drip)|a(?:mzn|tvp|tmos|ac)|nf|ddp?|x26[45]|proper|re(?:pack|mux))"
+    r"(?:\b|(?=[ ._-]*\Z)))",
+    re.IGNORECASE,
+)
+_STRICT_CODE_RE = re.compile(r"S\d{2}E\d{2}(?:-(?:E)?\d{2})?", re.IGNORECASE)
+_DASH_RE = re.compile(r"\s*-\s*")
+_SEASON_RANGE_RE = re.compile(r"\bseason\s+\d+\s*-\s*\d+\b")
+_SEASON_CODE_RANGE_RE = re.compile(r"\bS\d{1,2}\s*-\s*S\d{1,2}\b", re.IGNORECASE)
+_SEASON_CODE_RE = re.compile(r"\bS(?P<season>\d{1,2})(?!E\d)\b", re.IGNORECASE)
+
+_MINOR_TITLE_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "as",
+        "at",
+        "but",
+        "by",
+        "for",
+        "from",
+        "in",
+        "nor",
+        "of",
+        "on",
+        "or",
+        "the",
+        "to",
+        "vs",
+        "via",
+    }
+)
+
+_LANGUAGE_TOKENS = frozenset(
+    {
+        "ita",
+        "eng",
+        "en",
+        "it",
+        "spa",
+        "esp",
+        "fra",
+        "fre",
+        "deu",
+        "ger",
+        "jpn",
+        "kor",
+        "rus",
+        "pt",
+        "por",
+        "lat",
+        "multi",
+        "sub",
+        "subs",
+        "dub",
+        "dual",
+        "audio",
+    }
+)
 
 
 def _is_video_file(path):
@@ -43,15 +139,16 @@ def _default_display_title(path):
     return os.path.splitext(os.path.basename(path))[0]
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _clean_series_title(raw):
     text = (raw or "").strip()
     if not text:
         return ""
-    text = re.sub(r"[._]+", " ", text).strip()
-    text = re.sub(r"\s*\(\d{4}\).*$", "", text)
-    text = re.split(r"\s+-\s+season\s+\d+.*$", text, maxsplit=1, flags=re.IGNORECASE)[0]
-    text = re.split(r"\s+S\d{1,2}(?!E\d)\b.*$", text, maxsplit=1, flags=re.IGNORECASE)[0]
-    text = re.sub(r"\s+(?:19|20)\d{2}$", "", text)
+    text = _SEPARATORS_RE.sub(" ", text).strip()
+    tail = _SERIES_TAIL_RE.search(text)
+    if tail:
+        text = text[: tail.start()]
+    text = _SERIES_TRAILING_YEAR_RE.sub("", text)
     cleaned = text.strip(" -._")
     if cleaned and cleaned == cleaned.lower():
         return _normalize_episode_title_case(cleaned)
@@ -61,75 +158,55 @@ def _clean_series_title(raw):
 def _normalize_episode_title_case(text):
     if not text:
         return ""
+    words = text.split()
+    last_word_index = len(words) - 1
+    return " ".join(
+        _normalize_title_word(word, i == 0, i == last_word_index) for i, word in enumerate(words)
+    )
 
-    minor = {
-        "a",
-        "an",
-        "and",
-        "as",
-        "at",
-        "but",
-        "by",
-        "for",
-        "from",
-        "in",
-        "nor",
-        "of",
-        "on",
-        "or",
-        "the",
-        "to",
-        "vs",
-        "via",
-    }
 
-    def split_token(raw):
-        match = re.match(r"^([^\w]*)([\w][\w']*)([^\w]*)$", raw, flags=re.UNICODE)
-        if not match:
-            return raw, "", ""
-        return match.group(1), match.group(2), match.group(3)
-
-    def is_roman_numeral(core):
-        upper = core.upper()
-        if not upper:
-            return False
-        if not re.fullmatch(r"[IVXLCDM]+", upper):
-            return False
-        if len(upper) < 2:
-            return False
-        return bool(
-            re.fullmatch(
-                r"M{0,4}(CM|CD|D?C{0,3})(XC|XL|L?X{0,3})(IX|IV|V?I{0,3})",
-                upper,
-            )
-        )
+# Titles share most of their words, so each word's casing is worked out once.
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _normalize_title_word(word, is_first, is_last):
+    normalized_parts = []
+    for part in word.split("-"):
+        prefix, core, suffix = _split_title_token(part)
+        normalized_core = _normalize_title_core(core, is_first, is_last)
+        normalized_parts.append(f"{prefix}{normalized_core}{suffix}" if core else part)
+    return "-".join(normalized_parts)
 
-    def normalize_core(core, is_first, is_last):
-        if not core:
-            return core
-        if is_roman_numeral(core):
-            return core.upper()
-        if core.isalpha() and core.isupper() and len(core) >= 2:
-            return core
-        if any(ch.isdigit() for ch in core) and any(ch.isalpha() for ch in core):
-            return core
-        lower = core.lower()
-        if not is_first and not is_last and lower in minor and len(core) > 1:
-            return lower
-        return lower[:1].upper() + lower[1:]
 
-    words = text.split()
-    normalized_words = []
-    last_word_index = len(words) - 1
-    for i, word in enumerate(words):
-        parts = word.split("-")
-        normalized_parts = []
-        for part in parts:
-            prefix, core, suffix = split_token(part)
-            normalized_core = normalize_core(core, i == 0, i == last_word_index)
-            normalized_parts.append(f"{prefix}{normalized_core}{suffix}" if core else part)
-        normalized_words.append("-".join(normalized_parts))
-    return " ".join(normalized_words)
+def _split_title_token(raw):
+    match = _TITLE_TOKEN_RE.match(raw)
+    if not match:
+        return raw, "", ""
+    return match.group(1), match.group(2), match.group(3)
+
+
+def _is_roman_numeral(core):
+    upper = core.upper()
+    if not upper:
+        return False
+    if not _ROMAN_LETTERS_RE.fullmatch(upper):
+        return False
+    if len(upper) < 2:
+        return False
+    return bool(_ROMAN_NUMERAL_RE.fullmatch(upper))
+
+
+def _normalize_title_core(core, is_first, is_last):
+    if not core:
+        return core
+    if _is_roman_numeral(core):
+        return core.upper()
+    if core.isalpha() and core.isupper() and len(core) >= 2:
+        return core
+    if any(ch.isdigit() for ch in core) and any(ch.isalpha() for ch in core):
+        return core
+    lower = core.lower()
+    if not is_first and not is_last and lower in _MINOR_TITLE_WORDS and len(core) > 1:
+        return lower
+    return lower[:1].upper() + lower[1:]
 
 
 def _episode_code_from_series_index(series_index):
@@ -142,7 +219,7 @@ def _episode_code_from_series_index(series_index):
 
 def _parse_episode_code(code_text):
     text = (code_text or "").strip().upper()
-    match = re.match(r"^S(?P<season>\d{2})E(?P<start>\d{2})(?:-(?:E)?(?P<end>\d{2}))?$", text)
+    match = _EPISODE_CODE_RE.match(text)
     if not match:
         return None
     season = int(match.group("season"))
@@ -170,7 +247,7 @@ def _parse_series_index_values(series_index):
         return values
     parts = [p.strip() for p in raw.split(",") if p.strip()]
     for part in parts:
-        match = re.match(r"^(?P<season>\d+)\.(?P<start>\d+)(?:-(?P<end>\d+))?$", part)
+        match = _SERIES_INDEX_RE.match(part)
         if not match:
             continue
         season = int(match.group("season"))
@@ -232,10 +309,9 @@ def _build_show_air_notes(tv_items, now=None):
         now = datetime.now()
     by_show = defaultdict(list)
     for item in tv_items:
-        show_title = item[5] or "Unknown Show"
-        is_placeholder = bool(item[9])
-        air_dt = _parse_air_datetime_value(item[10])
-        if not is_placeholder or not air_dt:
+        show_title = item.series_title or "Unknown Show"
+        air_dt = _parse_air_datetime_value(item.air_datetime)
+        if not item.is_placeholder or not air_dt:
             continue
         by_show[show_title].append(air_dt)
 
@@ -253,108 +329,217 @@ def _build_show_air_notes(tv_items, now=None):
     return notes
 
 
+def _stale_airing_series(items, now=None):
+    """Return the (media_type, series_title) keys whose airing flag needs setting.
+
+    A series is airing while it has a placeholder dated in the future. Only
+    series with at least one stored series row still flagged as not airing
+    are returned, so a library that is already up to date yields nothing.
+    """
+    if now is None:
+        now = datetime.now()
+    airing = set()
+    for item in items:
+        if not item.series_title or not item.is_placeholder:
+            continue
+        air_dt = _parse_air_datetime_value(item.air_datetime)
+        if air_dt and air_dt > now:
+            airing.add((item.media_type, item.series_title))
+    if not airing:
+        return set()
+    return {
+        (item.media_type, item.series_title)
+        for item in items
+        if item.is_series == 1 and not item.currently_airing and (item.media_type, item.series_title) in airing
+    }
+
+
+class ParsedName(
+    namedtuple(
+        "ParsedName",
+        "show year episode_code season start_episode end_episode title quality languages group",
+    )
+):
+    """An episode file name read by :func:`_parse_media_name`.
+
+    ``show`` and ``title`` are cleaned for display. ``year`` is a ``(YYYY)``
+    ahead of the episode code, or ``None``. ``quality`` holds the release
+    markers found after the code, ``languages`` the language tags dropped
+    from the end of the title and ``group`` a trailing ``[...]`` tag.
+    """
+
+    __slots__ = ()
+
+    @property
+    def series_index(self):
+        return _format_series_index_range(self.season, self.start_episode, self.end_episode)
+
+
+def _tokenize_media_name(name):
+    """Return ``(kind, start, end)`` for each token of ``name``; see ``_NAME_TOKEN_RE``."""
+    tokens = []
+    for match in _NAME_TOKEN_RE.finditer(name):
+        tokens.append((match.lastgroup, *match.span()))
+        if match.lastgroup == "code":
+            tokens.extend(
+                (release.lastgroup, *release.span(release.lastgroup))
+                for release in _RELEASE_TOKEN_RE.finditer(name, match.end())
+            )
+            break
+    return tokens
+
+
 def _extract_tv_episode_parts(path):
-    name = os.path.splitext(os.path.basename(path))[0]
-    strict_pattern = (
-        r"^(?P<show>.*?)\s*(?:\(\d{4}\))?\s*-\s*(?P<code>S\d{2}E\d{2}(?:-(?:E)?\d{2})?)\s*-\s*"
-        r"(?P<title>.*?)(?:\s*\((?:720|1080|2160)p\b.*)?$"
+    """Parse an episode file name; the result is a fresh dict the caller may change."""
+    parsed = _parse_media_name(os.path.splitext(os.path.basename(path))[0])
+    if parsed is None:
+        return None
+    return {
+        "series_title": parsed.show or None,
+        "episode_code": parsed.episode_code,
+        "season": parsed.season,
+        "start_episode": parsed.start_episode,
+        "end_episode": parsed.end_episode,
+        "series_index": parsed.series_index,
+        "episode_title": parsed.title,
+    }
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _parse_media_name(name):
+    """Read an episode file name, without extension, into a ``ParsedName``.
+
+    A name laid out as ``Show (Year) - S01E02 - Title (1080p ...)`` is read
+    by position. Any other name is read around its first ``SxxEyy`` code,
+    and release markers, a trailing ``[group]`` and language tags are
+    dropped from the title. Returns ``None`` without a two-digit code.
+    """
+    tokens = _tokenize_media_name(name)
+    codes = [index for index, token in enumerate(tokens) if token[0] == "code"]
+    if not codes:
+        return None
+    for index in codes:
+        parsed = _parse_dashed_name(name, tokens, index)
+        if parsed is not None:
+            return parsed
+    return _parse_release_name(name, tokens, codes[0])
+
+
+def _name_year(name, tokens, code_index):
+    for kind, start, end in tokens[:code_index]:
+        if kind == "year":
+            return int(name[start + 1 : end - 1])
+    return None
+
+
+def _parsed_name(name, tokens, code_index, show, code_text, title, quality=(), languages=(), group=""):
+    episode = _parse_episode_code(code_text)
+    if not episode:
+        return None
+    season = episode["season"]
+    start_episode = episode["start_episode"]
+    end_episode = episode["end_episode"]
+    episode_code = f"S{season:02d}E{start_episode:02d}"
+    if end_episode != start_episode:
+        episode_code += f"-E{end_episode:02d}"
+    return ParsedName(
+        show,
+        _name_year(name, tokens, code_index),
+        episode_code,
+        season,
+        start_episode,
+        end_episode,
+        _normalize_episode_title_case(title or episode_code),
+        tuple(quality),
+        tuple(languages),
+        group,
     )
-    match = re.match(strict_pattern, name, flags=re.IGNORECASE)
-    if match:
-        show = _clean_series_title(match.group("show"))
-        title = match.group("title").strip(" -._")
-        code_text = match.group("code")
+
+
+def _parse_dashed_name(name, tokens, code_index):
+    # "Show (2019) - S01E02 - Title (1080p ...)": the code needs two-digit
+    # numbers and a dash on either side.
+    _kind, code_start, code_end = tokens[code_index]
+    show_end = len(name[:code_start].rstrip()) - 1
+    if show_end < 0 or name[show_end] != "-":
+        return None
+    code_match = _STRICT_CODE_RE.match(name, code_start, code_end)
+    if not code_match:
+        return None
+    # A range the dash after it can't follow leaves the bare code, with the
+    # range's own dash as the separator.
+    ends = [code_match.end()]
+    if code_match.end() == code_start + 9 or code_match.end() == code_start + 10:
+        ends.append(code_start + 6)
+    for end in ends:
+        dash = _DASH_RE.match(name, end)
+        if dash:
+            break
     else:
-        loose_match = re.search(
-            r"(?<![A-Za-z0-9])S\d{1,2}E\d{1,2}(?:-(?:E)?\d{1,2})?(?=$|[._\s-])",
-            name,
-            flags=re.IGNORECASE,
-        )
-        if not loose_match:
-            return None
-        show_raw = name[:loose_match.start()]
-        tail = name[loose_match.end() :]
-        show = _clean_series_title(re.sub(r"[._]+", " ", show_raw).strip(" -._"))
-        code_text = loose_match.group(0)
-
-        tail = tail.strip(" -._")
-        quality_marker = re.search(
-            r"(?i)(?:^|[\s._-])(?:hdr|dv|uhd|720p|1080p|2160p|webrip|web-dl|web|bluray|bdrip|amzn|atvp|nf|ddp?|atmos|aac|x264|x265|h264|h265|hevc|proper|repack|remux)\b",
-            tail,
-        )
-        if quality_marker:
-            tail = tail[: quality_marker.start()]
-        tail = re.sub(r"\[[^\]]*\]\s*$", "", tail).strip(" -._")
-        tail = re.sub(r"[._]+", " ", tail).strip()
-        if tail:
-            words = tail.split()
-            language_tokens = {
-                "ita",
-                "eng",
-                "en",
-                "it",
-                "spa",
-                "esp",
-                "fra",
-                "fre",
-                "deu",
-                "ger",
-                "jpn",
-                "kor",
-                "rus",
-                "pt",
-                "por",
-                "lat",
-                "multi",
-                "sub",
-                "subs",
-                "dub",
-                "dual",
-                "audio",
-            }
-            while words:
-                trailing = words[-1].lower().strip("-")
-                trailing_parts = [p for p in trailing.split("-") if p]
-                if trailing_parts and all(part in language_tokens for part in trailing_parts):
-                    words.pop()
-                    continue
-                if trailing in language_tokens:
-                    words.pop()
-                    continue
-                break
-            tail = " ".join(words).strip()
-        title = tail
-
-    episode_data = _parse_episode_code(code_text)
-    if not episode_data:
         return None
-    episode_code = (
-        f"S{episode_data['season']:02d}E{episode_data['start_episode']:02d}"
-        if episode_data["start_episode"] == episode_data["end_episode"]
-        else f"S{episode_data['season']:02d}E{episode_data['start_episode']:02d}"
-        f"-E{episode_data['end_episode']:02d}"
+    title_end = len(name)
+    quality = ()
+    for kind, start, token_end in tokens[code_index + 1 :]:
+        if kind == "resolution" and start >= dash.end():
+            title_end = len(name[:start].rstrip())
+            quality = (name[start + 1 : token_end],)
+            break
+    title = name[dash.end() : max(title_end, dash.end())].strip(" -._")
+    show = _clean_series_title(name[:show_end])
+    return _parsed_name(name, tokens, code_index, show, name[code_start:end], title, quality)
+
+
+def _parse_release_name(name, tokens, code_index):
+    # "Show.S01E02.Title.1080p.WEB-DL.ENG [group]": the title runs from the
+    # code to the first release marker.
+    _kind, code_start, code_end = tokens[code_index]
+    show = _clean_series_title(_SEPARATORS_RE.sub(" ", name[:code_start]).strip(" -._"))
+    rest = name[code_end:]
+    tail_start = code_end + len(rest) - len(rest.lstrip(" -._"))
+    tail_end = code_end + len(rest.rstrip(" -._"))
+
+    cut = None
+    quality = []
+    for kind, start, end in tokens[code_index + 1 :]:
+        if kind == "quality":
+            quality.append(name[start:end])
+            if cut is None:
+                cut = max(start - 1, tail_start)
+    text = name[tail_start : tail_end if cut is None else cut]
+
+    group = ""
+    body_end = len(text.rstrip())
+    if text[body_end - 1 : body_end] == "]":
+        group_start = text.find("[", text.rfind("]", 0, body_end - 1) + 1, body_end - 1)
+        if group_start != -1:
+            group = text[group_start + 1 : body_end - 1]
+            text = text[:group_start]
+    text = _SEPARATORS_RE.sub(" ", text.strip(" -._")).strip()
+
+    words = text.split()
+    languages = []
+    while words:
+        trailing = words[-1].lower().strip("-")
+        trailing_parts = [part for part in trailing.split("-") if part]
+        if trailing in _LANGUAGE_TOKENS or (
+            trailing_parts and all(part in _LANGUAGE_TOKENS for part in trailing_parts)
+        ):
+            languages.insert(0, words.pop())
+            continue
+        break
+    title = " ".join(words)
+    return _parsed_name(
+        name, tokens, code_index, show, name[code_start:code_end], title, quality, languages, group
     )
-    if not title:
-        title = episode_code
-    return {
-        "series_title": show or None,
-        "episode_code": episode_code,
-        "season": episode_data["season"],
-        "start_episode": episode_data["start_episode"],
-        "end_episode": episode_data["end_episode"],
-        "series_index": _format_series_index_range(
-            episode_data["season"],
-            episode_data["start_episode"],
-            episode_data["end_episode"],
-        ),
-        "episode_title": _normalize_episode_title_case(title),
-    }
 
 
 def _default_episode_title(path, series_index=""):
-    parsed = _extract_tv_episode_parts(path)
-    if parsed and parsed["episode_title"]:
-        return parsed["episode_title"]
+    return _episode_title(_parse_media_name(os.path.splitext(os.path.basename(path))[0]), series_index)
+
+
+def _episode_title(episode, series_index=""):
+    if episode and episode.title:
+        return episode.title
     return _episode_code_from_series_index(series_index) or "S01E01"
 
 
@@ -377,18 +562,19 @@ def _default_show_and_series(path):
     return cleaned, ""
 
 
+@lru_cache(maxsize=NAME_CACHE_SIZE)
 def _season_number_from_name(name):
-    text = re.sub(r"[._]+", " ", (name or "").strip())
+    text = _SEPARATORS_RE.sub(" ", (name or "").strip())
     lowered = text.lower()
-    if re.search(r"\bseason\s+\d+\s*-\s*\d+\b", lowered):
+    if _SEASON_RANGE_RE.search(lowered):
         return None
-    if re.search(r"\bS\d{1,2}\s*-\s*S\d{1,2}\b", text, flags=re.IGNORECASE):
+    if _SEASON_CODE_RANGE_RE.search(text):
         return None
     if lowered.startswith("season"):
         parts = lowered.split()
         if len(parts) >= 2 and parts[1].isdigit():
             return int(parts[1])
-    match = re.search(r"\bS(?P<season>\d{1,2})(?!E\d)\b", text, flags=re.IGNORECASE)
+    match = _SEASON_CODE_RE.search(text)
     if match:
         return int(match.group("season"))
     return None
@@ -402,18 +588,130 @@ def _import_dir_sort_key(name):
 
 
 def _import_file_sort_key(path):
-    parsed = _extract_tv_episode_parts(path)
-    if parsed:
+    return _episode_sort_key(path, _parse_media_name(os.path.splitext(os.path.basename(path))[0]))
+
+
+def _episode_sort_key(path, episode):
+    if episode:
         return (
             0,
-            parsed["season"],
-            parsed["start_episode"],
-            parsed["end_episode"],
+            episode.season,
+            episode.start_episode,
+            episode.end_episode,
             os.path.basename(path).lower(),
         )
     return (1, 0, 0, 0, os.path.basename(path).lower())
 
 
+class ParsedMedia(
+    namedtuple("ParsedMedia", "path media_type show_title season_folder display_title episode")
+):
+    """What the import defaults need to know about one path; see :func:`analyze_path`.
+
+    ``show_title`` and ``season_folder`` come from the enclosing folders,
+    ``display_title`` is the movie-style title and ``episode`` the
+    ``ParsedName`` of the file name, or ``None`` without an episode code.
+    """
+
+    __slots__ = ()
+
+    @property
+    def sort_key(self):
+        return _episode_sort_key(self.path, self.episode)
+
+
+# analyze_paths parses shorter lists in the calling process: below this,
+# starting worker processes costs more than the parsing they would share.
+ANALYZE_PROCESS_THRESHOLD = 5000
+# Paths sent to a worker process per task.
+ANALYZE_CHUNK_SIZE = 1000
+
+
+def analyze_path(path):
+    show_title, season_folder = _default_show_and_series(path)
+    return ParsedMedia(
+        path,
+        _detect_default_type(path),
+        show_title,
+        season_folder,
+        _default_display_title(path),
+        _parse_media_name(os.path.splitext(os.path.basename(path))[0]),
+    )
+
+
+def analyze_paths(paths, executor=None, max_workers=None):
+    """Return a ``ParsedMedia`` for each of ``paths``, in order.
+
+    From ``ANALYZE_PROCESS_THRESHOLD`` paths up, the work is split into
+    chunks on a process pool; ``executor`` and ``max_workers`` are as for
+    :class:`PathAnalyzer`.
+    """
+    analyzer = PathAnalyzer(executor, max_workers)
+    try:
+        return [media for future in analyzer.submit(list(paths)) for media in future.result()]
+    finally:
+        analyzer.close()
+
+
+def _use_process_pool(count, max_workers=None):
+    # A single CPU gains nothing from workers but the cost of pickling.
+    return count >= ANALYZE_PROCESS_THRESHOLD and (max_workers or os.cpu_count() or 1) > 1
+
+
+def analysis_executor(max_workers=None):
+    """Start a process pool for :func:`analyze_paths`.
+
+    Workers are spawned rather than forked, so the pool can be started from
+    a process that is already running threads, such as the Qt UI.
+    """
+    return ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+class PathAnalyzer:
+    """Parses lists of paths into ``ParsedMedia``, moving to a process pool once there are enough.
+
+    Every list passed to :meth:`submit` counts towards
+    ``ANALYZE_PROCESS_THRESHOLD``, so a scan that submits what it finds as it
+    goes starts parsing on the pool once it has grown large, and keeps
+    walking while the workers parse. The pool is ``executor`` when given;
+    otherwise one is started when first needed with ``max_workers``
+    processes (default: one per CPU, and none on a single-CPU machine) and
+    shut down by :meth:`close`.
+    """
+
+    def __init__(self, executor=None, max_workers=None):
+        self._executor = executor
+        self._own_executor = None
+        self._max_workers = max_workers
+        self._total = 0
+
+    def submit(self, paths):
+        """Start parsing ``paths``; return futures of their ``ParsedMedia`` lists, one per chunk, in order."""
+        self._total += len(paths)
+        executor = self._pool()
+        if executor is None or not paths:
+            future = Future()
+            future.set_result(_analyze_chunk(paths))
+            return [future]
+        return [executor.submit(_analyze_chunk, chunk) for chunk in chunked(paths, ANALYZE_CHUNK_SIZE)]
+
+    def _pool(self):
+        if self._executor is not None:
+            return self._executor if self._total >= ANALYZE_PROCESS_THRESHOLD else None
+        if self._own_executor is None and _use_process_pool(self._total, self._max_workers):
+            self._own_executor = analysis_executor(self._max_workers)
+        return self._own_executor
+
+    def close(self):
+        """Shut down the pool this analyzer started, dropping work nobody waited for."""
+        if self._own_executor is not None:
+            self._own_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_chunk(paths):
+    return [analyze_path(path) for path in paths]
+
+
 def _series_index_sort_key(value):
     parsed = _parse_series_index_values(value)
     if parsed:
@@ -434,3 +732,126 @@ def _series_index_prefix(value):
         if left.isdigit():
             return left
     return None
+
+
+# Typing pauses this long before a search filter is applied, so a burst of
+# keystrokes filters the tree once.
+SEARCH_DEBOUNCE_MS = 150
+
+
+def _debounced_search_edit(parent, apply_search):
+    """Return a "Search titles" line edit that calls ``apply_search`` once typing pauses.
+
+    The timer is owned by ``parent``. Qt is imported here rather than at the
+    top: the command line imports this module without PyQt6.
+    """
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QLineEdit
+
+    edit = QLineEdit()
+    edit.setPlaceholderText("Search titles")
+    edit.setClearButtonEnabled(True)
+    timer = QTimer(parent)
+    timer.setSingleShot(True)
+    timer.setInterval(SEARCH_DEBOUNCE_MS)
+    timer.timeout.connect(apply_search)
+    edit.textChanged.connect(lambda _text: timer.start())
+    return edit
+
+
+def _filter_tree_items(roots, is_match):
+    """Hide leaves that fail ``is_match`` and groups left without visible rows.
+
+    ``is_match`` of ``None`` shows everything again. Visible groups are
+    expanded while filtering so the matches can be seen. Returns the number
+    of visible leaves.
+    """
+
+    def visit(node):
+        count = node.childCount()
+        if count == 0:
+            visible = is_match is None or is_match(node)
+            node.setHidden(not visible)
+            return 1 if visible else 0
+        matches = sum(visit(node.child(index)) for index in range(count))
+        node.setHidden(is_match is not None and matches == 0)
+        if is_match is not None and matches:
+            node.setExpanded(True)
+        return matches
+
+    return sum(visit(root) for root in roots)
+
+
+# Folder series titles that say nothing about the show; the import dialog
+# replaces them with the title most common below the folder.
+_GENERIC_SERIES_TITLES = frozenset({"tv", "tv show", "tv shows"})
+
+
+class _TitleTally:
+    """Series-title counts for one subtree: casefolded title -> [count, first position, title]."""
+
+    __slots__ = ("entries", "best")
+
+    def __init__(self):
+        self.entries = {}
+        self.best = None
+
+    def add(self, key, count, first, title):
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = [count, first, title]
+        else:
+            entry[0] += count
+            if first < entry[1]:
+                entry[1] = first
+                entry[2] = title
+        # Merging only raises counts and lowers first positions, so an entry
+        # never gets worse and the best one can be kept up as entries change.
+        best = self.best
+        if best is None or entry[0] > best[0] or (entry[0] == best[0] and entry[1] < best[1]):
+            self.best = entry
+
+    def merge(self, other):
+        for key, (count, first, title) in other.entries.items():
+            self.add(key, count, first, title)
+
+
+def _dominant_series_titles(roots):
+    """Return ``{folder: title}`` for the import folders whose series title is empty or generic.
+
+    Each of those folders gets the title most common among the nodes below
+    it, compared case-insensitively, with ties going to the title seen first
+    in tree order. Only the titles the nodes already have are counted. Nodes
+    need ``children``, ``is_folder`` and ``series_title``. The counts are
+    gathered in one bottom-up pass, merging each folder's smaller child
+    tallies into its largest one.
+    """
+    order = []
+    stack = list(reversed(roots))
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(reversed(node.children))
+    positions = {node: position for position, node in enumerate(order)}
+
+    tallies = {}
+    titles = {}
+    for node in reversed(order):
+        if not node.children:
+            continue
+        child_tallies = [tallies.pop(child) for child in node.children if child.children]
+        tally = max(child_tallies, key=lambda child_tally: len(child_tally.entries), default=None)
+        if tally is None:
+            tally = _TitleTally()
+        for child_tally in child_tallies:
+            if child_tally is not tally:
+                tally.merge(child_tally)
+        for child in node.children:
+            title = child.series_title.strip()
+            if title and title.lower() not in _GENERIC_SERIES_TITLES:
+                tally.add(title.casefold(), 1, positions[child], title)
+        current = node.series_title.strip()
+        if node.is_folder and tally.best is not None and (not current or current.lower() in _GENERIC_SERIES_TITLES):
+            titles[node] = tally.best[2]
+        tallies[node] = tally
+    return titles
@@ -37,7 +37,8 @@ from PyQt6.QtWidgets import (
 from app.core.library_db import LibraryDB
 from app.core.list_db import ListDB
 from app.core.people_db import PeopleDB
-from app.ui.library_utils import _series_index_sort_key
+from app.core.title_keys import title_key
+from app.ui.library_utils import _debounced_search_edit, _filter_tree_items, _series_index_sort_key
 
 NO_CHANGE = "__NO_CHANGE__"
 
@@ -83,7 +84,7 @@ class ListBulkAddDialog(QDialog):
         apply_row.addWidget(QLabel("Added by:"))
         self.apply_person = QComboBox()
         self.apply_person.addItem("", NO_CHANGE)
-        for person_id, name, _ in sorted(self.people, key=lambda p: (p[1] or "").lower()):
+        for person_id, name, _ in sorted(self.people, key=lambda p: (p.name or "").lower()):
             self.apply_person.addItem(name, person_id)
         apply_row.addWidget(self.apply_person)
 
@@ -124,7 +125,7 @@ class ListBulkAddDialog(QDialog):
     def _person_combo(self):
         combo = QComboBox()
         combo.addItem("", None)
-        for person_id, name, _ in sorted(self.people, key=lambda p: (p[1] or "").lower()):
+        for person_id, name, _ in sorted(self.people, key=lambda p: (p.name or "").lower()):
             combo.addItem(name, person_id)
         return combo
 
@@ -241,7 +242,7 @@ class ListEditDialog(QDialog):
         apply_row.addWidget(QLabel("Added by:"))
         self.apply_person = QComboBox()
         self.apply_person.addItem("", NO_CHANGE)
-        for person_id, name, _ in sorted(self.people, key=lambda p: (p[1] or "").lower()):
+        for person_id, name, _ in sorted(self.people, key=lambda p: (p.name or "").lower()):
             self.apply_person.addItem(name, person_id)
         apply_row.addWidget(self.apply_person)
 
@@ -285,7 +286,7 @@ class ListEditDialog(QDialog):
         return None
 
     def _fill(self):
-        people_sorted = sorted(self.people, key=lambda p: (p[1] or "").lower())
+        people_sorted = sorted(self.people, key=lambda p: (p.name or "").lower())
         for row, item in enumerate(self.rows):
             type_combo = QComboBox()
             type_combo.addItem("Movie", "Movie")
@@ -385,7 +386,7 @@ class LinkConfirmDialog(QDialog):
 class DoListSetupDialog(QDialog):
     def __init__(self, people, parent=None):
         super().__init__(parent)
-        self._people = sorted(people, key=lambda p: (p[1] or "").lower())
+        self._people = sorted(people, key=lambda p: (p.name or "").lower())
         self._results = []
         self.setWindowTitle("Who's making the list?")
         self._build_ui()
@@ -450,10 +451,10 @@ class DoListSetupDialog(QDialog):
                 Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsUserCheckable
             )
             include.setCheckState(Qt.CheckState.Checked)
-            include.setData(Qt.ItemDataRole.UserRole, {"person_id": person[0], "name": person[1]})
+            include.setData(Qt.ItemDataRole.UserRole, {"person_id": person.id, "name": person.name})
             self.table.setItem(row, 0, include)
 
-            name_item = QTableWidgetItem(person[1])
+            name_item = QTableWidgetItem(person.name)
             name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
             self.table.setItem(row, 1, name_item)
 
@@ -581,13 +582,13 @@ class LastPickerDialog(QDialog):
         self._last_group = QButtonGroup(self)
         self._last_group.setExclusive(True)
 
-        all_lookup = {person[0]: person[1] for person in all_people}
+        all_lookup = {person.id: person.name for person in all_people}
         for person in initial_people:
             self._add_row(person["person_id"], person["name"], person["order"], included=True, checked_last=False)
 
         self.add_combo = QComboBox()
         existing_ids = {row["person_id"] for row in self._rows}
-        for person_id, name, _ in sorted(all_people, key=lambda p: (p[1] or "").lower()):
+        for person_id, name, _ in sorted(all_people, key=lambda p: (p.name or "").lower()):
             if person_id not in existing_ids:
                 self.add_combo.addItem(name, person_id)
 
@@ -995,6 +996,9 @@ class ListMenu(QWidget):
         self.mode_status_label.hide()
         layout.addWidget(self.mode_status_label)
 
+        self.search_edit = _debounced_search_edit(self, self._apply_search)
+        layout.addWidget(self.search_edit)
+
         self.tree = QTreeWidget()
         self._row_height = 36
         self.tree.setColumnCount(6)
@@ -1215,7 +1219,7 @@ class ListMenu(QWidget):
                 if person["person_id"] == person_id:
                     person_name = person["name"]
                     break
-            picks.append({"id": row[0], "media_type": row[1], "title": row[2], "picked_by": person_name})
+            picks.append({"id": row.id, "media_type": row.media_type, "title": row.title, "picked_by": person_name})
         if not picks:
             QMessageBox.warning(self, "No Picks", "No titles were selected for this list.")
             self._finish_do_list()
@@ -1277,9 +1281,6 @@ class ListMenu(QWidget):
             is_placeholder=True,
         )
 
-    def _normalize_title(self, text):
-        return " ".join((text or "").strip().lower().split())
-
     def _title_sort_key(self, text):
         lowered = (text or "").strip().lower()
         for prefix in ("the ", "el ", "la "):
@@ -1287,37 +1288,24 @@ class ListMenu(QWidget):
                 return lowered[len(prefix):]
         return lowered
 
-    def _build_library_index(self, library_items):
-        index = {"Movie": defaultdict(set), "TV": defaultdict(set)}
-        for item in library_items:
-            media_type = item[2]
-            if media_type not in index or item[9]:
-                continue
-            keys = {self._normalize_title(item[3])}
-            if media_type == "Movie" and item[4] and item[5]:
-                keys.add(self._normalize_title(item[5]))
-            if media_type == "TV" and item[5]:
-                keys.add(self._normalize_title(item[5]))
-            for key in keys:
-                if key:
-                    index[media_type][key].add(item[1])
-        return index
-
     def _sorted_library_paths(self, paths):
         def key(path):
             item = self.library_items_by_path.get(path)
             if not item:
                 return (_series_index_sort_key(""), path.lower())
-            idx = item[6] or ""
-            title = item[3] or ""
+            idx = item.show_title or ""
+            title = item.display_title or ""
             return (_series_index_sort_key(idx), title.lower()) if idx else ((0, 0), title.lower())
 
         return sorted(paths, key=key)
 
-    def _match_info(self, row, library_index):
-        key = self._normalize_title(row[2])
-        paths = self._sorted_library_paths(list(library_index.get(row[1], {}).get(key, set())))
-        return {"paths": paths, "unwatched": [p for p in paths if self.library_items_by_path.get(p, [0] * 12)[8] == 0]}
+    def _match_info(self, row, library_matches):
+        paths = self._sorted_library_paths([record.path for record in library_matches.get(row.id, ())])
+        return {"paths": paths, "unwatched": [p for p in paths if self._is_library_path_unwatched(p)]}
+
+    def _is_library_path_unwatched(self, path):
+        item = self.library_items_by_path.get(path)
+        return item is None or item.watched == 0
 
     def _format_added_on(self, text):
         for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"):
@@ -1402,7 +1390,7 @@ class ListMenu(QWidget):
     def _sync_do_list_state_to_items(self, items):
         if not self._do_list_state:
             return
-        valid_ids = {row[0] for row in items}
+        valid_ids = {row.id for row in items}
         picked_by_item_id = self._do_list_state.get("picked_by_item_id", {})
         removed_ids = [item_id for item_id in picked_by_item_id if item_id not in valid_ids]
         for item_id in removed_ids:
@@ -1414,10 +1402,11 @@ class ListMenu(QWidget):
         self.tree.clear()
         items = self.db.get_items()
         self._sync_do_list_state_to_items(items)
-        self.items_by_id = {row[0]: row for row in items}
-        library_items = self.library_db.get_items()
-        self.library_items_by_path = {row[1]: row for row in library_items}
-        library_index = self._build_library_index(library_items)
+        self.items_by_id = {row.id: row for row in items}
+        library_matches = self.library_db.get_list_matches()
+        self.library_items_by_path = {
+            record.path: record for records in library_matches.values() for record in records
+        }
         self.link_info_by_id = {}
 
         movies_root = QTreeWidgetItem(["", "Movies", "", "", "", ""])
@@ -1431,9 +1420,9 @@ class ListMenu(QWidget):
         movies_root.setExpanded(False)
         tv_root.setExpanded(False)
 
-        for row in sorted(items, key=lambda r: (r[1], self._title_sort_key(r[2]))):
+        for row in sorted(items, key=lambda r: (r.media_type, self._title_sort_key(r.title))):
             item_id, media_type, title, _person_id, person_name, added_at, linked = row
-            info = self._match_info(row, library_index)
+            info = self._match_info(row, library_matches)
             self.link_info_by_id[item_id] = info
             notes = "In Library" if info["paths"] and linked else "Match Found" if info["paths"] else "Link Missing" if linked else ""
             picker_name = self._participant_name_for_item(item_id)
@@ -1457,6 +1446,22 @@ class ListMenu(QWidget):
                 else:
                     self._set_link_widget(node, item_id)
         self._refresh_do_list_banner()
+        if self.search_edit.text().strip():
+            self._apply_search()
+        self._auto_resize_columns()
+
+    def _apply_search(self):
+        text = self.search_edit.text().strip()
+        is_match = None
+        if text:
+            matching_ids = set(self.db.search_ids(text))
+
+            def is_match(node):
+                data = node.data(1, Qt.ItemDataRole.UserRole)
+                return bool(data) and data.get("id") in matching_ids
+
+        roots = [self.tree.topLevelItem(index) for index in range(self.tree.topLevelItemCount())]
+        _filter_tree_items(roots, is_match)
         self._auto_resize_columns()
 
     def _set_pick_widget(self, item, item_id):
@@ -1549,9 +1554,9 @@ class ListMenu(QWidget):
             if not row:
                 continue
             if media_type == "TV":
-                title = row[5] or row[3]
+                title = row.series_title or row.display_title
             else:
-                title = row[3]
+                title = row.display_title
             if title:
                 titles.append(title)
         unique = self._dedupe(titles)
@@ -1564,14 +1569,14 @@ class ListMenu(QWidget):
         for item_id in self._dedupe(item_ids):
             row = self.items_by_id.get(item_id)
             info = self.link_info_by_id.get(item_id)
-            if not row or not info or row[6] or not info["paths"]:
+            if not row or not info or row.library_linked or not info["paths"]:
                 continue
             candidates.append(
                 {
                     "id": item_id,
-                    "media_type": row[1],
-                    "list_title": row[2],
-                    "library_title": self._library_title_for_paths(info["paths"], row[1]) or "(Unknown)",
+                    "media_type": row.media_type,
+                    "list_title": row.title,
+                    "library_title": self._library_title_for_paths(info["paths"], row.media_type) or "(Unknown)",
                 }
             )
         if not candidates:
@@ -1629,12 +1634,12 @@ class ListMenu(QWidget):
             if row:
                 rows.append(
                     {
-                        "id": row[0],
-                        "media_type": row[1],
-                        "title": row[2],
-                        "added_by_person_id": row[3],
-                        "added_at": row[5],
-                        "library_linked": bool(row[6]),
+                        "id": row.id,
+                        "media_type": row.media_type,
+                        "title": row.title,
+                        "added_by_person_id": row.added_by_person_id,
+                        "added_at": row.added_at,
+                        "library_linked": bool(row.library_linked),
                     }
                 )
         if not rows:
@@ -1652,10 +1657,10 @@ class ListMenu(QWidget):
             if not old:
                 item["library_linked"] = 0
                 continue
-            if old[1] != item["media_type"] or self._normalize_title(old[2]) != self._normalize_title(item["title"]):
+            if old.media_type != item["media_type"] or title_key(old.title) != title_key(item["title"]):
                 item["library_linked"] = 0
             else:
-                item["library_linked"] = bool(old[6])
+                item["library_linked"] = bool(old.library_linked)
         self.db.update_items(results)
         self.load_items()
         self._prompt_links([item["id"] for item in results], allow_batch=True)
@@ -1690,7 +1695,7 @@ class ListMenu(QWidget):
         for item_id in self._dedupe(item_ids):
             row = self.items_by_id.get(item_id)
             info = self.link_info_by_id.get(item_id, {})
-            if not row or not row[6]:
+            if not row or not row.library_linked:
                 continue
             paths.extend(info.get("unwatched", []) if resume else info.get("paths", []))
         paths = self._sorted_library_paths(self._dedupe(paths))
@@ -60,10 +60,12 @@ class PeopleMenu(QWidget):
         for person in people:
             row_position = self.table.rowCount()
             self.table.insertRow(row_position)
-            id_item = QTableWidgetItem(str(person[0]))
-            name_item = QTableWidgetItem(person[1])
-            birthday_item = QTableWidgetItem(person[2] if person[2] else "")
-            final_pick_item = QTableWidgetItem(str(person[3] if person[3] is not None else 0))
+            id_item = QTableWidgetItem(str(person.id))
+            name_item = QTableWidgetItem(person.name)
+            birthday_item = QTableWidgetItem(person.birthday if person.birthday else "")
+            final_pick_item = QTableWidgetItem(
+                str(person.list_last_pick_count if person.list_last_pick_count is not None else 0)
+            )
             self.table.setItem(row_position, 0, id_item)
             self.table.setItem(row_position, 1, name_item)
             self.table.setItem(row_position, 2, birthday_item)
@@ -0,0 +1,64 @@
+"""Wall time for analyze_paths over a large import, in process and on 1..N worker processes.
+
+Pool start-up is timed separately; the pool is warmed up before the
+timed run, the way an import reuses one pool for all of its batches.
+
+Run from the repository root:
+
+    python benchmarks/bench_analyze_paths.py [--files 200000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui import library_utils  # noqa: E402
+from app.ui.library_utils import _analyze_chunk, analysis_executor, analyze_paths  # noqa: E402
+from benchmarks.bench_name_parsing import release_names  # noqa: E402
+
+
+def _clear_caches():
+    for cached in (
+        library_utils._clean_series_title,
+        library_utils._normalize_title_word,
+        library_utils._parse_media_name,
+        library_utils._season_number_from_name,
+    ):
+        cached.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    paths = release_names(args.files)
+    print(f"{len(paths)} paths, {os.cpu_count()} CPUs")
+    print(f"{'workers':>9} {'start ms':>9} {'ms':>9} {'speedup':>8}")
+
+    _clear_caches()
+    start = time.perf_counter()
+    _analyze_chunk(paths)
+    baseline = time.perf_counter() - start
+    print(f"{'in-proc':>9} {'':>9} {baseline * 1000:>9.1f} {1.0:>8.2f}")
+
+    for workers in args.workers:
+        start = time.perf_counter()
+        executor = analysis_executor(workers)
+        list(executor.map(_analyze_chunk, [[paths[0]]] * workers))
+        started = time.perf_counter() - start
+        try:
+            start = time.perf_counter()
+            analyze_paths(paths, executor=executor)
+            elapsed = time.perf_counter() - start
+        finally:
+            executor.shutdown()
+        print(f"{workers:>9} {started * 1000:>9.1f} {elapsed * 1000:>9.1f} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
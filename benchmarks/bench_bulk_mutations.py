@@ -0,0 +1,92 @@
+"""Mark-watched cost for 1k/10k/100k paths: one IN list, staged temp table, chunked update_watched.
+
+Run from the repository root:
+
+    python benchmarks/bench_bulk_mutations.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+
+
+# The raw strategies bind item ids, which is what update_watched ends up
+# binding once it has resolved the paths through the directories table.
+def single_in_list(db, items):
+    placeholders = ",".join("?" for _ in items)
+    db.conn.execute(
+        f"UPDATE library_items SET watched = ? WHERE id IN ({placeholders})", (1, *(item.id for item in items))
+    )
+    db.conn.commit()
+
+
+def staged_temp_table(db, items):
+    with db.conn:
+        db.conn.execute("CREATE TEMP TABLE IF NOT EXISTS bench_keys (key PRIMARY KEY) WITHOUT ROWID")
+        db.conn.executemany("INSERT OR IGNORE INTO temp.bench_keys (key) VALUES (?)", ((item.id,) for item in items))
+        db.conn.execute("UPDATE library_items SET watched = 1 WHERE id IN (SELECT key FROM temp.bench_keys)")
+        db.conn.execute("DELETE FROM temp.bench_keys")
+
+
+def update_watched(db, items):
+    db.update_watched([item.path for item in items], True)
+
+
+STRATEGIES = {
+    "single IN": single_in_list,
+    "staged keys": staged_temp_table,
+    "update_watched": update_watched,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "bulk.db")
+        db = LibraryDB(db_path=db_path)
+        largest = max(args.sizes)
+        db.add_items(
+            {
+                "path": f"\\\\nas\\media\\TV Shows\\Show {i // 500}\\Season 1\\Episode {i}.mkv",
+                "media_type": "TV",
+                "display_title": f"Episode {i}",
+                "is_series": True,
+                "series_title": f"Show {i // 500}",
+            }
+            for i in range(largest)
+        )
+        all_items = db.get_items()
+
+        print(f"{'paths':>8} " + " ".join(f"{name:>16}" for name in STRATEGIES))
+        for size in args.sizes:
+            items = all_items[:size]
+            cells = []
+            for strategy in STRATEGIES.values():
+                db.conn.execute("UPDATE library_items SET watched = 0")
+                db.conn.commit()
+                start = time.perf_counter()
+                try:
+                    strategy(db, items)
+                except sqlite3.OperationalError as exc:
+                    db.conn.rollback()
+                    cells.append(f"{'fails: ' + str(exc)[:8]:>16}")
+                    continue
+                cells.append(f"{(time.perf_counter() - start) * 1000:>13.1f} ms")
+            print(f"{size:>8} " + " ".join(cells))
+        db.close()
+        close_session(db_path)
+
+
+if __name__ == "__main__":
+    main()
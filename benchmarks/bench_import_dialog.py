@@ -0,0 +1,99 @@
+"""Wall time and memory to fill LibraryImportDialog with --rows synthetic import rows, and to scroll it.
+
+The scan is replaced by a generator of ready-made rows (shows / seasons /
+episodes), so the numbers cover the dialog alone: inserting the rows,
+sorting and sizing them once the scan ends, then repainting the view at
+--scroll-steps positions from top to bottom. Uses the offscreen Qt
+platform unless QT_QPA_PLATFORM is set.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_dialog.py [--rows 100000] [--scroll-steps 50]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from app.ui import library_menu  # noqa: E402
+from app.ui.library_scanner import ImportRow  # noqa: E402
+
+EPISODES_PER_SEASON = 20
+SEASONS_PER_SHOW = 5
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _rss_mb():
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _rows(count):
+    root = os.path.join("media", "TV Shows")
+    rows = [ImportRow(root, None, True, "TV", "TV Shows", "", None)]
+    show = 0
+    while len(rows) < count:
+        show_dir = os.path.join(root, f"Show {show}")
+        rows.append(ImportRow(show_dir, root, True, "TV", f"Show {show}", "", None))
+        for season in range(1, SEASONS_PER_SHOW + 1):
+            season_dir = os.path.join(show_dir, f"Season {season}")
+            rows.append(ImportRow(season_dir, show_dir, True, "TV", f"Show {show}", str(season), None))
+            for episode in range(1, EPISODES_PER_SEASON + 1):
+                code = f"S{season:02d}E{episode:02d}"
+                path = os.path.join(season_dir, f"Show {show} {code}.mkv")
+                rows.append(
+                    ImportRow(path, season_dir, False, "TV", f"Show {show}", f"{season}.{episode}", f"{code} - Episode")
+                )
+        show += 1
+    return rows[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--scroll-steps", type=int, default=50)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    rows = _rows(args.rows)
+    rss_before = _rss_mb()
+
+    start = time.perf_counter()
+    with mock.patch.object(library_menu, "iter_import_rows", lambda _paths, **_kwargs: iter(rows)):
+        dialog = library_menu.LibraryImportDialog(["media"])
+        while dialog._scan_worker is not None:
+            app.processEvents()
+            time.sleep(0.001)
+    dialog.show()
+    app.processEvents()
+    fill_time = time.perf_counter() - start
+
+    scroll_bar = dialog.tree.verticalScrollBar()
+    start = time.perf_counter()
+    for step in range(args.scroll_steps):
+        scroll_bar.setValue(scroll_bar.maximum() * step // max(args.scroll_steps - 1, 1))
+        dialog.tree.viewport().repaint()
+    scroll_time = time.perf_counter() - start
+
+    print(f"{len(rows)} rows, {len(dialog.get_results())} files")
+    print(f"open and fill: {fill_time * 1000:.0f} ms")
+    print(f"scroll: {scroll_time * 1000 / args.scroll_steps:.1f} ms per repaint")
+    print(f"peak RSS growth: {_rss_mb() - rss_before:.0f} MB")
+    dialog.reject()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Directory listings and wall time to scan an import selection: two os.walk passes vs. iter_import_rows.
+
+The two-pass walk is what LibraryImportDialog.build_tree did before the
+scanner: one os.walk to find season folders, a second to build the tree.
+
+Run from the repository root:
+
+    python benchmarks/bench_import_scan.py [--files 10000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui.library_scanner import iter_import_rows, list_directory  # noqa: E402
+from app.ui.library_utils import (  # noqa: E402
+    _import_dir_sort_key,
+    _import_file_sort_key,
+    _is_video_file,
+    _season_number_from_name,
+)
+
+EPISODES_PER_SEASON = 10
+SEASONS_PER_SHOW = 5
+
+
+def _build_tree(root, files):
+    shows = max(files // (EPISODES_PER_SEASON * SEASONS_PER_SHOW), 1)
+    for show in range(shows):
+        for season in range(1, SEASONS_PER_SHOW + 1):
+            season_dir = os.path.join(root, "TV Shows", f"Show {show}", f"Season {season}")
+            os.makedirs(season_dir)
+            for episode in range(1, EPISODES_PER_SEASON + 1):
+                open(os.path.join(season_dir, f"Show {show} S{season:02d}E{episode:02d}.mkv"), "w").close()
+
+
+def two_pass_walk(root):
+    show_has_seasons = {}
+    for dirpath, dirnames, _filenames in os.walk(root):
+        for dirname in dirnames:
+            if _season_number_from_name(dirname) is not None:
+                show_has_seasons[dirpath] = True
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort(key=_import_dir_sort_key)
+        paths = sorted((os.path.join(dirpath, name) for name in filenames), key=_import_file_sort_key)
+        files.extend(path for path in paths if _is_video_file(path))
+    return files
+
+
+def _count_listings(action):
+    calls = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path="."):
+        calls.append(path)
+        return real_scandir(path)
+
+    with mock.patch("os.scandir", counting_scandir):
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+    return len(calls), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        _build_tree(directory, args.files)
+        root = os.path.join(directory, "TV Shows")
+        print(f"{args.files} files under {root}")
+        print(f"{'scanner':<16} {'listings':>9} {'ms':>8}")
+        for name, action in (
+            ("two os.walk", lambda: two_pass_walk(root)),
+            ("iter_import_rows", lambda: list(iter_import_rows([root], list_directory))),
+        ):
+            listings, elapsed = _count_listings(action)
+            print(f"{name:<16} {listings:>9} {elapsed * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""List <-> Library link matching: Python title index vs. the title_key join.
+
+The Python side mirrors what ListMenu.load_items did before title keys were
+stored: read every library row and normalize its titles into a dict.
+
+Run from the repository root:
+
+    python benchmarks/bench_list_links.py [--library 50000] [--list 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+from app.core.list_db import ListDB  # noqa: E402
+
+
+def _normalize(text):
+    return " ".join((text or "").strip().lower().split())
+
+
+def python_index(library_db, list_db):
+    index = {"Movie": defaultdict(set), "TV": defaultdict(set)}
+    for item in library_db.get_items():
+        if item.media_type not in index or item.is_placeholder:
+            continue
+        keys = {_normalize(item.display_title)}
+        if item.series_title and (item.media_type == "TV" or item.is_series):
+            keys.add(_normalize(item.series_title))
+        for key in keys:
+            if key:
+                index[item.media_type][key].add(item.path)
+    return {
+        row.id: index.get(row.media_type, {}).get(_normalize(row.title), set())
+        for row in list_db.get_items()
+    }
+
+
+def sql_join(library_db, _list_db):
+    return library_db.get_list_matches()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--library", type=int, default=50000)
+    parser.add_argument("--list", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "links.db")
+        library_db = LibraryDB(db_path=db_path)
+        list_db = ListDB(db_path=db_path)
+        shows = max(args.library // 50, 1)
+        library_db.add_items(
+            {
+                "path": f"C:/tv/Show {i % shows}/Episode {i}.mkv",
+                "media_type": "TV",
+                "display_title": f"Episode {i}",
+                "is_series": True,
+                "series_title": f"Show {i % shows}",
+            }
+            for i in range(args.library)
+        )
+        for i in range(args.list):
+            list_db.add_item("TV", f"show {i * 7}")
+
+        print(f"{args.library} library items, {args.list} list entries")
+        for name, strategy in (("python index", python_index), ("title_key join", sql_join)):
+            start = time.perf_counter()
+            for _ in range(5):
+                strategy(library_db, list_db)
+            print(f"{name:<16} {(time.perf_counter() - start) / 5 * 1000:>8.1f} ms")
+        library_db.close()
+        list_db.close()
+        close_session(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Time to parse release-style file names for an import, with and without the name caches.
+
+Each file goes through what the import scan asks of it: the file sort key,
+the row defaults and the episode title. "uncached" swaps the memoized
+parsers in library_utils for the functions they wrap.
+
+Run from the repository root:
+
+    python benchmarks/bench_name_parsing.py [--files 20000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from unittest import mock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui import library_scanner, library_utils  # noqa: E402
+from app.ui.library_scanner import import_row  # noqa: E402
+from app.ui.library_utils import _import_file_sort_key, analyze_path  # noqa: E402
+
+_CACHED = {
+    name: getattr(library_utils, name)
+    for name in ("_clean_series_title", "_parse_media_name", "_season_number_from_name")
+}
+
+_SHOWS = (
+    "The Expanse",
+    "Better Call Saul",
+    "Doctor Who (2005)",
+    "Star Trek Strange New Worlds",
+    "What We Do in the Shadows",
+    "the.office.us",
+    "Severance",
+    "Shogun 2024",
+)
+_TITLES = (
+    "Pilot",
+    "the head and the hair",
+    "Jack-Tor",
+    "Pilot vs. Captain",
+    "A Change of Heart",
+    "Part II",
+    "",
+)
+_TAILS = (
+    "1080p.WEB-DL.DDP5.1.H.264-NTb",
+    "2160p.AMZN.WEB-DL.DV.HDR.DDP5.1.Atmos.H.265",
+    "720p.BluRay.x264 [eztv]",
+    "ITA ENG 1080p",
+    "REPACK.1080p.NF.WEBRip",
+)
+
+
+def release_names(count, seed=0):
+    """Return ``count`` episode and movie paths named like typical releases."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        show = rng.choice(_SHOWS)
+        season = rng.randint(1, 12)
+        episode = rng.randint(1, 24)
+        title = rng.choice(_TITLES)
+        style = i % 4
+        if style == 0:
+            name = f"{show} - S{season:02d}E{episode:02d} - {title or 'Untitled'} (1080p BluRay x265).mkv"
+        elif style == 1:
+            dotted = show.replace(" ", ".")
+            name = f"{dotted}.S{season:02d}E{episode:02d}.{title.replace(' ', '.')}.{rng.choice(_TAILS)}.mkv"
+        elif style == 2:
+            name = f"{show} S{season:02d}E{episode:02d}-E{episode + 1:02d} {title} {rng.choice(_TAILS)}.mp4"
+        else:
+            name = f"{show} ({rng.randint(1970, 2024)}) {rng.choice(_TAILS)}.mkv"
+        paths.append(os.path.join("media", "TV Shows", show, f"Season {season}", name))
+    return paths
+
+
+def _import_pass(paths):
+    for path in sorted(paths, key=_import_file_sort_key):
+        parsed = library_utils._extract_tv_episode_parts(path)
+        import_row(analyze_path(path), os.path.dirname(path), False, parsed["series_index"] if parsed else "")
+
+
+def _clear_caches():
+    for cached in _CACHED.values():
+        cached.cache_clear()
+
+
+def _best_of(repeat, action):
+    best = None
+    for _ in range(repeat):
+        _clear_caches()
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _uncached():
+    patches = []
+    for name, cached in _CACHED.items():
+        original = cached.__wrapped__
+        patches.append(mock.patch.object(library_utils, name, original))
+        if hasattr(library_scanner, name):
+            patches.append(mock.patch.object(library_scanner, name, original))
+    return patches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = release_names(args.files)
+    print(f"{args.files} release-style names, best of {args.repeat}")
+    print(f"{'parsers':<10} {'ms':>9} {'us/file':>9}")
+    patches = _uncached()
+    for patch in patches:
+        patch.start()
+    try:
+        uncached = _best_of(args.repeat, lambda: _import_pass(paths))
+    finally:
+        for patch in patches:
+            patch.stop()
+    cached = _best_of(args.repeat, lambda: _import_pass(paths))
+    for name, elapsed in (("uncached", uncached), ("cached", cached)):
+        print(f"{name:<10} {elapsed * 1000:>9.1f} {elapsed / args.files * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
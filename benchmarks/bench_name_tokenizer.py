@@ -0,0 +1,56 @@
+"""Names per second through the file name tokenizer and parser, without caching.
+
+Run from the repository root:
+
+    python benchmarks/bench_name_tokenizer.py [--names 100000] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui.library_utils import (  # noqa: E402
+    _clean_series_title,
+    _normalize_title_word,
+    _parse_media_name,
+    _tokenize_media_name,
+)
+from benchmarks.bench_name_parsing import release_names  # noqa: E402
+
+
+def _best_of(repeat, action, names):
+    best = None
+    for _ in range(repeat):
+        _clean_series_title.cache_clear()
+        _normalize_title_word.cache_clear()
+        start = time.perf_counter()
+        for name in names:
+            action(name)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = [os.path.splitext(os.path.basename(path))[0] for path in release_names(args.names)]
+    parsed = sum(_parse_media_name.__wrapped__(name) is not None for name in names)
+    print(f"{len(names)} release-style names, {parsed} with an episode code, best of {args.repeat}")
+    print(f"{'stage':<10} {'ms':>9} {'names/s':>10}")
+    for stage, action in (
+        ("tokenize", _tokenize_media_name),
+        ("parse", _parse_media_name.__wrapped__),
+    ):
+        elapsed = _best_of(args.repeat, action, names)
+        print(f"{stage:<10} {elapsed * 1000:>9.1f} {len(names) / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Wall time to scan an import selection on a high-latency share, by scan worker count.
+
+Every directory listing sleeps for --latency milliseconds first, standing in
+for the round trip to a network mount.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel_scan.py [--shows 40] [--latency 5] [--workers 1 2 4 8 16]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui.library_scanner import iter_import_rows, list_directory  # noqa: E402
+
+SEASONS_PER_SHOW = 5
+EPISODES_PER_SEASON = 10
+
+
+def _build_tree(root, shows):
+    for show in range(shows):
+        for season in range(1, SEASONS_PER_SHOW + 1):
+            season_dir = os.path.join(root, f"Show {show}", f"Season {season}")
+            os.makedirs(season_dir)
+            for episode in range(1, EPISODES_PER_SEASON + 1):
+                open(os.path.join(season_dir, f"Show {show} S{season:02d}E{episode:02d}.mkv"), "w").close()
+
+
+def _slow_list_dir(latency):
+    def list_dir(path):
+        time.sleep(latency)
+        return list_directory(path)
+
+    return list_dir
+
+
+def _timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shows", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=5.0, help="milliseconds per listing")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    list_dir = _slow_list_dir(args.latency / 1000)
+    with tempfile.TemporaryDirectory() as root:
+        _build_tree(root, args.shows)
+        listings = 1 + args.shows * (1 + SEASONS_PER_SHOW)
+        print(f"{listings} directories, {args.latency:g} ms per listing")
+        print(f"{'workers':>7} {'import rows ms':>15}")
+        for workers in args.workers:
+            rows_time = _timed(lambda: list(iter_import_rows([root], list_dir, max_workers=workers)))
+            print(f"{workers:>7} {rows_time * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Storage and path-lookup cost of library_items with and without the directories table.
+
+Compares the previous layout (full path TEXT UNIQUE on every row) against
+the current one (dir_id + name), on a deep synthetic TV library. Only the
+pages that hold paths are counted, read from dbstat: library_items and its
+unique key, plus directories and its key for the current layout. The
+search table, title-key indexes and change-log triggers of the current
+schema are left out of both sides. The lookup time is resolving the
+selection's paths to item ids, the step every path-keyed update starts
+with; the legacy rows carry the same title-key columns so both tables hold
+the same data.
+
+Run from the repository root:
+
+    python benchmarks/bench_path_storage.py [--shows 300] [--seasons 8] [--episodes 20]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.bulk import fetch_for_keys  # noqa: E402
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+from app.core.title_keys import title_key  # noqa: E402
+
+ROOT = "D:/Media Library/Television/Drama and Comedy Series"
+
+
+def _paths(shows, seasons, episodes):
+    return [
+        f"{ROOT}/Show Number {show}/Season {season:02d}/Show Number {show} - S{season:02d}E{episode:02d} - "
+        f"Episode Title {episode} [1080p WEB-DL].mkv"
+        for show in range(shows)
+        for season in range(1, seasons + 1)
+        for episode in range(1, episodes + 1)
+    ]
+
+
+def _items(paths):
+    return [
+        {
+            "path": path,
+            "media_type": "TV",
+            "display_title": path.rsplit("/", 1)[1],
+            "is_series": True,
+            "series_title": path.split("/")[3],
+            "show_title": "1.1",
+        }
+        for path in paths
+    ]
+
+
+def _path_storage(conn, tables):
+    """Bytes of the pages of ``tables`` and their automatic (unique key) indexes."""
+    conn.execute("VACUUM")
+    names = [*tables, *(f"sqlite_autoindex_{table}_1" for table in tables)]
+    placeholders = ",".join("?" for _ in names)
+    return conn.execute(f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({placeholders})", names).fetchone()[0]
+
+
+def _legacy(db_path, items):
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        """
+        CREATE TABLE library_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL UNIQUE,
+            media_type TEXT NOT NULL,
+            display_title TEXT NOT NULL,
+            is_series INTEGER DEFAULT 0,
+            series_title TEXT,
+            show_title TEXT,
+            added_at TEXT NOT NULL,
+            watched INTEGER DEFAULT 0,
+            is_placeholder INTEGER DEFAULT 0,
+            air_datetime TEXT,
+            currently_airing INTEGER DEFAULT 0,
+            title_key TEXT,
+            series_key TEXT
+        )
+        """
+    )
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO library_items
+            (path, media_type, display_title, is_series, series_title, show_title, added_at, title_key, series_key)
+            VALUES (?, ?, ?, 1, ?, ?, 'now', ?, ?)
+            """,
+            [
+                (
+                    item["path"],
+                    item["media_type"],
+                    item["display_title"],
+                    item["series_title"],
+                    item["show_title"],
+                    title_key(item["display_title"]),
+                    title_key(item["series_title"]),
+                )
+                for item in items
+            ],
+        )
+    return conn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shows", type=int, default=300)
+    parser.add_argument("--seasons", type=int, default=8)
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+
+    paths = _paths(args.shows, args.seasons, args.episodes)
+    items = _items(paths)
+    sample = random.Random(0).sample(paths, min(args.lookups, len(paths)))
+
+    with tempfile.TemporaryDirectory() as directory:
+        legacy_path = os.path.join(directory, "legacy.db")
+        conn = _legacy(legacy_path, items)
+        start = time.perf_counter()
+        legacy_ids = fetch_for_keys(conn, "SELECT path, id FROM library_items WHERE path IN ({keys})", sample)
+        legacy_lookup_s = time.perf_counter() - start
+        legacy_size = _path_storage(conn, ["library_items"])
+        conn.close()
+
+        current_path = os.path.join(directory, "current.db")
+        db = LibraryDB(db_path=current_path)
+        db.add_items(items)
+        start = time.perf_counter()
+        current_ids = db._item_ids(sample)
+        current_lookup_s = time.perf_counter() - start
+        current_size = _path_storage(db.conn, ["library_items", "directories"])
+        db.close()
+        close_session(current_path)
+
+    assert len(legacy_ids) == len(current_ids) == len(sample)
+    print(f"{len(paths)} items, {len(sample)} paths resolved to ids")
+    print(f"{'layout':<24} {'path KiB':>10} {'bytes/item':>11} {'lookup ms':>10}")
+    print(
+        f"{'path TEXT UNIQUE':<24} {legacy_size / 1024:>10.0f} {legacy_size / len(paths):>11.1f} "
+        f"{legacy_lookup_s * 1000:>10.1f}"
+    )
+    print(
+        f"{'dir_id + name':<24} {current_size / 1024:>10.0f} {current_size / len(paths):>11.1f} "
+        f"{current_lookup_s * 1000:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
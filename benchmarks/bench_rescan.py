@@ -0,0 +1,109 @@
+"""Filesystem calls and wall time to rescan a library root, against a full import walk.
+
+Builds a tree of --files empty episode files, imports it into a scratch
+database, then rescans it unchanged and again after adding one episode.
+
+Run from the repository root:
+
+    python benchmarks/bench_rescan.py [--files 50000] [--episodes-per-season 25]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+from app.ui.library_scanner import directory_mtime, iter_import_rows, list_directory, rescan_root  # noqa: E402
+
+SEASONS_PER_SHOW = 4
+
+
+def _build_tree(root, files, episodes_per_season):
+    seasons = max(1, files // episodes_per_season)
+    for index in range(seasons):
+        show, season = divmod(index, SEASONS_PER_SHOW)
+        season_dir = os.path.join(root, f"Show {show}", f"Season {season + 1}")
+        os.makedirs(season_dir)
+        for episode in range(1, episodes_per_season + 1):
+            open(os.path.join(season_dir, f"Show {show} S{season + 1:02d}E{episode:02d}.mkv"), "w").close()
+    # Age every directory past the settle window so the manifest is trusted.
+    old = time.time() - 3600
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        os.utime(dirpath, (old, old))
+
+
+class _Counter:
+    def __init__(self):
+        self.stats = 0
+        self.listings = 0
+
+    def stat_dir(self, path):
+        self.stats += 1
+        return directory_mtime(path)
+
+    def list_dir(self, path):
+        self.listings += 1
+        return list_directory(path)
+
+
+def _rescan(db, root):
+    counter = _Counter()
+    start = time.perf_counter()
+    result = rescan_root(root, db.get_manifest(root), db.get_directory_files, counter.list_dir, counter.stat_dir)
+    elapsed = time.perf_counter() - start
+    return result, counter, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--episodes-per-season", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "TV")
+        os.makedirs(root)
+        _build_tree(root, args.files, args.episodes_per_season)
+        db_path = os.path.join(tmp, "bench.db")
+        db = LibraryDB(db_path)
+        try:
+            counter = _Counter()
+            manifest = {}
+            start = time.perf_counter()
+            rows = list(iter_import_rows([root], counter.list_dir, manifest=manifest, stat_dir=counter.stat_dir))
+            walk_time = time.perf_counter() - start
+            db.add_items(
+                {"path": row.path, "media_type": row.media_type, "display_title": row.display_title}
+                for row in rows
+                if not row.is_folder
+            )
+            db.save_manifest(root, manifest[root])
+            files = sum(1 for row in rows if not row.is_folder)
+            print(f"{files} files in {len(manifest[root])} directories")
+            print(f"{'pass':<18} {'stats':>7} {'listings':>9} {'ms':>9} {'new':>5}")
+            print(f"{'import walk':<18} {counter.stats:>7} {counter.listings:>9} {walk_time * 1000:>9.1f} {'':>5}")
+
+            result, counter, elapsed = _rescan(db, root)
+            print(
+                f"{'rescan unchanged':<18} {counter.stats:>7} {counter.listings:>9} {elapsed * 1000:>9.1f} "
+                f"{len(result.new):>5}"
+            )
+
+            open(os.path.join(root, "Show 0", "Season 1", "Show 0 S01E99.mkv"), "w").close()
+            result, counter, elapsed = _rescan(db, root)
+            print(
+                f"{'rescan one new':<18} {counter.stats:>7} {counter.listings:>9} {elapsed * 1000:>9.1f} "
+                f"{len(result.new):>5}"
+            )
+        finally:
+            db.close()
+            close_session(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Memory and access cost of LibraryDB rows as records vs. other row shapes.
+
+Run from the repository root:
+
+    python benchmarks/bench_row_records.py [--rows 100000]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+from app.core.records import LibraryItem, row_factory  # noqa: E402
+
+
+def _dict_factory(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+FACTORIES = {
+    "tuple": None,
+    "LibraryItem": row_factory(LibraryItem),
+    "sqlite3.Row": sqlite3.Row,
+    "dict": _dict_factory,
+}
+
+
+def _fetch(conn, factory):
+    cursor = conn.cursor()
+    cursor.row_factory = factory
+    cursor.execute(
+        """
+        SELECT li.id, d.path || li.name, li.media_type, li.display_title, li.is_series, li.series_title,
+               li.show_title, li.added_at, li.watched, li.is_placeholder, li.air_datetime, li.currently_airing
+        FROM library_items li JOIN directories d ON d.id = li.dir_id
+        """
+    )
+    return cursor.fetchall()
+
+
+def _measure(conn, name, factory):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = _fetch(conn, factory)
+    fetch_s = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if name == "tuple":
+        def watched(row):
+            return row[8]
+    elif name == "LibraryItem":
+        def watched(row):
+            return row.watched
+    else:
+        def watched(row):
+            return row["watched"]
+
+    start = time.perf_counter()
+    for _ in range(5):
+        for row in rows:
+            watched(row)
+    access_s = (time.perf_counter() - start) / 5
+    return len(rows), current, fetch_s, access_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "records.db")
+        db = LibraryDB(db_path=db_path)
+        db.add_items(
+            {
+                "path": f"C:/media/tv/Show {i // 100}/Season 1/Episode {i}.mkv",
+                "media_type": "TV",
+                "display_title": f"Episode {i}",
+                "is_series": True,
+                "series_title": f"Show {i // 100}",
+                "show_title": f"1.{i % 100 + 1}",
+            }
+            for i in range(args.rows)
+        )
+        print(f"{'row type':<12} {'bytes/row':>10} {'fetch ms':>10} {'field read ns/row':>18}")
+        for name, factory in FACTORIES.items():
+            count, size, fetch_s, access_s = _measure(db.conn, name, factory)
+            print(
+                f"{name:<12} {size / count:>10.1f} {fetch_s * 1000:>10.1f} {access_s / count * 1e9:>18.1f}"
+            )
+        db.close()
+        close_session(db_path)
+
+
+if __name__ == "__main__":
+    main()
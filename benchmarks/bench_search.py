@@ -0,0 +1,74 @@
+"""Title search latency on a large library: FTS5 index vs. the LIKE fallback.
+
+Run from the repository root:
+
+    python benchmarks/bench_search.py [--rows 100000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import close_session  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+from app.core.search import _fts_search_ids, _like_search_ids, _WORD_RE  # noqa: E402
+
+WORDS = (
+    "the last night dark star city house river blue king world time love war shadow fire iron "
+    "ghost garden winter summer hunter empire secret island mountain ocean silent broken golden"
+).split()
+
+# What a user has typed after one, two, three keystrokes and a few words.
+QUERIES = ["s", "sh", "sha", "shadow", "shadow ki", "dark star city"]
+
+
+def _timed(search, query, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ids = search(query)
+    return (time.perf_counter() - start) / repeat, len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "search.db")
+        db = LibraryDB(db_path=db_path)
+        db.add_items(
+            {
+                "path": f"C:/media/{i // 1000}/{i}.mkv",
+                "media_type": "TV",
+                "display_title": " ".join(rng.choice(WORDS) for _ in range(3)).title(),
+                "is_series": True,
+                "series_title": " ".join(rng.choice(WORDS) for _ in range(2)).title(),
+            }
+            for i in range(args.rows)
+        )
+
+        def fts(query):
+            return _fts_search_ids(db.conn, "library_items", _WORD_RE.findall(query))
+
+        def like(query):
+            return _like_search_ids(db.conn, "library_items", _WORD_RE.findall(query))
+
+        print(f"{args.rows} items")
+        print(f"{'query':<16} {'matches':>8} {'FTS5 ms':>9} {'LIKE ms':>9}")
+        for query in QUERIES:
+            fts_s, count = _timed(fts, query)
+            like_s, _ = _timed(like, query, repeat=3)
+            print(f"{query!r:<16} {count:>8} {fts_s * 1000:>9.2f} {like_s * 1000:>9.2f}")
+        db.close()
+        close_session(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Wall time to pick the dominant series title of every untitled import folder, old walk against one pass.
+
+Builds a "TV Shows" tree of --shows shows with --seasons seasons of
+--episodes episodes each, folders untitled and episodes titled after their
+show, optionally under --nesting extra untitled folder levels. The old
+approach re-collects every descendant's title for each folder, so its cost
+grows with the depth of the tree; the single bottom-up pass stays linear in
+the number of rows. Both must agree on every folder.
+
+Run from the repository root:
+
+    python benchmarks/bench_series_consensus.py [--shows 25 50 100 200] [--seasons 30] [--episodes 10] [--nesting 0]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui.library_import_model import ImportNode  # noqa: E402
+from app.ui.library_utils import _GENERIC_SERIES_TITLES, _dominant_series_titles  # noqa: E402
+
+
+def _folder(name, parent, series_title=""):
+    node = ImportNode(name, parent)
+    node.series_title = series_title
+    if parent is not None:
+        node.row = len(parent.children)
+        parent.children.append(node)
+    return node
+
+
+def _tree(shows, seasons, episodes, nesting):
+    root = _folder("TV Shows", None, "TV Shows")
+    top = root
+    for level in range(nesting):
+        top = _folder(f"Group {level}", top)
+    rows = 1 + nesting
+    for show in range(shows):
+        show_node = _folder(f"Show {show}", top)
+        for season in range(1, seasons + 1):
+            season_node = _folder(f"Season {season}", show_node)
+            for episode in range(1, episodes + 1):
+                episode_node = ImportNode(f"Show {show} S{season:02d}E{episode:02d}.mkv", season_node, False)
+                episode_node.series_title = f"Show {show}"
+                episode_node.row = len(season_node.children)
+                season_node.children.append(episode_node)
+        rows += 1 + seasons * (1 + episodes)
+    return [root], rows
+
+
+def _per_folder_walk(roots):
+    # The dialog's previous approach: for each folder, gather the titles of
+    # everything below it again and count them.
+    titles = {}
+    for root in roots:
+        for node in [root, *root.descendants()]:
+            if not node.is_folder:
+                continue
+            current = node.series_title.strip()
+            if current and current.lower() not in _GENERIC_SERIES_TITLES:
+                continue
+            counts = {}
+            first_seen = {}
+            for idx, child in enumerate(node.descendants()):
+                title = child.series_title.strip()
+                if not title or title.lower() in _GENERIC_SERIES_TITLES:
+                    continue
+                key = title.casefold()
+                counts[key] = counts.get(key, 0) + 1
+                first_seen.setdefault(key, (idx, title))
+            if counts:
+                best_key = min(counts, key=lambda key: (-counts[key], first_seen[key][0]))
+                titles[node] = first_seen[best_key][1]
+    return titles
+
+
+def _timed(function, roots):
+    start = time.perf_counter()
+    result = function(roots)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shows", type=int, nargs="+", default=[25, 50, 100, 200])
+    parser.add_argument("--seasons", type=int, default=30)
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--nesting", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'shows':>6} {'rows':>8} {'walk ms':>9} {'us/row':>7} {'pass ms':>9} {'us/row':>7}")
+    for shows in args.shows:
+        roots, rows = _tree(shows, args.seasons, args.episodes, args.nesting)
+        expected, walk_time = _timed(_per_folder_walk, roots)
+        titles, pass_time = _timed(_dominant_series_titles, roots)
+        if titles != expected:
+            raise SystemExit(f"results differ for {shows} shows")
+        print(
+            f"{shows:>6} {rows:>8} {walk_time * 1000:>9.1f} {walk_time * 1e6 / rows:>7.2f} "
+            f"{pass_time * 1000:>9.1f} {pass_time * 1e6 / rows:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
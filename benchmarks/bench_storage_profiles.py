@@ -0,0 +1,92 @@
+"""Write latency of LibraryDB.update_watched/update_items per storage profile.
+
+Run from the repository root:
+
+    python benchmarks/bench_storage_profiles.py [--rows 5000] [--ops 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db_session import STORAGE_PROFILES, close_session, set_storage_profile  # noqa: E402
+from app.core.library_db import LibraryDB  # noqa: E402
+
+
+def _seed(db, rows):
+    db.add_items(
+        {
+            "path": f"C:/media/tv/Show {i // 100}/Season 1/Episode {i}.mkv",
+            "media_type": "TV",
+            "display_title": f"Episode {i}",
+            "is_series": True,
+            "series_title": f"Show {i // 100}",
+            "show_title": f"1.{i % 100 + 1}",
+        }
+        for i in range(rows)
+    )
+
+
+def _time_ms(fn, ops):
+    samples = []
+    for i in range(ops):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def run(profile, rows, ops, directory):
+    db_path = os.path.join(directory, f"{profile}.db")
+    set_storage_profile(profile)
+    db = LibraryDB(db_path=db_path)
+    try:
+        _seed(db, rows)
+        paths = [row[1] for row in db.get_items()]
+
+        def toggle_watched(i):
+            db.update_watched([paths[i % len(paths)]], i % 2 == 0)
+
+        def edit_item(i):
+            path = paths[i % len(paths)]
+            db.update_items(
+                [
+                    {
+                        "path": path,
+                        "media_type": "TV",
+                        "display_title": f"Edited {i}",
+                        "is_series": True,
+                        "series_title": "Show",
+                        "show_title": "1.1",
+                        "air_datetime": None,
+                    }
+                ]
+            )
+
+        return _time_ms(toggle_watched, ops), _time_ms(edit_item, ops)
+    finally:
+        db.close()
+        close_session(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'update_watched mean/p95 ms':>28} {'update_items mean/p95 ms':>26}")
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in STORAGE_PROFILES:
+            (w_mean, w_p95), (u_mean, u_p95) = run(profile, args.rows, args.ops, directory)
+            print(f"{profile:<10} {w_mean:>18.3f} / {w_p95:<7.3f} {u_mean:>16.3f} / {u_p95:<7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 import sys
 from PyQt6.QtWidgets import QApplication, QMainWindow
 from PyQt6.QtCore import QSettings
+from app.core.db_session import DEFAULT_STORAGE_PROFILE, STORAGE_PROFILES, set_storage_profile
+from app.ui.library_scanner import DEFAULT_SCAN_WORKERS, set_scan_workers
 from app.ui.main_menu import MainMenu
 
 class MainWindow(QMainWindow):
@@ -9,6 +11,13 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Whatch")
         self.setMinimumSize(555, 444)
         self._settings = QSettings("Whatch", "Whatch")
+        profile = self._settings.value("database/storage_profile", DEFAULT_STORAGE_PROFILE)
+        if profile in STORAGE_PROFILES:
+            set_storage_profile(profile)
+        try:
+            set_scan_workers(self._settings.value("library/scan_workers", DEFAULT_SCAN_WORKERS))
+        except (TypeError, ValueError):
+            pass
         geometry = self._settings.value("main_window/geometry")
         if geometry:
             self.restoreGeometry(geometry)
@@ -0,0 +1,77 @@
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.bulk import KEY_CHUNK_SIZE, fetch_for_keys
+from app.core.library_db import LibraryDB
+from app.core.list_db import ListDB
+
+
+def _add_movies(db, count):
+    db.add_items(
+        {"path": f"C:/media/movies/Movie {i}.mkv", "media_type": "Movie", "display_title": f"Movie {i}"}
+        for i in range(count)
+    )
+    return [f"C:/media/movies/Movie {i}.mkv" for i in range(count)]
+
+
+def test_update_watched_and_delete_handle_selections_past_the_variable_limit(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        paths = _add_movies(db, 40000)
+        db.update_watched(paths[:35000], True)
+        watched = sum(1 for item in db.get_items() if item.watched)
+        assert watched == 35000
+
+        db.delete_by_paths(paths[1:])
+        assert [item.path for item in db.get_items()] == [paths[0]]
+    finally:
+        db.close()
+
+
+def test_large_selection_is_one_transaction_of_bounded_statements(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        paths = _add_movies(db, KEY_CHUNK_SIZE * 3 + 1)
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        db.update_watched(paths, True)
+        db.conn.set_trace_callback(None)
+        writes = [statement for statement in statements if not statement.startswith("SELECT")]
+        # Trigger steps are traced with the text of the statement that fired
+        # them, so count distinct statements.
+        updates = {statement for statement in writes if statement.startswith("UPDATE")}
+        assert len(updates) == 4
+        assert writes[0].startswith("BEGIN")
+        assert statements.count("COMMIT") == 1
+        assert all(item.watched for item in db.get_items())
+    finally:
+        db.close()
+
+
+def test_fetch_for_keys_collects_rows_from_every_chunk(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        paths = _add_movies(db, KEY_CHUNK_SIZE + 10)
+        names = [path.rsplit("/", 1)[1] for path in paths]
+        rows = fetch_for_keys(db.conn, "SELECT name FROM library_items WHERE name IN ({keys})", names)
+        assert sorted(row[0] for row in rows) == sorted(names)
+    finally:
+        db.close()
+
+
+def test_list_bulk_link_and_delete(tmp_path):
+    db = ListDB(db_path=str(tmp_path / "test.db"))
+    try:
+        ids = [db.add_item("Movie", f"Title {i}") for i in range(KEY_CHUNK_SIZE * 2)]
+        db.set_library_linked(ids[1:], True)
+        linked = {row.id: row.library_linked for row in db.get_items()}
+        assert linked[ids[0]] == 0
+        assert all(linked[item_id] == 1 for item_id in ids[1:])
+
+        db.delete_by_ids(ids[1:])
+        assert [row.id for row in db.get_items()] == [ids[0]]
+    finally:
+        db.close()
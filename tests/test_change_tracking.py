@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.library_db import LibraryDB
+from app.core.list_db import ListDB
+from app.core.people_db import PeopleDB
+
+
+def test_library_changes_since_revision(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        start = db.current_revision()
+        db.add_items(
+            {"path": f"C:/media/movies/Movie {i}.mkv", "media_type": "Movie", "display_title": f"Movie {i}"}
+            for i in range(3)
+        )
+        added = db.get_items_since(start)
+        assert sorted(item.path for item in added.items) == [f"C:/media/movies/Movie {i}.mkv" for i in range(3)]
+        assert added.deleted_ids == []
+
+        unchanged = db.get_items_since(added.revision)
+        assert unchanged.revision == added.revision
+        assert unchanged.items == [] and unchanged.deleted_ids == []
+
+        ids = {item.path: item.id for item in added.items}
+        db.update_watched(["C:/media/movies/Movie 0.mkv"], True)
+        db.delete_by_paths(["C:/media/movies/Movie 1.mkv"])
+        changes = db.get_items_since(added.revision)
+        assert [(item.path, item.watched) for item in changes.items] == [("C:/media/movies/Movie 0.mkv", 1)]
+        assert changes.deleted_ids == [ids["C:/media/movies/Movie 1.mkv"]]
+        assert changes.revision > added.revision
+    finally:
+        db.close()
+
+
+def test_list_changes_follow_person_renames(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    db = ListDB(db_path=db_path)
+    people = PeopleDB(db_path=db_path)
+    try:
+        people.add_person("Alex", None)
+        person_id = people.get_people()[0].id
+        item_id = db.add_item("TV", "Severance", person_id)
+        db.add_item("TV", "Andor")
+        revision = db.current_revision()
+
+        people.update_person(person_id, "Sam", None)
+        changes = db.get_items_since(revision)
+        assert [(item.id, item.added_by_name) for item in changes.items] == [(item_id, "Sam")]
+
+        db.delete_by_ids([item_id])
+        assert db.get_items_since(changes.revision).deleted_ids == [item_id]
+    finally:
+        people.close()
+        db.close()
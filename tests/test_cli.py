@@ -0,0 +1,180 @@
+import json
+import ntpath
+import subprocess
+import sys
+from types import SimpleNamespace
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.cli import main
+from app.core import paths
+from app.core.library_db import LibraryDB
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+def _items(db_path):
+    db = LibraryDB(db_path=str(db_path))
+    try:
+        return {item.path: item for item in db.get_items()}
+    finally:
+        db.close()
+
+
+def test_import_adds_files_and_records_the_root(tmp_path, capsys):
+    root = tmp_path / "TV"
+    _touch(root / "Show" / "Season 1" / "Show S01E01.mkv")
+    _touch(root / "Show" / "Season 1" / "Show S01E02.mkv")
+    db_path = tmp_path / "test.db"
+
+    assert main(["--db", str(db_path), "import", str(root)]) == 0
+    assert main(["--db", str(db_path), "import", str(root)]) == 0
+
+    output = capsys.readouterr().out
+    assert "2 added, 0 already in the library" in output
+    assert "0 added, 2 already in the library" in output
+    items = _items(db_path)
+    episode = items[str(root / "Show" / "Season 1" / "Show S01E01.mkv")]
+    assert (episode.media_type, episode.series_title, episode.show_title) == ("TV", "Show", "1.1")
+    db = LibraryDB(db_path=str(db_path))
+    try:
+        assert db.get_roots() == [str(root)]
+    finally:
+        db.close()
+
+
+def test_rescan_reports_until_applied(tmp_path, capsys):
+    root = tmp_path / "Movies"
+    _touch(root / "Film (2001).mkv")
+    db_path = tmp_path / "test.db"
+    main(["--db", str(db_path), "import", str(root)])
+    _touch(root / "Other Film (2002).mkv")
+    (root / "Film (2001).mkv").unlink()
+    capsys.readouterr()
+
+    assert main(["--db", str(db_path), "rescan"]) == 0
+    assert list(_items(db_path)) == [str(root / "Film (2001).mkv")]
+    output = capsys.readouterr().out
+    assert f"new {root / 'Other Film (2002).mkv'}" in output
+    assert f"missing {root / 'Film (2001).mkv'}" in output
+
+    assert main(["--db", str(db_path), "rescan", "--apply"]) == 0
+    assert list(_items(db_path)) == [str(root / "Other Film (2002).mkv")]
+
+
+def test_import_plan_is_written_without_touching_the_library_and_replayed_into_several(tmp_path, capsys):
+    root = tmp_path / "TV"
+    _touch(root / "Show" / "Season 1" / "Show S01E01.mkv")
+    _touch(root / "Show" / "Season 1" / "Show S01E02.mkv")
+    plan = tmp_path / "plan.jsonl"
+    first, second = tmp_path / "first.db", tmp_path / "second.db"
+
+    assert main(["--db", str(first), "import", "--plan", str(plan), str(root)]) == 0
+    assert _items(first) == {}
+    lines = [json.loads(line) for line in plan.read_text(encoding="utf-8").splitlines()]
+    assert [line.get("path") for line in lines[:2]] == [
+        str(root / "Show" / "Season 1" / "Show S01E01.mkv"),
+        str(root / "Show" / "Season 1" / "Show S01E02.mkv"),
+    ]
+    assert lines[2]["root"] == str(root)
+
+    # Reviewed offline: the second episode is dropped and the first renamed.
+    lines[0]["display_title"] = "Pilot"
+    plan.write_text("\n".join(json.dumps(line) for line in (lines[0], lines[2])) + "\n", encoding="utf-8")
+    capsys.readouterr()
+
+    assert main(["--db", str(first), "apply-plan", "--dry-run", str(plan)]) == 0
+    assert "1 would be added, 0 already in the library, 1 root(s) recorded" in capsys.readouterr().out
+    assert _items(first) == {}
+
+    for db_path in (first, second):
+        assert main(["--db", str(db_path), "apply-plan", str(plan)]) == 0
+        items = _items(db_path)
+        assert [item.display_title for item in items.values()] == ["Pilot"]
+        db = LibraryDB(db_path=str(db_path))
+        try:
+            assert db.get_roots() == [str(root)]
+        finally:
+            db.close()
+
+
+def test_apply_plan_rejects_a_bad_plan_before_adding_anything(tmp_path, capsys):
+    plan = tmp_path / "plan.jsonl"
+    plan.write_text(
+        '{"path": "/a.mkv", "media_type": "Movie", "display_title": "A"}\n{"path": "/b.mkv"}\n', encoding="utf-8"
+    )
+    db_path = tmp_path / "test.db"
+
+    assert main(["--db", str(db_path), "apply-plan", str(plan)]) == 2
+    assert f"{plan}:2: media_type must be a non-empty string" in capsys.readouterr().err
+    assert _items(db_path) == {}
+
+
+def test_mark_watched_accepts_folders_and_reports_unknown_paths(tmp_path, capsys):
+    root = tmp_path / "TV"
+    _touch(root / "Show" / "Season 1" / "Show S01E01.mkv")
+    _touch(root / "Show" / "Season 2" / "Show S02E01.mkv")
+    _touch(root / "Other" / "Other S01E01.mkv")
+    db_path = tmp_path / "test.db"
+    main(["--db", str(db_path), "import", str(root)])
+
+    assert main(["--db", str(db_path), "mark-watched", str(root / "Show")]) == 0
+    assert main(["--db", str(db_path), "mark-watched", str(tmp_path / "missing.mkv")]) == 1
+
+    watched = {path for path, item in _items(db_path).items() if item.watched}
+    assert watched == {
+        str(root / "Show" / "Season 1" / "Show S01E01.mkv"),
+        str(root / "Show" / "Season 2" / "Show S02E01.mkv"),
+    }
+    assert f"not in the library: {tmp_path / 'missing.mkv'}" in capsys.readouterr().out
+
+
+def test_paths_are_matched_as_the_import_dialog_stored_them(tmp_path, monkeypatch, capsys):
+    # On Windows the dialog's folder comes with "/" and names are joined with "\".
+    monkeypatch.setattr(paths, "os", SimpleNamespace(path=ntpath, getcwd=lambda: "C:\\Users\\me"))
+    stored = ["C:/Media/TV\\Show\\S01E01.mkv", "C:/Media/TV\\Show\\S01E02.mkv"]
+    db_path = tmp_path / "test.db"
+    db = LibraryDB(db_path=str(db_path))
+    try:
+        db.add_items([{"path": path, "media_type": "TV", "display_title": "Episode"} for path in stored])
+    finally:
+        db.close()
+
+    assert main(["--db", str(db_path), "mark-watched", stored[0]]) == 0
+
+    assert "not in the library" not in capsys.readouterr().out
+    assert {path for path, item in _items(db_path).items() if item.watched} == {stored[0]}
+
+
+def test_export_and_stats(tmp_path, capsys):
+    root = tmp_path / "Movies"
+    _touch(root / "Film (2001).mkv")
+    _touch(root / "Other Film (2002).mkv")
+    db_path = tmp_path / "test.db"
+    main(["--db", str(db_path), "import", str(root)])
+    main(["--db", str(db_path), "mark-watched", str(root / "Film (2001).mkv")])
+    capsys.readouterr()
+
+    assert main(["--db", str(db_path), "export"]) == 0
+    exported = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [item["path"] for item in exported] == [str(root / "Film (2001).mkv"), str(root / "Other Film (2002).mkv")]
+    assert exported[0]["watched"] == 1
+
+    assert main(["--db", str(db_path), "stats"]) == 0
+    lines = [line.split() for line in capsys.readouterr().out.splitlines()]
+    assert ["items", "2"] in lines
+    assert ["Movie", "2"] in lines
+    assert ["watched", "1"] in lines
+
+
+def test_cli_does_not_import_qt():
+    code = "import sys, app.cli, app.ui.library_scanner; print(any(name.startswith('PyQt') for name in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    assert output.stdout.strip() == "False"
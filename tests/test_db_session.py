@@ -0,0 +1,99 @@
+import sys
+import threading
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core import db_session
+from app.core.db_session import DatabaseSession, close_session, get_session
+from app.core.library_db import LibraryDB
+from app.core.list_db import ListDB
+from app.core.people_db import PeopleDB
+
+
+def test_helpers_share_one_connection_and_migrate_once(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "test.db")
+    calls = []
+    original = db_session.migrate
+
+    def counting_migrate(conn):
+        calls.append(conn)
+        original(conn)
+
+    monkeypatch.setattr(db_session, "migrate", counting_migrate)
+    try:
+        first = LibraryDB(db_path=db_path)
+        list_db = ListDB(db_path=db_path)
+        first.close()
+        second = LibraryDB(db_path=db_path)
+
+        assert first.session is second.session is list_db.session
+        assert second.conn is list_db.conn
+        assert len(calls) == 1
+    finally:
+        close_session(db_path)
+
+
+def test_close_session_reopens_and_reruns_schema_setup(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    try:
+        db = LibraryDB(db_path=db_path)
+        db.add_item("C:/media/a.mkv", "Movie", "A")
+        old_conn = db.conn
+        close_session(db_path)
+
+        reopened = LibraryDB(db_path=db_path)
+        assert reopened.conn is not old_conn
+        assert [row[1] for row in reopened.get_items()] == ["C:/media/a.mkv"]
+    finally:
+        close_session(db_path)
+
+
+def test_reset_database_leaves_other_helpers_of_the_session_working(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    try:
+        library = LibraryDB(db_path=db_path)
+        library.add_item("C:/media/a.mkv", "Movie", "A")
+        people = PeopleDB(db_path=db_path)
+        people.add_person("Alex", "2000-01-01")
+
+        people.reset_database()
+
+        assert people.get_people() == []
+        people.add_person("Sam", None)
+        assert [person.id for person in people.get_people()] == [1]
+        assert [item.path for item in library.get_items()] == ["C:/media/a.mkv"]
+        assert get_session(db_path).connection() is people.conn is library.conn
+    finally:
+        close_session(db_path)
+
+
+def test_memory_session_shares_one_database_across_threads():
+    try:
+        LibraryDB(db_path=":memory:").add_item("C:/media/a.mkv", "Movie", "A")
+        seen = []
+        worker = threading.Thread(target=lambda: seen.extend(LibraryDB(db_path=":memory:").get_items()))
+        worker.start()
+        worker.join()
+
+        assert [item.path for item in seen] == ["C:/media/a.mkv"]
+    finally:
+        close_session(":memory:")
+
+
+def test_storage_profile_pragmas_applied_to_new_connections(tmp_path):
+    balanced = DatabaseSession(str(tmp_path / "balanced.db"), profile="balanced")
+    legacy = DatabaseSession(str(tmp_path / "legacy.db"), profile="legacy")
+    try:
+        conn = balanced.connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+
+        conn = legacy.connection()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    finally:
+        balanced.close()
+        legacy.close()
@@ -0,0 +1,87 @@
+import io
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.import_plan import iter_plan_items, write_plan
+from app.core.records import DirManifest
+
+
+def _item(path, **fields):
+    item = {
+        "path": path,
+        "media_type": "TV",
+        "display_title": "S01E01",
+        "is_series": True,
+        "series_title": "Show",
+        "show_title": "1.1",
+    }
+    item.update(fields)
+    return item
+
+
+def test_plan_round_trips_items_and_manifests_filled_while_writing():
+    manifest = {}
+
+    def items():
+        yield _item("/tv/Show/S01E01.mkv")
+        yield _item("/movies/Film.mkv", media_type="Movie", display_title="Film", is_series=0, series_title=None)
+        # Filled at the end of the scan, after the last item.
+        manifest["/tv"] = {"/tv": DirManifest(5, 1), "/tv/Show": DirManifest(-1, 1)}
+
+    stream = io.StringIO()
+    assert write_plan(stream, items(), manifest) == 2
+
+    read_manifest = {}
+    stream.seek(0)
+    read = list(iter_plan_items(stream, read_manifest))
+
+    assert read == [
+        _item("/tv/Show/S01E01.mkv"),
+        _item(
+            "/movies/Film.mkv",
+            media_type="Movie",
+            display_title="Film",
+            is_series=False,
+            series_title=None,
+            show_title="1.1",
+        ),
+    ]
+    assert read_manifest == manifest
+
+
+def test_hand_edited_plan_skips_blank_lines_and_fills_optional_fields():
+    stream = io.StringIO('\n{"path": "/a.mkv", "media_type": "Movie", "display_title": "A"}\n\n')
+
+    assert list(iter_plan_items(stream)) == [
+        {
+            "path": "/a.mkv",
+            "media_type": "Movie",
+            "display_title": "A",
+            "is_series": False,
+            "series_title": None,
+            "show_title": None,
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ("{not json", "plan.jsonl:2: not valid JSON"),
+        ('["/a.mkv"]', "plan.jsonl:2: expected an object"),
+        ('{"path": "/b.mkv", "media_type": "Movie"}', "plan.jsonl:2: display_title must be"),
+        ('{"path": "/b.mkv", "media_type": "Movie", "display_title": "B", "titel": "x"}', "unknown field(s): titel"),
+        ('{"root": "/tv", "manifest": {"/tv": [1]}}', "manifest entry for /tv"),
+    ],
+)
+def test_invalid_plan_lines_are_reported_with_their_line_number(line, message):
+    stream = io.StringIO('{"path": "/a.mkv", "media_type": "Movie", "display_title": "A"}\n' + line + "\n")
+
+    with pytest.raises(ValueError, match=re.escape(message)):
+        list(iter_plan_items(stream, {}, "plan.jsonl"))
@@ -5,6 +5,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.core.library_db import LibraryDB
+from app.core.records import DirManifest, LibraryItem
 
 
 def test_add_retrieve_delete(tmp_path):
@@ -46,3 +47,127 @@ def test_add_retrieve_delete(tmp_path):
         assert db.get_items() == []
     finally:
         db.close()
+
+
+def test_add_items_inserts_in_bulk_and_reports_duplicates(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = LibraryDB(db_path=str(db_path))
+    try:
+        db.add_item("C:/media/movies/Existing.mkv", "Movie", "Existing")
+
+        outcome = db.add_items(
+            [
+                {"path": "C:/media/movies/Existing.mkv", "media_type": "Movie", "display_title": "Existing"},
+                {
+                    "path": "C:/media/tv/Show/S01E01.mkv",
+                    "media_type": "TV",
+                    "display_title": "Pilot",
+                    "is_series": True,
+                    "series_title": "Show",
+                    "show_title": "1.1",
+                },
+                {"path": "C:/media/movies/New.mkv", "media_type": "Movie", "display_title": "New"},
+                {"path": "C:/media/movies/New.mkv", "media_type": "Movie", "display_title": "New again"},
+            ]
+        )
+
+        assert outcome == {
+            "inserted": ["C:/media/tv/Show/S01E01.mkv", "C:/media/movies/New.mkv"],
+            "ignored": ["C:/media/movies/Existing.mkv", "C:/media/movies/New.mkv"],
+        }
+        rows = {row[1]: row for row in db.get_items()}
+        assert len(rows) == 3
+        assert rows["C:/media/movies/New.mkv"][3] == "New"
+        episode = rows["C:/media/tv/Show/S01E01.mkv"]
+        assert (episode[4], episode[5], episode[6], episode[8]) == (1, "Show", "1.1", 0)
+    finally:
+        db.close()
+
+
+def test_get_items_returns_named_records(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = LibraryDB(db_path=str(db_path))
+    try:
+        db.add_item("C:/media/tv/Show/S01E01.mkv", "TV", "Pilot", is_series=True, series_title="Show", show_title="1.1")
+        (item,) = db.get_items()
+        assert isinstance(item, LibraryItem)
+        assert (item.path, item.series_title, item.show_title, item.watched) == (
+            "C:/media/tv/Show/S01E01.mkv",
+            "Show",
+            "1.1",
+            0,
+        )
+        assert item[1] == item.path
+        assert not hasattr(item, "__dict__")
+    finally:
+        db.close()
+
+
+def test_paths_round_trip_through_directories_table(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        paths = [
+            "C:/media/tv/Show/Season 1/S01E01.mkv",
+            "C:/media/tv/Show/Season 1/S01E02.mkv",
+            "\\\\nas\\media\\Movies\\Film (2001).mkv",
+            "__placeholder__::Show::S1E3::abc",
+        ]
+        db.add_items({"path": path, "media_type": "TV", "display_title": path} for path in paths)
+
+        assert sorted(item.path for item in db.get_items()) == sorted(paths)
+        assert db.conn.execute("SELECT COUNT(*) FROM directories").fetchone()[0] == 3
+        assert "path" not in [row[1] for row in db.conn.execute("PRAGMA table_info(library_items)")]
+
+        db.assign_placeholder("__placeholder__::Show::S1E3::abc", "C:/media/tv/Show/Season 1/S01E03.mkv")
+        # The placeholder's directory entry went with its last item.
+        assert db.conn.execute("SELECT COUNT(*) FROM directories").fetchone()[0] == 2
+        db.update_watched(["\\\\nas\\media\\Movies\\Film (2001).mkv"], True)
+        items = {item.path: item for item in db.get_items()}
+        assert items["C:/media/tv/Show/Season 1/S01E03.mkv"].is_placeholder == 0
+        assert items["\\\\nas\\media\\Movies\\Film (2001).mkv"].watched == 1
+
+        db.delete_by_paths(["\\\\nas\\media\\Movies\\Film (2001).mkv", "C:/media/tv/Show/Season 1/S01E01.mkv"])
+        directories = [row[0] for row in db.conn.execute("SELECT path FROM directories ORDER BY path")]
+        assert directories == ["C:/media/tv/Show/Season 1/"]
+    finally:
+        db.close()
+
+
+def test_save_manifest_records_roots_and_replaces_their_manifest(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        db.save_manifest("/media/tv", {"/media/tv": DirManifest(10, 2), "/media/tv/Show": DirManifest(20, 3)})
+        db.save_manifest("/media/films", {"/media/films": DirManifest(30, 1)})
+        db.save_manifest("/media/tv", {"/media/tv": DirManifest(11, 1)})
+
+        assert db.get_roots() == ["/media/films", "/media/tv"]
+        assert db.get_manifest("/media/tv") == {"/media/tv": DirManifest(11, 1)}
+        assert db.get_manifest("/media/unknown") == {}
+    finally:
+        db.close()
+
+
+def test_move_items_keeps_item_state_and_drops_empty_directories(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        db.add_items(
+            {"path": path, "media_type": "TV", "display_title": "Pilot"}
+            for path in ["/tv/Show/Season 1/a.mkv", "/tv/Show/Season 1/b.mkv"]
+        )
+        db.update_watched(["/tv/Show/Season 1/a.mkv"], True)
+
+        db.move_items([("/tv/Show/Season 1/a.mkv", "/tv/Show/a.mkv"), ("/tv/gone.mkv", "/tv/Show/gone.mkv")])
+
+        items = {item.path: item for item in db.get_items()}
+        assert sorted(items) == ["/tv/Show/Season 1/b.mkv", "/tv/Show/a.mkv"]
+        assert items["/tv/Show/a.mkv"].watched == 1
+        assert db.get_directory_files(["/tv/Show/", "/tv/Show/Season 1/", "/tv/"]) == {
+            "/tv/Show/": {"a.mkv"},
+            "/tv/Show/Season 1/": {"b.mkv"},
+        }
+
+        db.move_items([("/tv/Show/Season 1/b.mkv", "/tv/Show/b.mkv")])
+        directories = [row[0] for row in db.conn.execute("SELECT path FROM directories ORDER BY path")]
+        assert directories == ["/tv/Show/"]
+    finally:
+        db.close()
@@ -0,0 +1,378 @@
+import os
+import random
+import sys
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+
+from app.ui import library_menu
+from app.ui.library_import_model import (
+    EXCLUDE_COLUMN,
+    SERIES_COLUMN,
+    SERIES_INDEX_COLUMN,
+    SERIES_TITLE_COLUMN,
+    TITLE_COLUMN,
+    TYPE_COLUMN,
+    ImportTreeModel,
+)
+from app.ui.library_scanner import ImportRow
+
+SHOW = os.path.join("media", "TV", "Show")
+SEASON = os.path.join(SHOW, "Season 1")
+FILM_DIR = os.path.join("media", "Films")
+
+
+def _episode(number, series_title="Show", display_title=None):
+    path = os.path.join(SEASON, f"Show S01E0{number}.mkv")
+    title = f"S01E0{number} - Episode" if display_title is None else display_title
+    return ImportRow(path, SEASON, False, "TV", series_title, f"1.{number}", title)
+
+
+def _rows():
+    return [
+        ImportRow(SHOW, None, True, "TV", "Show", "", None),
+        ImportRow(SEASON, SHOW, True, "TV", "Show", "1", None),
+        _episode(1),
+        _episode(2, series_title="  Show  ", display_title="  "),
+        _episode(3),
+        ImportRow(FILM_DIR, None, True, "Movie", "", "", None),
+        ImportRow(os.path.join(FILM_DIR, "Film (2001).mkv"), FILM_DIR, False, "Movie", "", "", "Film"),
+    ]
+
+
+def _model():
+    model = ImportTreeModel()
+    model.add_rows(_rows())
+    return model
+
+
+def _node(model, path):
+    return next(node for node in model.nodes() if node.path == path)
+
+
+def _changes(model):
+    changes = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles=(): changes.append((top_left, bottom_right)))
+    return changes
+
+
+def test_check_boxes_toggle_through_set_data_and_carry_down_from_folders():
+    model = _model()
+    season = _node(model, SEASON)
+
+    index = model.index_of(season, EXCLUDE_COLUMN)
+    assert model.setData(index, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+    assert index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+    assert all(child.exclude for child in season.children)
+
+    child = model.index_of(season.children[0], EXCLUDE_COLUMN)
+    assert model.setData(child, Qt.CheckState.Unchecked.value, Qt.ItemDataRole.CheckStateRole)
+    assert [child.exclude for child in season.children] == [False, True, True]
+
+    # Check boxes only change through the check state role.
+    assert not model.setData(index, False, Qt.ItemDataRole.EditRole)
+    assert season.exclude
+
+
+def test_set_data_with_the_current_value_changes_nothing():
+    model = _model()
+    season = _node(model, SEASON)
+    season.children[0].series_title = "Own Title"
+    changes = _changes(model)
+
+    assert model.setData(model.index_of(season, SERIES_TITLE_COLUMN), "Show")
+    series = model.index_of(season, SERIES_COLUMN)
+    assert model.setData(series, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+    assert model.setData(model.index_of(season, TYPE_COLUMN), "TV")
+
+    assert changes == []
+    assert season.children[0].series_title == "Own Title"
+
+
+def test_choosing_tv_ticks_the_series_box():
+    model = _model()
+    film = _node(model, os.path.join(FILM_DIR, "Film (2001).mkv"))
+    assert not model.flags(model.index_of(film, SERIES_TITLE_COLUMN)) & Qt.ItemFlag.ItemIsEditable
+    assert model.index_of(film, SERIES_TITLE_COLUMN).data() is None
+
+    assert model.setData(model.index_of(film, TYPE_COLUMN), "TV")
+
+    assert (film.media_type, film.is_series) == ("TV", True)
+    assert model.index_of(film, SERIES_COLUMN).data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+    assert model.flags(model.index_of(film, SERIES_TITLE_COLUMN)) & Qt.ItemFlag.ItemIsEditable
+    # Folders have no title of their own to edit.
+    season = _node(model, SEASON)
+    assert not model.flags(model.index_of(season, TITLE_COLUMN)) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_folder_series_index_numbers_the_files_below_it():
+    model = _model()
+    season = _node(model, SEASON)
+
+    assert model.setData(model.index_of(season, SERIES_INDEX_COLUMN), "2")
+
+    assert [child.series_index for child in season.children] == ["2.1", "2.2", "2.3"]
+    assert season.series_index == "2"
+
+
+def test_get_results_gives_the_items_the_row_widget_dialog_gave():
+    app = QApplication.instance() or QApplication([])
+    with mock.patch.object(library_menu, "iter_import_rows", lambda _paths, **_kwargs: iter(_rows())):
+        dialog = library_menu.LibraryImportDialog(["media"])
+        while dialog._scan_worker is not None:
+            app.processEvents()
+    try:
+        model = dialog.model
+        model.set_field(_node(model, os.path.join(SEASON, "Show S01E03.mkv")), "exclude", True)
+        film = _node(model, os.path.join(FILM_DIR, "Film (2001).mkv"))
+        model.set_field(film, "display_title", "  Film Title ")
+
+        results = dialog.get_results()
+    finally:
+        dialog.reject()
+
+    # As the widget dialog read them: excluded files left out, text fields
+    # stripped, blank ones None (or the file name for the title).
+    assert results == [
+        {
+            "path": os.path.join(SEASON, "Show S01E01.mkv"),
+            "media_type": "TV",
+            "is_series": True,
+            "series_title": "Show",
+            "show_title": "1.1",
+            "display_title": "S01E01 - Episode",
+        },
+        {
+            "path": os.path.join(SEASON, "Show S01E02.mkv"),
+            "media_type": "TV",
+            "is_series": True,
+            "series_title": "Show",
+            "show_title": "1.2",
+            "display_title": "Show S01E02",
+        },
+        {
+            "path": os.path.join(FILM_DIR, "Film (2001).mkv"),
+            "media_type": "Movie",
+            "is_series": False,
+            "series_title": None,
+            "show_title": None,
+            "display_title": "Film Title",
+        },
+    ]
+
+
+def _other_episode(number):
+    path = os.path.join(SEASON, f"Show S01E0{number}.mkv")
+    return ImportRow(path, SEASON, False, "Movie", "Scanned", f"9.{number}", f"E{number}")
+
+
+def test_the_latest_edit_on_the_way_up_wins():
+    model = _model()
+    show = _node(model, SHOW)
+    season = _node(model, SEASON)
+    episode = season.children[0]
+
+    model.set_field(show, "series_title", "Parent")
+    model.set_field(episode, "series_title", "Child")
+    assert [child.series_title for child in season.children] == ["Child", "Parent", "Parent"]
+    assert episode.source("series_title") is episode
+
+    model.set_field(season, "series_title", "Newer Parent")
+    assert [child.series_title for child in season.children] == ["Newer Parent"] * 3
+    assert episode.source("series_title") is season
+    assert show.series_title == "Parent"
+
+
+def test_rows_streamed_in_after_a_folder_edit_show_it():
+    model = _model()
+    show = _node(model, SHOW)
+    season = _node(model, SEASON)
+    model.set_field(show, "series_title", "Edited Show")
+    model.set_field(season, "media_type", "Movie")
+
+    # The scan is still running: more files, and a folder, arrive below.
+    (added,) = model.add_rows([_other_episode(4)])
+    specials = os.path.join(SHOW, "Specials")
+    folder, special = model.add_rows(
+        [
+            ImportRow(specials, SHOW, True, "TV", "Scanned", "", None),
+            ImportRow(os.path.join(specials, "Show S00E01.mkv"), specials, False, "TV", "Scanned", "0.1", "E"),
+        ]
+    )
+
+    assert (added.media_type, added.series_title) == ("Movie", "Edited Show")
+    assert [(node.media_type, node.series_title) for node in (folder, special)] == [("TV", "Edited Show")] * 2
+    model.set_field(season, "series_title", "Edited Season")
+    assert [child.series_title for child in season.children] == ["Edited Season"] * 4
+    assert special.series_title == "Edited Show"
+
+
+def test_series_index_numbers_are_kept_through_a_sort():
+    model = _model()
+    season = _node(model, SEASON)
+    model.set_field(season, "series_index", "3")
+    # Added after the edit: numbered on from the files already there.
+    (added,) = model.add_rows([_other_episode(4)])
+    first, second, third = season.children[:3]
+
+    model.sort_tree(lambda node: -node.row)
+
+    assert season.children == [added, third, second, first]
+    assert [node.series_index for node in (first, second, third, added)] == ["3.1", "3.2", "3.3", "3.4"]
+    # A new edit numbers the files in their current order.
+    model.set_field(season, "series_index", "4")
+    assert [node.series_index for node in season.children] == ["4.1", "4.2", "4.3", "4.4"]
+
+
+def test_apply_to_all_overrides_earlier_edits_and_yields_to_later_ones():
+    model = _model()
+    season = _node(model, SEASON)
+    film = _node(model, os.path.join(FILM_DIR, "Film (2001).mkv"))
+    model.set_field(season.children[0], "media_type", "Movie")
+    model.set_field(film, "series_title", "Film Series")
+
+    model.apply_to_all("TV", True, "Everything")
+
+    assert {(node.media_type, node.is_series, node.series_title) for node in model.nodes()} == {
+        ("TV", True, "Everything")
+    }
+    model.set_field(film, "media_type", "Movie")
+    assert film.media_type == "Movie"
+    assert season.children[0].media_type == "TV"
+
+
+class _CopyingModel:
+    """The import grid's edit rules, written out as eager copies down the tree.
+
+    ``edited`` records, per path and field, the path of the edit a value was
+    copied from, so rows added later copy it too; ``numbered`` counts the
+    files each folder's series index has numbered so far.
+    """
+
+    FIELDS = ("media_type", "is_series", "series_title", "series_index", "exclude")
+
+    def __init__(self):
+        self.values = {}
+        self.edited = {None: {}}
+        self.children = {None: []}
+        self.folders = set()
+        self.numbered = {}
+
+    def add_rows(self, rows):
+        for row in rows:
+            self.children.setdefault(row.parent, []).append(row.path)
+            self.children.setdefault(row.path, [])
+            if row.is_folder:
+                self.folders.add(row.path)
+            self.values[row.path] = {
+                "media_type": row.media_type,
+                "is_series": row.media_type == "TV",
+                "series_title": row.series_title,
+                "series_index": row.series_index,
+                "exclude": False,
+            }
+            self.edited[row.path] = {}
+            for field, source in self.edited[row.parent].items():
+                self.edited[row.path][field] = source
+                if field == "series_index" and not row.is_folder and source in self.numbered:
+                    self.numbered[source] += 1
+                    value = f"{self.values[source][field].split('.')[0]}.{self.numbered[source]}"
+                else:
+                    value = self.values[row.parent][field] if row.parent is not None else self.values[source][field]
+                self.values[row.path][field] = value
+
+    def descendants(self, path):
+        for child in self.children[path]:
+            yield child
+            yield from self.descendants(child)
+
+    def set_field(self, path, field, value):
+        if field == "media_type" and value == "TV" and not self.values[path]["is_series"]:
+            self.set_field(path, "is_series", True)
+        self.values[path][field] = value
+        self.edited[path][field] = path
+        numbering = field == "series_index" and path in self.folders and value.split(".")[0].isdigit()
+        if field == "series_index":
+            self.numbered.pop(path, None)
+        if numbering:
+            self.numbered[path] = 0
+        for child in self.descendants(path):
+            self.edited[child][field] = path
+            if numbering and child not in self.folders:
+                self.numbered[path] += 1
+                self.values[child][field] = f"{value.split('.')[0]}.{self.numbered[path]}"
+            else:
+                self.values[child][field] = value
+
+    def apply_to_all(self, media_type, is_series, series_title):
+        applied = {"media_type": media_type, "is_series": is_series}
+        if series_title:
+            applied["series_title"] = series_title
+        # The invisible root is the source of these edits.
+        self.values[None] = {**self.values.get(None, {}), **applied}
+        for path, values in self.values.items():
+            values.update(applied)
+            self.edited[path].update(dict.fromkeys(applied))
+
+    def sort(self, key):
+        for children in self.children.values():
+            children.sort(key=key)
+
+
+def test_edits_read_back_as_if_copied_down_the_tree():
+    choices = {
+        "media_type": ["TV", "Movie"],
+        "is_series": [True, False],
+        "series_title": ["A", "B", ""],
+        "series_index": ["2", "3", "x", ""],
+        "exclude": [True, False],
+    }
+    for seed in range(200):
+        rng = random.Random(seed)
+        model, reference = ImportTreeModel(), _CopyingModel()
+        for batch in range(4):
+            rows = []
+            # New shows, and new seasons of the shows already there, as a
+            # scan still running would add them between edits.
+            shows = [os.path.join("TV", f"Show {batch}.{show}") for show in range(rng.randint(1, 2))]
+            for show_dir in shows:
+                rows.append(ImportRow(show_dir, None, True, "TV", "Show", "", None))
+            shows += rng.sample(sorted(reference.children[None]), min(2, len(reference.children[None])))
+            for show_dir in shows:
+                for season in range(1, rng.randint(2, 3)):
+                    season_dir = os.path.join(show_dir, f"Season {batch}{season}")
+                    rows.append(ImportRow(season_dir, show_dir, True, "TV", "Show", str(season), None))
+                    for episode in range(rng.randint(1, 3)):
+                        path = os.path.join(season_dir, f"e{batch}{episode}.mkv")
+                        rows.append(ImportRow(path, season_dir, False, "TV", "Show", f"{season}.{episode}", "E"))
+            model.add_rows(rows)
+            reference.add_rows(rows)
+            for _edit in range(rng.randint(1, 5)):
+                if rng.random() < 0.15:
+                    media_type, is_series, title = rng.choice(["TV", "Movie"]), rng.random() < 0.5, rng.choice("AZ")
+                    model.apply_to_all(media_type, is_series, title)
+                    reference.apply_to_all(media_type, is_series, title)
+                    continue
+                node = rng.choice(list(model.nodes()))
+                field = rng.choice(_CopyingModel.FIELDS)
+                value = rng.choice(choices[field])
+                model.set_field(node, field, value)
+                reference.set_field(node.path, field, value)
+            if rng.random() < 0.5:
+                order = {name: rng.random() for name in {os.path.basename(path) for path in reference.values if path}}
+                model.sort_tree(lambda node: order[node.name])
+                reference.sort(lambda path: order[os.path.basename(path)])
+
+        for node in model.nodes():
+            values = {field: getattr(node, field) for field in _CopyingModel.FIELDS}
+            assert values == reference.values[node.path], (seed, node.path)
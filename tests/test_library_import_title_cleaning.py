@@ -5,17 +5,23 @@ from pathlib import Path
 # Ensure repository root is on sys.path so we import local app package
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from app.ui import library_utils
 from app.ui.library_utils import (
     _clean_series_title,
     _default_episode_title,
     _default_show_and_series,
+    _dominant_series_titles,
     _extract_tv_episode_parts,
     _import_dir_sort_key,
     _import_file_sort_key,
     _normalize_episode_title_case,
+    _parse_media_name,
     _parse_series_index_values,
     _season_number_from_name,
     _series_index_sort_key,
+    _tokenize_media_name,
+    analyze_path,
+    analyze_paths,
 )
 
 
@@ -37,6 +43,70 @@ def test_extract_tv_episode_parts_uses_episode_title_and_series():
     assert parsed["episode_title"] == "River of Echoes"
 
 
+def test_extract_tv_episode_parts_returns_a_fresh_dict_per_call():
+    path = os.path.join("TV", "Show", "Season 1", "Show.S01E02.Title.1080p.mkv")
+    first = _extract_tv_episode_parts(path)
+    first["series_index"] = "9.9"
+    assert _extract_tv_episode_parts(path)["series_index"] == "1.2"
+    assert _extract_tv_episode_parts(os.path.join("Other", "Show.S01E02.Title.1080p.mkv")) == {
+        **first,
+        "series_index": "1.2",
+    }
+
+
+def test_tokenize_media_name_classifies_code_year_and_release_markers():
+    name = "Show (2019) S01E02 Title 1080p WEB-DL x265"
+    tokens = [(kind, name[start:end]) for kind, start, end in _tokenize_media_name(name)]
+    assert tokens == [
+        ("year", "(2019)"),
+        ("code", "S01E02"),
+        ("quality", "1080p"),
+        ("quality", "WEB-DL"),
+        ("quality", "x265"),
+    ]
+
+
+def test_parse_media_name_reads_release_style_name():
+    parsed = _parse_media_name("the.show.2019.S03E04-05.a.title.of.sorts.ENG-ITA.1080p.WEBRip [grp]")
+    assert parsed.show == "The Show"
+    assert parsed.year is None
+    assert parsed.episode_code == "S03E04-E05"
+    assert (parsed.season, parsed.start_episode, parsed.end_episode) == (3, 4, 5)
+    assert parsed.title == "A Title of Sorts"
+    assert parsed.quality == ("1080p", "WEBRip")
+    assert parsed.languages == ("ENG-ITA",)
+    assert parsed.group == ""
+
+
+def test_parse_media_name_reads_dashed_name_and_trailing_group():
+    dashed = _parse_media_name("Sample Series (2019) - S02E03 - River Of Echoes (1080p BluRay x265 GROUP)")
+    assert (dashed.show, dashed.year, dashed.title, dashed.quality) == (
+        "Sample Series",
+        2019,
+        "River of Echoes",
+        ("1080p",),
+    )
+    grouped = _parse_media_name("Show S01E01 Pilot [eztv]")
+    assert (grouped.title, grouped.group) == ("Pilot", "eztv")
+    assert _parse_media_name("Show S1E1 Pilot") is None
+    assert _parse_media_name("Some Film (2001)") is None
+
+
+def test_analyze_paths_gives_the_same_results_on_a_process_pool(monkeypatch):
+    paths = [
+        os.path.join("media", "TV Shows", "Show", "Season 1", f"Show.S01E{episode:02d}.Title.1080p.mkv")
+        for episode in range(1, 8)
+    ] + [os.path.join("media", "Movies", "Some Film (2001).mkv")]
+    expected = [analyze_path(path) for path in paths]
+    assert expected[0].media_type == "TV"
+    assert expected[0].episode.series_index == "1.1"
+    assert expected[-1].episode is None
+
+    monkeypatch.setattr(library_utils, "ANALYZE_PROCESS_THRESHOLD", 2)
+    monkeypatch.setattr(library_utils, "ANALYZE_CHUNK_SIZE", 3)
+    assert analyze_paths(paths, max_workers=2) == expected
+
+
 def test_default_episode_title_falls_back_to_series_index_code():
     path = r"C:\TV\Sample Series\Season 1\random-source-name-that-does-not-match.mkv"
     assert _default_episode_title(path, "1.5") == "S01E05"
@@ -205,3 +275,30 @@ def test_default_show_and_series_uses_grandparent_for_sxx_season_folder():
     show, series = _default_show_and_series(path)
     assert show == "Example Series"
     assert series == "S01"
+
+
+class _Node:
+    def __init__(self, series_title="", children=(), is_folder=None):
+        self.series_title = series_title
+        self.children = list(children)
+        self.is_folder = bool(children) if is_folder is None else is_folder
+
+
+def test_dominant_series_titles_fills_generic_folders_from_their_own_subtree():
+    alpha_season = _Node("", [_Node("Alpha"), _Node("alpha"), _Node("Beta")])
+    alpha = _Node("", [alpha_season, _Node("Alpha")])
+    beta = _Node("Beta", [_Node("Beta"), _Node("Beta")])
+    root = _Node("TV Shows", [alpha, beta])
+
+    titles = _dominant_series_titles([root])
+
+    assert titles == {alpha_season: "Alpha", alpha: "Alpha", root: "Beta"}
+
+
+def test_dominant_series_titles_breaks_ties_by_first_title_in_tree_order():
+    season = _Node("", [_Node("Gamma"), _Node("  "), _Node("TV"), _Node("Delta")])
+    empty = _Node("", [_Node(""), _Node("", is_folder=True)])
+
+    titles = _dominant_series_titles([season, empty])
+
+    assert titles == {season: "Gamma"}
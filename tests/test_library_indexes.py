@@ -0,0 +1,138 @@
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.library_db import LibraryDB
+from app.core.migrations import LIBRARY_ITEM_INDEXES
+
+
+def _seed(db):
+    db.add_items(
+        [
+            {
+                "path": f"C:/tv/Show {show}/S01E{episode:02d}.mkv",
+                "media_type": "TV",
+                "display_title": f"Episode {episode}",
+                "is_series": True,
+                "series_title": f"Show {show}",
+                "show_title": f"1.{episode}",
+            }
+            for show in range(3)
+            for episode in range(1, 4)
+        ]
+        + [
+            {
+                "path": "__placeholder__::Show 0::S1E4::x",
+                "media_type": "TV",
+                "display_title": "S01E04",
+                "is_series": True,
+                "series_title": "Show 0",
+                "show_title": "1.4",
+                "is_placeholder": True,
+                "air_datetime": "2030-01-01 20:00",
+            }
+        ]
+    )
+
+
+def _query_plans(db, action):
+    statements = []
+    db.conn.set_trace_callback(statements.append)
+    try:
+        action()
+    finally:
+        db.conn.set_trace_callback(None)
+    plans = {}
+    for statement in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            continue
+        rows = db.conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+        plans[statement] = [row[3] for row in rows]
+    assert plans, "action did not run any query"
+    return plans
+
+
+def _assert_no_full_scan(plans):
+    for statement, details in plans.items():
+        for detail in details:
+            words = detail.split()
+            if len(words) > 1 and words[1] in ("library_items", "li", "directories", "d"):
+                assert "USING" in detail, f"full scan in {statement!r}: {details}"
+
+
+def test_indexes_exist(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        names = {
+            row[0]
+            for row in db.conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'library_items'"
+            )
+        }
+        assert set(LIBRARY_ITEM_INDEXES) <= names
+    finally:
+        db.close()
+
+
+def test_airing_flags_are_set_through_series_index(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        _seed(db)
+        plans = _query_plans(db, lambda: db.set_currently_airing({("TV", "Show 0"), ("TV", "Show 2")}, True))
+        _assert_no_full_scan(plans)
+        assert any("idx_library_items_series_watched" in d for details in plans.values() for d in details)
+        airing = {item.series_title for item in db.get_items() if item.currently_airing}
+        assert airing == {"Show 0", "Show 2"}
+    finally:
+        db.close()
+
+
+def test_series_watch_counts_use_covering_index(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        _seed(db)
+        db.update_watched(["C:/tv/Show 1/S01E01.mkv"], True)
+        plans = _query_plans(db, db.get_series_watch_counts)
+        _assert_no_full_scan(plans)
+        assert any("COVERING INDEX" in d for details in plans.values() for d in details)
+        counts = {(row[0], row[1]): (row[2], row[3]) for row in db.get_series_watch_counts()}
+        assert counts[("TV", "Show 1")] == (1, 3)
+        assert counts[("TV", "Show 0")] == (0, 4)
+    finally:
+        db.close()
+
+
+def test_watching_items_come_from_index_backed_aggregation(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        _seed(db)
+        db.update_watched(["C:/tv/Show 1/S01E01.mkv"], True)
+        db.update_watched(["C:/tv/Show 2/S01E01.mkv", "C:/tv/Show 2/S01E02.mkv", "C:/tv/Show 2/S01E03.mkv"], True)
+        plans = _query_plans(db, db.get_watching_items)
+        _assert_no_full_scan(plans)
+        items = db.get_watching_items()
+        assert sorted(item.path for item in items) == [
+            "C:/tv/Show 1/S01E01.mkv",
+            "C:/tv/Show 1/S01E02.mkv",
+            "C:/tv/Show 1/S01E03.mkv",
+        ]
+    finally:
+        db.close()
+
+
+def test_path_mutations_resolve_through_directory_and_name(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        _seed(db)
+        for action in (
+            lambda: db.update_watched(["C:/tv/Show 1/S01E01.mkv"], True),
+            lambda: db.assign_placeholder("__placeholder__::Show 0::S1E4::x", "C:/tv/Show 0/S01E04.mkv"),
+            lambda: db.delete_by_paths(["C:/tv/Show 2/S01E01.mkv"]),
+        ):
+            plans = _query_plans(db, action)
+            _assert_no_full_scan(plans)
+            assert any("(dir_id=? AND name=?)" in d for details in plans.values() for d in details)
+    finally:
+        db.close()
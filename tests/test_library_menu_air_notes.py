@@ -4,27 +4,29 @@ from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
+from app.core.records import LibraryItem  # noqa: E402
 from app.ui.library_utils import (  # noqa: E402
     _build_show_air_notes,
     _format_air_datetime_display,
     _format_last_aired_dates,
+    _stale_airing_series,
 )
 
 
-def _tv_placeholder(show_title, air_datetime):
-    return (
-        1,
-        "__placeholder__",
-        "TV",
-        "S01E01",
-        1,
-        show_title,
-        "1.1",
-        "",
-        0,
-        1,
-        air_datetime,
-        0,
+def _tv_placeholder(show_title, air_datetime, currently_airing=0):
+    return LibraryItem(
+        id=1,
+        path="__placeholder__",
+        media_type="TV",
+        display_title="S01E01",
+        is_series=1,
+        series_title=show_title,
+        show_title="1.1",
+        added_at="",
+        watched=0,
+        is_placeholder=1,
+        air_datetime=air_datetime,
+        currently_airing=currently_airing,
     )
 
 
@@ -80,3 +82,29 @@ def test_build_show_air_notes_uses_last_aired_for_past_only():
     ]
     notes = _build_show_air_notes(items, now=now)
     assert notes["The Show"] == "Last aired 01-Feb & 05-Feb-2026"
+
+
+def _tv_episode(show_title, currently_airing):
+    return _tv_placeholder(show_title, None, currently_airing)._replace(
+        id=2, path=f"C:/tv/{show_title}/S01E01.mkv", display_title="Pilot", is_placeholder=0
+    )
+
+
+def test_stale_airing_series_flags_series_with_future_placeholder():
+    now = datetime(2026, 2, 6, 12, 0)
+    items = [
+        _tv_placeholder("The Show", "2026-02-10 21:00"),
+        _tv_episode("The Show", 0),
+        _tv_placeholder("Old Show", "2026-01-10 21:00"),
+        _tv_episode("Old Show", 0),
+    ]
+    assert _stale_airing_series(items, now=now) == {("TV", "The Show")}
+
+
+def test_stale_airing_series_is_empty_once_flags_are_stored():
+    now = datetime(2026, 2, 6, 12, 0)
+    items = [
+        _tv_placeholder("The Show", "2026-02-10 21:00", currently_airing=1),
+        _tv_episode("The Show", 1),
+    ]
+    assert _stale_airing_series(items, now=now) == set()
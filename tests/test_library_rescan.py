@@ -0,0 +1,234 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.library_db import LibraryDB
+from app.core.records import DirManifest
+from app.core.rescan import apply_rescan, rescan_changes
+from app.ui.library_scanner import UNSETTLED_MTIME, iter_import_rows, list_directory, rescan_root
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+def _age(root):
+    # Push every mtime out of the settle window, as if the import was long ago.
+    old = time.time() - 3600
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        os.utime(dirpath, (old, old))
+
+
+class _FakeFilesystem:
+    """In-memory directories with mtimes, counting every stat and listing."""
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.mtimes = {path: 1_000_000_000 for path in tree}
+        self.stats = []
+        self.listings = []
+
+    def stat_dir(self, path):
+        self.stats.append(path)
+        if path not in self.tree:
+            raise FileNotFoundError(path)
+        return self.mtimes[path]
+
+    def list_dir(self, path):
+        self.listings.append(path)
+        # Names with an extension are files, everything else a directory.
+        return [(name, "." not in name, False) for name in self.tree[path]]
+
+    def manifest(self):
+        return {path: DirManifest(self.mtimes[path], len(entries)) for path, entries in self.tree.items()}
+
+
+def _show_tree():
+    show = os.path.join("root", "Show")
+    return {
+        "root": ["Show", "Film (2001).mkv"],
+        show: ["Season 1", "Season 2"],
+        os.path.join(show, "Season 1"): ["Show S01E01.mkv", "Show S01E02.mkv"],
+        os.path.join(show, "Season 2"): ["Show S02E01.mkv"],
+    }
+
+
+def _library_files(tree):
+    def library_files(directories):
+        files = {}
+        for path, entries in tree.items():
+            directory = os.path.join(path, "")
+            if directory in directories:
+                files[directory] = {name for name in entries if "." in name}
+        return files
+
+    return library_files
+
+
+def test_rescan_of_unchanged_tree_stats_each_directory_and_lists_nothing():
+    fs = _FakeFilesystem(_show_tree())
+    manifest = fs.manifest()
+
+    result = rescan_root("root", manifest, _library_files(fs.tree), fs.list_dir, fs.stat_dir)
+
+    assert result.available
+    assert (result.new, result.missing, result.moved, result.new_dirs) == ([], [], [], [])
+    assert sorted(fs.stats) == sorted(fs.tree)
+    assert fs.listings == []
+    assert result.manifest == manifest
+
+
+def test_rescan_lists_only_changed_directories():
+    fs = _FakeFilesystem(_show_tree())
+    manifest = fs.manifest()
+    library_files = _library_files(dict(fs.tree))
+    season_two = os.path.join("root", "Show", "Season 2")
+    season_three = os.path.join("root", "Show", "Season 3")
+    fs.tree[season_two] = ["Show S02E01.mkv", "Show S02E02.mkv"]
+    fs.tree[os.path.join("root", "Show")] = ["Season 1", "Season 2", "Season 3"]
+    fs.tree[season_three] = ["Show S03E01.mkv"]
+    fs.mtimes[season_two] += 1
+    fs.mtimes[os.path.join("root", "Show")] += 1
+    fs.mtimes[season_three] = 1_000_000_000
+
+    result = rescan_root("root", manifest, library_files, fs.list_dir, fs.stat_dir)
+
+    assert sorted(fs.listings) == sorted([os.path.join("root", "Show"), season_two, season_three])
+    assert result.new == [os.path.join(season_two, "Show S02E02.mkv"), os.path.join(season_three, "Show S03E01.mkv")]
+    assert result.new_dirs == [season_three]
+    assert result.import_paths() == [season_three, os.path.join(season_two, "Show S02E02.mkv")]
+    assert result.missing == []
+    assert result.manifest[season_three] == DirManifest(1_000_000_000, 1)
+
+
+def test_rescan_reports_missing_and_moved_files_against_the_library(tmp_path):
+    root = tmp_path / "TV"
+    _touch(root / "Show" / "Season 1" / "Show S01E01.mkv")
+    _touch(root / "Show" / "Season 1" / "Show S01E02.mkv")
+    _touch(root / "Show" / "Season 2" / "Show S02E01.mkv")
+    _touch(root / "Film" / "Film (2001).mkv")
+    _age(root)
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        manifest = {}
+        rows = list(iter_import_rows([str(root)], manifest=manifest))
+        db.add_items(
+            {"path": row.path, "media_type": row.media_type, "display_title": row.display_title}
+            for row in rows
+            if not row.is_folder
+        )
+        db.save_manifest(str(root), manifest[str(root)])
+        db.update_watched([str(root / "Show" / "Season 1" / "Show S01E02.mkv")], True)
+
+        (root / "Show" / "Season 1" / "Show S01E02.mkv").rename(root / "Show" / "Show S01E02.mkv")
+        (root / "Film" / "Film (2001).mkv").unlink()
+        (root / "Show" / "Season 2" / "Show S02E01.mkv").unlink()
+        (root / "Show" / "Season 2").rmdir()
+        _touch(root / "Show" / "Season 1" / "Show S01E03.mkv")
+
+        listed = []
+
+        def counting_list_dir(path):
+            listed.append(path)
+            return list_directory(path)
+
+        result = rescan_root(str(root), db.get_manifest(str(root)), db.get_directory_files, counting_list_dir)
+
+        assert str(root) not in listed
+        assert result.new == [str(root / "Show" / "Season 1" / "Show S01E03.mkv")]
+        assert result.missing == [
+            str(root / "Film" / "Film (2001).mkv"),
+            str(root / "Show" / "Season 2" / "Show S02E01.mkv"),
+        ]
+        assert result.moved == [
+            (str(root / "Show" / "Season 1" / "Show S01E02.mkv"), str(root / "Show" / "Show S01E02.mkv"))
+        ]
+        assert str(root / "Show" / "Season 2") not in result.manifest
+
+        db.move_items(result.moved)
+        items = {item.path: item for item in db.get_items()}
+        assert items[str(root / "Show" / "Show S01E02.mkv")].watched == 1
+    finally:
+        db.close()
+
+
+def test_recently_changed_directories_are_listed_again(tmp_path):
+    _touch(tmp_path / "Show" / "a.mkv")
+    manifest = {}
+    list(iter_import_rows([str(tmp_path / "Show")], manifest=manifest))
+    assert manifest[str(tmp_path / "Show")][str(tmp_path / "Show")] == DirManifest(UNSETTLED_MTIME, 1)
+
+    _touch(tmp_path / "Show" / "b.mkv")
+    result = rescan_root(
+        str(tmp_path / "Show"),
+        manifest[str(tmp_path / "Show")],
+        lambda directories: {os.path.join(str(tmp_path / "Show"), ""): {"a.mkv"}},
+    )
+
+    assert result.new == [str(tmp_path / "Show" / "b.mkv")]
+
+
+def test_rescan_of_unreadable_root_reports_nothing():
+    fs = _FakeFilesystem(_show_tree())
+    manifest = fs.manifest()
+    del fs.tree["root"]
+
+    result = rescan_root("root", manifest, _library_files(_show_tree()), fs.list_dir, fs.stat_dir)
+
+    assert not result.available
+    assert (result.new, result.missing, result.moved) == ([], [], [])
+    assert result.manifest == manifest
+
+
+def test_apply_rescan_lists_nested_roots_once_and_keeps_manifests_when_the_import_is_cancelled(tmp_path):
+    root = tmp_path / "TV"
+    show = root / "Show"
+    _touch(show / "Season 1" / "Show S01E01.mkv")
+    _touch(show / "Season 1" / "Show S01E02.mkv")
+    _age(root)
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        manifest = {}
+        rows = list(iter_import_rows([str(root), str(show)], manifest=manifest))
+        db.add_items(
+            {"path": row.path, "media_type": row.media_type, "display_title": row.display_title}
+            for row in rows
+            if not row.is_folder
+        )
+        for path, entries in manifest.items():
+            db.save_manifest(path, entries)
+
+        (show / "Season 1" / "Show S01E01.mkv").unlink()
+        _touch(show / "Season 2" / "Show S02E01.mkv")
+        results = [rescan_root(path, db.get_manifest(path), db.get_directory_files) for path in db.get_roots()]
+        saved = {path: db.get_manifest(path) for path in db.get_roots()}
+
+        new, missing, moved = rescan_changes(results)
+        assert new == [str(show / "Season 2" / "Show S02E01.mkv")]
+        assert missing == [str(show / "Season 1" / "Show S01E01.mkv")]
+        assert moved == []
+
+        selections = []
+
+        def cancel_import(selection):
+            selections.append(selection)
+            return False
+
+        apply_rescan(db, results, cancel_import)
+
+        assert selections == [[str(show / "Season 2")]]
+        assert {item.path for item in db.get_items()} == {str(show / "Season 1" / "Show S01E02.mkv")}
+        assert {path: db.get_manifest(path) for path in db.get_roots()} == saved
+
+        apply_rescan(db, results, lambda selection: True)
+
+        assert {path: db.get_manifest(path) for path in db.get_roots()} == {
+            result.root: result.manifest for result in results
+        }
+    finally:
+        db.close()
@@ -0,0 +1,257 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.ui import library_scanner, library_utils
+from app.ui.library_scanner import iter_import_rows, list_directory
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+def _relative_rows(rows, root):
+    return [(os.path.relpath(row.path, root), row.series_index) for row in rows]
+
+
+def test_iter_import_rows_sorts_each_directory_and_tells_show_folders_by_their_seasons(tmp_path):
+    show = tmp_path / "TV Shows" / "Show"
+    _touch(show / "Season 10" / "Show S10E01.mkv")
+    _touch(show / "Season 2" / "Show S02E02.mkv")
+    _touch(show / "Season 2" / "Show S02E01.mkv")
+    _touch(show / "Season 2" / "notes.txt")
+    _touch(show / "Extras" / "Behind the scenes.mp4")
+    _touch(show / "trailer.mkv")
+
+    rows = list(iter_import_rows([str(show)]))
+
+    # A folder with season folders is a show, so its own files get no season.
+    assert _relative_rows(rows, show) == [
+        (".", ""),
+        ("trailer.mkv", ""),
+        ("Season 2", "2"),
+        (os.path.join("Season 2", "Show S02E01.mkv"), "2.1"),
+        (os.path.join("Season 2", "Show S02E02.mkv"), "2.2"),
+        ("Season 10", "10"),
+        (os.path.join("Season 10", "Show S10E01.mkv"), "10.1"),
+        ("Extras", ""),
+        (os.path.join("Extras", "Behind the scenes.mp4"), "1.1"),
+    ]
+
+
+def test_iter_import_rows_keeps_only_movieobject_inside_bdmv(tmp_path):
+    _touch(tmp_path / "Film" / "BDMV" / "MovieObject.bdmv")
+    _touch(tmp_path / "Film" / "BDMV" / "index.bdmv")
+    _touch(tmp_path / "Film" / "BDMV" / "STREAM" / "00001.m2ts")
+
+    rows = list(iter_import_rows([str(tmp_path / "Film")]))
+
+    assert [os.path.relpath(row.path, tmp_path) for row in rows if not row.is_folder] == [
+        os.path.join("Film", "BDMV", "MovieObject.bdmv"),
+        os.path.join("Film", "BDMV", "STREAM", "00001.m2ts"),
+    ]
+
+
+def test_iter_import_rows_lists_each_directory_once_and_skips_symlinked_dirs(tmp_path):
+    _touch(tmp_path / "Show" / "Season 1" / "a.mkv")
+    _touch(tmp_path / "Show" / "Season 2" / "b.mkv")
+    os.symlink(tmp_path / "Show" / "Season 1", tmp_path / "Show" / "S03")
+    listed = []
+
+    def counting_list_dir(path):
+        listed.append(path)
+        return list_directory(path)
+
+    rows = list(iter_import_rows([str(tmp_path / "Show")], counting_list_dir))
+
+    assert sorted(listed) == sorted(
+        [str(tmp_path / "Show"), str(tmp_path / "Show" / "Season 1"), str(tmp_path / "Show" / "Season 2")]
+    )
+    assert [os.path.basename(row.path) for row in rows if row.is_folder] == ["Show", "Season 1", "Season 2"]
+
+
+def test_iter_import_rows_skips_unreadable_directories(tmp_path):
+    (tmp_path / "locked").mkdir()
+    _touch(tmp_path / "open" / "movie.mkv")
+
+    def list_dir(path):
+        if path.endswith("locked"):
+            raise PermissionError(path)
+        return list_directory(path)
+
+    rows = list(iter_import_rows([str(tmp_path)], list_dir))
+
+    assert [os.path.relpath(row.path, tmp_path) for row in rows] == [".", "open", os.path.join("open", "movie.mkv")]
+    assert [row.path for row in iter_import_rows([str(tmp_path / "locked")], list_dir)] == [str(tmp_path / "locked")]
+
+
+def test_iter_import_rows_yields_parents_first_with_defaults(tmp_path):
+    show = tmp_path / "TV Shows" / "Show"
+    _touch(show / "Season 1" / "Show S01E02.mkv")
+    _touch(show / "Season 1" / "Show S01E01.mkv")
+    _touch(show / "Season 1" / "bonus.mkv")
+    movie = tmp_path / "Some Film (2001).mp4"
+    _touch(movie)
+
+    rows = list(iter_import_rows([str(movie), str(show)]))
+
+    assert [(os.path.relpath(row.path, tmp_path), row.is_folder) for row in rows] == [
+        (os.path.join("TV Shows", "Show"), True),
+        (os.path.join("TV Shows", "Show", "Season 1"), True),
+        (os.path.join("TV Shows", "Show", "Season 1", "Show S01E01.mkv"), False),
+        (os.path.join("TV Shows", "Show", "Season 1", "Show S01E02.mkv"), False),
+        (os.path.join("TV Shows", "Show", "Season 1", "bonus.mkv"), False),
+        ("Some Film (2001).mp4", False),
+    ]
+    by_name = {os.path.basename(row.path): row for row in rows}
+    assert by_name["Season 1"].parent == str(show)
+    assert by_name["Season 1"].series_index == "1"
+    assert by_name["Show S01E02.mkv"].media_type == "TV"
+    assert by_name["Show S01E02.mkv"].series_index == "1.2"
+    assert by_name["bonus.mkv"].series_index == "1.3"
+    assert by_name["Some Film (2001).mp4"].media_type == "Movie"
+    assert by_name["Some Film (2001).mp4"].parent is None
+    assert by_name["Some Film (2001).mp4"].display_title
+
+
+def test_iter_import_rows_stops_when_cancelled(tmp_path):
+    for season in range(1, 4):
+        _touch(tmp_path / "Show" / f"Season {season}" / "a.mkv")
+    listed = []
+
+    def counting_list_dir(path):
+        listed.append(path)
+        return list_directory(path)
+
+    rows = iter_import_rows(
+        [str(tmp_path / "Show")], counting_list_dir, is_cancelled=lambda: len(listed) >= 2, max_workers=1
+    )
+
+    assert [os.path.basename(row.path) for row in rows] == ["Show", "Season 1", "a.mkv"]
+    assert len(listed) == 2
+
+
+class _SlowFilesystem:
+    """In-memory ``list_dir`` that sleeps on every listing, like a network share."""
+
+    def __init__(self, tree, latency):
+        self.tree = tree
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def list_dir(self, path):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            entries = self.tree.get(path)
+            if entries is None:
+                raise FileNotFoundError(path)
+            # Names with an extension are files, everything else a directory.
+            return [(name, "." not in name, False) for name in entries]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _slow_show_tree(root, shows, seasons):
+    tree = {root: [f"Show {show}" for show in range(shows)]}
+    for show in range(shows):
+        show_dir = os.path.join(root, f"Show {show}")
+        tree[show_dir] = [f"Season {season}" for season in range(seasons, 0, -1)]
+        for season in range(1, seasons + 1):
+            tree[os.path.join(show_dir, f"Season {season}")] = [
+                f"Show {show} S{season:02d}E{episode:02d}.mkv" for episode in (3, 1, 2)
+            ]
+    return tree
+
+
+def test_iter_import_rows_lists_concurrently_up_to_the_worker_limit(tmp_path):
+    tree = _slow_show_tree(str(tmp_path), shows=6, seasons=4)
+    serial_fs = _SlowFilesystem(tree, latency=0.005)
+    parallel_fs = _SlowFilesystem(tree, latency=0.005)
+
+    serial = list(iter_import_rows([str(tmp_path)], serial_fs.list_dir, max_workers=1))
+    parallel = list(iter_import_rows([str(tmp_path)], parallel_fs.list_dir, max_workers=4))
+
+    assert parallel == serial
+    assert len(serial) == 1 + 6 + 6 * 4 * (1 + 3)
+    assert serial_fs.peak == 1
+    assert 1 < parallel_fs.peak <= 4
+
+
+def test_directory_reader_lists_a_wide_tree_only_a_few_directories_ahead():
+    tree = {"root": [f"Show {show}" for show in range(200)]}
+    tree.update({os.path.join("root", f"Show {show}"): [] for show in range(200)})
+    listed = []
+    ahead = []
+
+    def list_dir(path):
+        listed.append(path)
+        return [(name, True, False) for name in tree[path]]
+
+    reader = library_scanner._DirectoryReader(list_dir, 4)
+    try:
+        _node, subdirs = reader.read("root")
+        for path in subdirs:
+            # Listings queue the next ones themselves; wait until none is left running.
+            while not all(future.done() for future in list(reader._pending.values())):
+                time.sleep(0.001)
+            ahead.append(len(listed) - subdirs.index(path) - 1)
+            reader.read(path)
+    finally:
+        reader.close()
+
+    assert sorted(listed) == sorted(tree)
+    assert max(ahead) == library_scanner.PREFETCH_PER_WORKER * 4
+
+
+def test_iter_import_rows_order_does_not_depend_on_workers(tmp_path):
+    for show in ("Beta", "Alpha"):
+        for season in (10, 2, 1):
+            for episode in (2, 1):
+                _touch(tmp_path / show / f"Season {season}" / f"{show} S{season:02d}E{episode:02d}.mkv")
+
+    def uneven_list_dir(path):
+        # Listings finish out of walk order, as they would on a busy share.
+        time.sleep(0.002 * (3 - len(os.path.basename(path)) % 3))
+        return list_directory(path)
+
+    selection = [str(tmp_path / "Beta"), str(tmp_path / "Alpha")]
+
+    assert list(iter_import_rows(selection, uneven_list_dir, max_workers=8)) == list(
+        iter_import_rows(selection, list_directory, max_workers=1)
+    )
+
+
+def test_iter_import_rows_parses_large_imports_on_a_process_pool(tmp_path, monkeypatch):
+    for season in (1, 2):
+        for episode in range(1, 6):
+            _touch(tmp_path / "TV Shows" / "Show" / f"Season {season}" / f"Show S{season:02d}E{episode:02d}.mkv")
+        _touch(tmp_path / "TV Shows" / "Show" / f"Season {season}" / "extra.mkv")
+    selection = [str(tmp_path / "TV Shows" / "Show")]
+    in_process = list(iter_import_rows(selection))
+    started = []
+    real_executor = library_utils.analysis_executor
+
+    def recording_executor(max_workers=None):
+        started.append(True)
+        return real_executor(max_workers)
+
+    monkeypatch.setattr(library_utils, "ANALYZE_PROCESS_THRESHOLD", 1)
+    monkeypatch.setattr(library_scanner, "ANALYZE_CHUNK_SIZE", 4)
+    monkeypatch.setattr(library_utils, "ANALYZE_CHUNK_SIZE", 3)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(library_utils, "analysis_executor", recording_executor)
+
+    assert list(iter_import_rows(selection)) == in_process
+    assert started == [True]
@@ -49,3 +49,20 @@ def test_add_retrieve_update_link_and_delete(tmp_path):
         assert db.get_items() == []
     finally:
         db.close()
+
+
+def test_get_items_returns_named_records(tmp_path):
+    db_path = tmp_path / "test.db"
+    db = ListDB(db_path=str(db_path))
+    try:
+        item_id = db.add_item("Movie", "Heat")
+        (row,) = db.get_items()
+        assert (row.id, row.media_type, row.title, row.added_by_name, row.library_linked) == (
+            item_id,
+            "Movie",
+            "Heat",
+            None,
+            0,
+        )
+    finally:
+        db.close()
@@ -0,0 +1,105 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core import migrations
+from app.core.library_db import LibraryDB
+from app.core.list_db import ListDB
+from app.core.migrations import migrate
+from app.core.title_keys import title_key
+
+
+def _seed(db_path):
+    library = LibraryDB(db_path=db_path)
+    library.add_items(
+        [
+            {"path": "C:/m/Heat.mkv", "media_type": "Movie", "display_title": "Heat"},
+            {
+                "path": "C:/m/Alien/Aliens.mkv",
+                "media_type": "Movie",
+                "display_title": "Aliens",
+                "is_series": True,
+                "series_title": "Alien",
+            },
+            {
+                "path": "C:/tv/The Office/S01E01.mkv",
+                "media_type": "TV",
+                "display_title": "Pilot",
+                "is_series": True,
+                "series_title": "The  Office",
+            },
+            {
+                "path": "__placeholder__::Andor::S1E1::x",
+                "media_type": "TV",
+                "display_title": "Andor",
+                "is_series": True,
+                "series_title": "Andor",
+                "is_placeholder": True,
+            },
+        ]
+    )
+    return library
+
+
+def test_title_key_lowercases_and_collapses_whitespace():
+    assert title_key("  The   Office ") == "the office"
+    assert title_key("") is None
+    assert title_key(None) is None
+
+
+def test_list_matches_join_on_title_and_series_keys(tmp_path):
+    db_path = str(tmp_path / "test.db")
+    library = _seed(db_path)
+    lists = ListDB(db_path=db_path)
+    try:
+        heat = lists.add_item("Movie", "HEAT")
+        alien = lists.add_item("Movie", "alien")
+        office = lists.add_item("TV", "the office")
+        andor = lists.add_item("TV", "Andor")
+        wrong_type = lists.add_item("TV", "Heat")
+
+        matches = library.get_list_matches()
+        assert {list_id: [item.path for item in items] for list_id, items in matches.items()} == {
+            heat: ["C:/m/Heat.mkv"],
+            alien: ["C:/m/Alien/Aliens.mkv"],
+            office: ["C:/tv/The Office/S01E01.mkv"],
+        }
+        assert andor not in matches and wrong_type not in matches
+
+        lists.set_library_linked([heat], True)
+        assert library.get_unlinked_list_matches(["C:/m/Heat.mkv", "C:/tv/The Office/S01E01.mkv"]) == [
+            (office, "TV", "the office")
+        ]
+
+        row = next(item for item in lists.get_items() if item.id == alien)
+        lists.update_items([{"id": alien, "media_type": "Movie", "title": "Alien 3", "added_at": row.added_at}])
+        assert alien not in library.get_list_matches()
+    finally:
+        lists.close()
+        library.close()
+
+
+def test_migration_fills_keys_for_existing_rows(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        for version, _description, apply in migrations.MIGRATIONS:
+            if version < 7:
+                apply(conn)
+        conn.execute("PRAGMA user_version = 6")
+        conn.execute("INSERT INTO directories (path) VALUES ('C:/m/')")
+        conn.execute(
+            "INSERT INTO library_items (dir_id, name, media_type, display_title, series_title, added_at) "
+            "VALUES (1, 'a.mkv', 'TV', ' Pilot ', 'The  Office', 'now')"
+        )
+        conn.execute("INSERT INTO list_items (media_type, title, added_at) VALUES ('TV', 'THE OFFICE', 'now')")
+        conn.commit()
+
+        migrate(conn)
+
+        assert conn.execute("SELECT title_key, series_key FROM library_items").fetchone() == ("pilot", "the office")
+        assert conn.execute("SELECT title_key FROM list_items").fetchone() == ("the office",)
+    finally:
+        conn.close()
@@ -0,0 +1,158 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core import migrations
+from app.core.migrations import latest_version, migrate, rebuild_table, schema_version, table_columns
+
+
+def test_migrate_creates_schema_and_records_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        migrate(conn)
+        assert schema_version(conn) == latest_version()
+        assert "currently_airing" in table_columns(conn, "library_items")
+        assert "library_linked" in table_columns(conn, "list_items")
+        assert "list_last_pick_count" in table_columns(conn, "people")
+    finally:
+        conn.close()
+
+
+def test_migrate_upgrades_legacy_tables_missing_columns(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        conn.execute(
+            """
+            CREATE TABLE library_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path TEXT NOT NULL UNIQUE,
+                media_type TEXT NOT NULL,
+                display_title TEXT NOT NULL,
+                is_series INTEGER DEFAULT 0,
+                series_title TEXT,
+                show_title TEXT,
+                added_at TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE TABLE list_items (id INTEGER PRIMARY KEY AUTOINCREMENT, media_type TEXT NOT NULL, title TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO list_items (media_type, title) VALUES ('TV', 'Severance')")
+        conn.execute("CREATE TABLE people (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL)")
+        conn.commit()
+
+        migrate(conn)
+
+        assert {"watched", "is_placeholder", "air_datetime", "currently_airing"} <= set(
+            table_columns(conn, "library_items")
+        )
+        assert conn.execute("SELECT added_at FROM list_items").fetchone()[0]
+        assert {"birthday", "list_last_pick_count"} <= set(table_columns(conn, "people"))
+    finally:
+        conn.close()
+
+
+def test_migrate_on_current_database_only_reads_user_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        migrate(conn)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        migrate(conn)
+        assert statements == ["PRAGMA user_version"]
+    finally:
+        conn.close()
+
+
+def test_failed_step_rolls_back_every_pending_step(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+
+    def broken(conn):
+        conn.execute("CREATE TABLE half_done (id INTEGER)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        migrations, "MIGRATIONS", migrations.MIGRATIONS + [(latest_version() + 1, "broken", broken)]
+    )
+    try:
+        with pytest.raises(RuntimeError):
+            migrate(conn)
+        assert schema_version(conn) == 0
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'library_items'").fetchone() is None
+    finally:
+        conn.close()
+
+
+def test_rebuild_table_copies_rows_into_new_definition(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        conn.execute("CREATE TABLE things (id INTEGER PRIMARY KEY, name TEXT, legacy TEXT)")
+        conn.execute("INSERT INTO things (id, name, legacy) VALUES (1, 'a', 'x')")
+        rebuild_table(
+            conn,
+            "things",
+            "CREATE TABLE things__new (id INTEGER PRIMARY KEY, name TEXT NOT NULL, upper_name TEXT)",
+            {"id": "id", "name": "name", "upper_name": "upper(name)"},
+        )
+        assert table_columns(conn, "things") == ["id", "name", "upper_name"]
+        assert conn.execute("SELECT id, name, upper_name FROM things").fetchall() == [(1, "a", "A")]
+    finally:
+        conn.close()
+
+
+def test_library_paths_move_into_directories_table(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        steps = [step for step in migrations.MIGRATIONS if step[0] < 4]
+        for _version, _description, apply in steps:
+            apply(conn)
+        conn.execute("PRAGMA user_version = 3")
+        conn.executemany(
+            "INSERT INTO library_items (path, media_type, display_title, added_at, watched) VALUES (?, 'TV', 't', 'now', ?)",
+            [
+                ("C:\\TV\\Show\\S01E01.mkv", 1),
+                ("C:\\TV\\Show\\S01E02.mkv", 0),
+                ("__placeholder__::Show::S1E3::x", 0),
+            ],
+        )
+        conn.commit()
+
+        migrate(conn)
+
+        rows = conn.execute(
+            "SELECT d.path || li.name, li.watched FROM library_items li JOIN directories d ON d.id = li.dir_id ORDER BY li.id"
+        ).fetchall()
+        assert rows == [
+            ("C:\\TV\\Show\\S01E01.mkv", 1),
+            ("C:\\TV\\Show\\S01E02.mkv", 0),
+            ("__placeholder__::Show::S1E3::x", 0),
+        ]
+        assert sorted(row[0] for row in conn.execute("SELECT path FROM directories")) == ["", "C:\\TV\\Show\\"]
+        assert conn.execute("SELECT COUNT(*) FROM watching_series").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_placeholder_air_index_is_dropped_from_older_databases(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "test.db"))
+    try:
+        for _version, _description, apply in [step for step in migrations.MIGRATIONS if step[0] < 9]:
+            apply(conn)
+        conn.execute("PRAGMA user_version = 8")
+        conn.commit()
+        index_query = "SELECT name FROM sqlite_master WHERE name = 'idx_library_items_placeholder_air'"
+        assert conn.execute(index_query).fetchone() is not None
+
+        migrate(conn)
+
+        assert schema_version(conn) == latest_version()
+        assert conn.execute(index_query).fetchone() is None
+    finally:
+        conn.close()
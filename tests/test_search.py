@@ -0,0 +1,79 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+# Ensure repository root is on sys.path so we import local app package
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.library_db import LibraryDB
+from app.core.list_db import ListDB
+from app.core.search import match_expression, search_ids
+
+
+def _titles(db, ids):
+    wanted = set(ids)
+    return sorted(item.display_title for item in db.get_items() if item.id in wanted)
+
+
+def test_library_search_matches_prefixes_without_case_or_diacritics(tmp_path):
+    db = LibraryDB(db_path=str(tmp_path / "test.db"))
+    try:
+        db.add_items(
+            [
+                {"path": "C:/m/a.mkv", "media_type": "Movie", "display_title": "Pokémon: The First Movie"},
+                {"path": "C:/m/b.mkv", "media_type": "Movie", "display_title": "Amélie"},
+                {"path": "C:/m/c.mkv", "media_type": "Movie", "display_title": "The Matrix"},
+                {
+                    "path": "C:/tv/s01e01.mkv",
+                    "media_type": "TV",
+                    "display_title": "Pilot",
+                    "is_series": True,
+                    "series_title": "The Expanse",
+                },
+            ]
+        )
+        assert _titles(db, db.search_ids("pokemon")) == ["Pokémon: The First Movie"]
+        assert _titles(db, db.search_ids("AME")) == ["Amélie"]
+        assert _titles(db, db.search_ids("the m")) == ["Pokémon: The First Movie", "The Matrix"]
+        assert _titles(db, db.search_ids("expan")) == ["Pilot"]
+        assert db.search_ids("  ") == []
+
+        db.update_items(
+            [{"path": "C:/m/c.mkv", "media_type": "Movie", "display_title": "The Matrix Reloaded"}]
+        )
+        assert _titles(db, db.search_ids("reload")) == ["The Matrix Reloaded"]
+        db.delete_by_paths(["C:/m/c.mkv"])
+        assert db.search_ids("matrix") == []
+    finally:
+        db.close()
+
+
+def test_list_search_follows_title_edits(tmp_path):
+    db = ListDB(db_path=str(tmp_path / "test.db"))
+    try:
+        item_id = db.add_item("TV", "Severance")
+        db.add_item("TV", "Andor")
+        assert db.search_ids("sev") == [item_id]
+        row = db.get_items()[0]
+        db.update_items(
+            [{"id": item_id, "media_type": "TV", "title": "Shōgun", "added_at": row.added_at}]
+        )
+        assert db.search_ids("sev") == []
+        assert db.search_ids("shogun") == [item_id]
+    finally:
+        db.close()
+
+
+def test_match_expression_quotes_each_word_as_a_prefix():
+    assert match_expression('the "office" (US)') == '"the"* "office"* "US"*'
+
+
+def test_search_falls_back_to_like_without_an_index():
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE list_items (id INTEGER PRIMARY KEY, title TEXT)")
+        conn.executemany("INSERT INTO list_items (title) VALUES (?)", [("The Office",), ("Office_Space",), ("Andor",)])
+        assert search_ids(conn, "list_items", "office") == [1, 2]
+        assert search_ids(conn, "list_items", "e_s") == [2]
+    finally:
+        conn.close()